@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+r"""
+Benchmarks for the main algorithms on flat surfaces.
+
+Run them with ``asv run`` (or ``asv dev`` for a quick single pass) from the
+root of the repository. Every benchmark records its running time and the
+peak memory of the process.
+"""
+
+from .surfaces import SURFACES, RINGS, surface
+
+# Number of polygons that are computed on infinite surfaces whose
+# constructions are lazy.
+POLYGONS = 32
+
+
+def _force(s):
+    r"""
+    Compute the polygons of the (possibly lazy) surface ``s``.
+    """
+    for i, label in enumerate(s.label_iterator()):
+        s.polygon(label)
+        if i + 1 >= POLYGONS:
+            break
+
+
+def _finite(s):
+    if not s.is_finite():
+        raise NotImplementedError("not available for infinite surfaces")
+
+
+class Surfaces(object):
+    r"""
+    Base class of the benchmarks that are parametrized by a surface.
+    """
+    params = [sorted(SURFACES), RINGS]
+    param_names = ["surface", "ring"]
+    timeout = 600
+
+    def setup(self, name, ring):
+        self.surface = surface(name, ring)
+
+
+class DelaunayTriangulation(Surfaces):
+    def time_delaunay_triangulation(self, name, ring):
+        _force(self.surface.delaunay_triangulation())
+
+    def peakmem_delaunay_triangulation(self, name, ring):
+        _force(self.surface.delaunay_triangulation())
+
+
+class DelaunayDecomposition(Surfaces):
+    def time_delaunay_decomposition(self, name, ring):
+        _force(self.surface.delaunay_decomposition())
+
+    def peakmem_delaunay_decomposition(self, name, ring):
+        _force(self.surface.delaunay_decomposition())
+
+
+class SaddleConnections(Surfaces):
+    params = Surfaces.params + [[16, 64]]
+    param_names = Surfaces.param_names + ["squared_length_bound"]
+
+    def setup(self, name, ring, bound):
+        Surfaces.setup(self, name, ring)
+        if self.surface.is_finite():
+            self.initial_label = None
+        else:
+            self.initial_label = self.surface.base_label()
+
+    def time_saddle_connections(self, name, ring, bound):
+        self.surface.saddle_connections(bound, initial_label=self.initial_label)
+
+    def peakmem_saddle_connections(self, name, ring, bound):
+        self.surface.saddle_connections(bound, initial_label=self.initial_label)
+
+
+class StraightLineTrajectoryFlow(Surfaces):
+    params = Surfaces.params + [[100, 1000]]
+    param_names = Surfaces.param_names + ["steps"]
+
+    def setup(self, name, ring, steps):
+        Surfaces.setup(self, name, ring)
+        s = self.surface
+        label = s.base_label()
+        p = s.polygon(label)
+        K = s.base_ring()
+        from sage.all import QQ, AA
+        if K is QQ:
+            slope = QQ((3, 7))
+        elif K is AA:
+            slope = AA(5).sqrt()
+        else:
+            slope = K.gen()
+        # a point in the interior of the base polygon
+        point = p.vertex(0) + (p.vertex(1) - p.vertex(0)) / 3 + (p.vertex(2) - p.vertex(0)) / 5
+        self.vector = s.tangent_vector(label, point, (1, slope))
+
+    def time_flow(self, name, ring, steps):
+        self.vector.straight_line_trajectory().flow(steps)
+
+    def peakmem_flow(self, name, ring, steps):
+        self.vector.straight_line_trajectory().flow(steps)
+
+
+class Canonicalize(Surfaces):
+    def setup(self, name, ring):
+        Surfaces.setup(self, name, ring)
+        _finite(self.surface)
+
+    def time_canonicalize(self, name, ring):
+        self.surface.canonicalize()
+
+    def peakmem_canonicalize(self, name, ring):
+        self.surface.canonicalize()
+
+
+class PyflatsurfConversion(Surfaces):
+    def setup(self, name, ring):
+        Surfaces.setup(self, name, ring)
+        _finite(self.surface)
+        try:
+            import pyflatsurf
+        except ImportError:
+            raise NotImplementedError("pyflatsurf is not installed")
+
+    def time_to_pyflatsurf(self, name, ring):
+        from flatsurf.geometry.pyflatsurf_conversion import to_pyflatsurf
+        to_pyflatsurf(self.surface)
+
+    def peakmem_to_pyflatsurf(self, name, ring):
+        from flatsurf.geometry.pyflatsurf_conversion import to_pyflatsurf
+        to_pyflatsurf(self.surface)
+
+
+class Decompositions(Surfaces):
+    params = Surfaces.params + [[4, 16]]
+    param_names = Surfaces.param_names + ["bound"]
+
+    def setup(self, name, ring, bound):
+        Surfaces.setup(self, name, ring)
+        _finite(self.surface)
+        try:
+            from flatsurf import GL2ROrbitClosure
+        except ImportError:
+            raise NotImplementedError("pyflatsurf is not installed")
+        self.orbit_closure = GL2ROrbitClosure(self.surface)
+
+    def time_decompositions(self, name, ring, bound):
+        for decomposition in self.orbit_closure.decompositions(bound, limit=64):
+            pass
+
+    def peakmem_decompositions(self, name, ring, bound):
+        for decomposition in self.orbit_closure.decompositions(bound, limit=64):
+            pass
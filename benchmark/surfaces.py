@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+r"""
+Surfaces shared by the benchmarks.
+
+Every benchmark is parametrized by the name of a surface in ``SURFACES`` and
+by the ring its polygons are defined over. With ``"exact"`` the surface is
+used as built by its generator (over the rationals or a number field), with
+``"AA"`` its polygons are first moved to the algebraic real numbers.
+"""
+
+
+def _veech_2n_gon():
+    from flatsurf import translation_surfaces
+    return translation_surfaces.veech_2n_gon(5)
+
+
+def _arnoux_yoccoz():
+    from flatsurf import translation_surfaces
+    return translation_surfaces.arnoux_yoccoz(4)
+
+
+def _mcmullen_L():
+    from flatsurf import translation_surfaces
+    return translation_surfaces.mcmullen_L(1, 1, 1, 1)
+
+
+def _billiard_unfolding():
+    from flatsurf import polygons, similarity_surfaces
+    T = polygons.triangle(2, 3, 4)
+    return similarity_surfaces.billiard(T, rational=True).minimal_cover(cover_type="translation")
+
+
+def _origami():
+    from sage.all import SymmetricGroup
+    from flatsurf import translation_surfaces
+    S = SymmetricGroup(6)
+    return translation_surfaces.origami(S('(1,2,3,4,5,6)'), S('(1,3)(2,5)'))
+
+
+def _infinite_staircase():
+    from flatsurf import translation_surfaces
+    return translation_surfaces.infinite_staircase()
+
+
+SURFACES = {
+    "veech_2n_gon": _veech_2n_gon,
+    "arnoux_yoccoz": _arnoux_yoccoz,
+    "mcmullen_L": _mcmullen_L,
+    "billiard_unfolding": _billiard_unfolding,
+    "origami": _origami,
+    "infinite_staircase": _infinite_staircase,
+}
+
+RINGS = ["exact", "AA"]
+
+
+def surface(name, ring):
+    r"""
+    Return the surface ``name`` over ``ring``.
+
+    Raises ``NotImplementedError``, which makes asv skip the benchmark, when
+    the surface cannot be moved to ``ring``.
+    """
+    s = SURFACES[name]()
+    if ring == "AA":
+        if not s.is_finite():
+            raise NotImplementedError("infinite surfaces cannot be moved to AA")
+        from sage.all import AA
+        s = s.copy(new_field=AA)
+    return s
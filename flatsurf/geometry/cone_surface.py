@@ -37,31 +37,15 @@ class ConeSurface(SimilaritySurface):
         if not self.is_finite():
             raise NotImplementedError("the set of edges is infinite!")
 
-        edges = [pair for pair in self.edge_iterator()]
-        edges = set(edges)
         angles = []
-
-        if return_adjacent_edges:
-            while edges:
-                p,e = edges.pop()
-                adjacent_edges = [(p,e)]
-                angle = self.polygon(p).angle(e, numerical=numerical)
-                pp,ee = self.opposite_edge(p,(e-1)%self.polygon(p).num_edges())
-                while pp != p or ee != e:
-                    edges.remove((pp,ee))
-                    adjacent_edges.append((pp,ee))
-                    angle += self.polygon(pp).angle(ee, numerical=numerical)
-                    pp,ee = self.opposite_edge(pp,(ee-1)%self.polygon(pp).num_edges())
-                angles.append((angle, adjacent_edges))
-        else:
-            while edges:
-                p,e = edges.pop()
-                angle = self.polygon(p).angle(e, numerical=numerical)
-                pp,ee = self.opposite_edge(p,(e-1)%self.polygon(p).num_edges())
-                while pp != p or ee != e:
-                    edges.remove((pp,ee))
-                    angle += self.polygon(pp).angle(ee, numerical=numerical)
-                    pp,ee = self.opposite_edge(pp,(ee-1)%self.polygon(pp).num_edges())
+        for adjacent_edges in self._vertex_classes()[0]:
+            p,e = adjacent_edges[0]
+            angle = self.polygon(p).angle(e, numerical=numerical)
+            for pp,ee in adjacent_edges[1:]:
+                angle += self.polygon(pp).angle(ee, numerical=numerical)
+            if return_adjacent_edges:
+                angles.append((angle, list(adjacent_edges)))
+            else:
                 angles.append(angle)
 
         return angles
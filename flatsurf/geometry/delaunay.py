@@ -1,7 +1,8 @@
 r"""
 This file contains classes implementing Surface which are used useful for
 triangulating, Delaunay triangulating, and Delaunay decomposing infinite
-surfaces.
+surfaces. It also contains :class:`DelaunayFlipper` which flips the edges of
+a finite triangulated surface to make it Delaunay.
 """
 #*****************************************************************************
 #       Copyright (C) 2013-2019 Vincent Delecroix <20100.delecroix@gmail.com>
@@ -121,6 +122,25 @@ class LazyDelaunayTriangulatedSurface(Surface):
         sage: ss.is_delaunay_triangulated(limit=100)
         True
         sage: TestSuite(ss).run(skip="_test_pickling")
+
+    The number of flips performed so far is recorded::
+
+        sage: from flatsurf import *
+        sage: from flatsurf.geometry.delaunay import *
+        sage: s=translation_surfaces.infinite_staircase()
+        sage: m=matrix([[2,1],[1,1]])
+        sage: ls=LazyDelaunayTriangulatedSurface(m*s,relabel=False)
+        sage: ss=TranslationSurface(ls)
+        sage: ss.is_delaunay_triangulated(limit=100)
+        True
+        sage: ls.flips() > 0
+        True
+
+    Developed disks are remembered, so that a new attempt after a flip does
+    not develop again through the polygons that were not flipped::
+
+        sage: len(ls._developed) > 0
+        True
     """
 
     def _setup_direction(self, direction):
@@ -131,6 +151,18 @@ class LazyDelaunayTriangulatedSurface(Surface):
         else:
             self._direction = self._ss.vector_space()(direction)
 
+    def _setup_certification(self):
+        # Set of labels corresponding to known delaunay polygons
+        self._certified_labels=set()
+        # Maps an edge of a triangle to whether it needs a flip.
+        self._needs_flip={}
+        # Maps an edge and a disk through it (see _development_key) to the
+        # labels of the polygons the disk was developed into beyond the edge.
+        self._developed={}
+        # Maps a label to the keys of self._developed that involve it.
+        self._developed_by_label={}
+        self._flips=0
+
     def __init__(self, similarity_surface, direction=None, relabel=True):
         r"""
         Construct a lazy Delaunay triangulation of the provided similarity_surface.
@@ -143,10 +175,8 @@ class LazyDelaunayTriangulatedSurface(Surface):
 
         self._setup_direction(direction)
 
-        # Set of labels corresponding to known delaunay polygons
-        self._certified_labels=set()
+        self._setup_certification()
 
-        
         # Triangulate the base polygon
         base_label=self._s.base_label()
         self._s.triangulate(in_place=True, label=base_label)
@@ -158,6 +188,57 @@ class LazyDelaunayTriangulatedSurface(Surface):
         Surface.__init__(self, self._s.base_ring(), base_label, \
             finite=self._s.is_finite(), mutable=False)
 
+    def flips(self):
+        r"""
+        Return the number of flips performed so far.
+        """
+        return self._flips
+
+    def _invalidate(self, label):
+        r"""
+        Forget whether the edges of the polygon with the given label need a flip.
+        """
+        for e in range(self._s.polygon(label).num_edges()):
+            self._needs_flip.pop((label,e), None)
+            self._needs_flip.pop(self._s.opposite_edge(label,e), None)
+        for key in self._developed_by_label.pop(label, ()):
+            self._developed.pop(key, None)
+
+    def _development_key(self, label, edge, circle):
+        r"""
+        Return the key of ``self._developed`` for the disk ``circle`` (in the
+        coordinates of the polygon ``label``) passing through ``edge``.
+        """
+        return (label, edge, tuple(circle.center()), circle.radius_squared())
+
+    def _record_development(self, label, edge, circle, labels):
+        r"""
+        Remember that the disk ``circle`` passing through the edge ``(label,
+        edge)`` develops into the polygons with the given ``labels``.
+
+        The record is forgotten as soon as one of these polygons or the
+        polygon ``label`` is flipped.
+        """
+        key = self._development_key(label, edge, circle)
+        labels = frozenset(labels.union([label]))
+        self._developed[key] = labels
+        for lab in labels:
+            self._developed_by_label.setdefault(lab, set()).add(key)
+
+    def _edge_needs_flip(self, label, edge):
+        r"""
+        Memoized version of the ``_edge_needs_flip`` predicate of the
+        underlying surface.
+        """
+        try:
+            return self._needs_flip[(label,edge)]
+        except KeyError:
+            pass
+        needs_flip = self._s._edge_needs_flip(label,edge)
+        self._needs_flip[(label,edge)]=needs_flip
+        self._needs_flip[self._s.opposite_edge(label,edge)]=needs_flip
+        return needs_flip
+
     def polygon(self, label):
         if label in self._certified_labels:
             return self._s.polygon(label)
@@ -208,7 +289,9 @@ class LazyDelaunayTriangulatedSurface(Surface):
         # Develop through each of the 3 edges:
         for e in range(3):
             edge_certified=False
-            # This keeps track of a chain of polygons the disk develops through:
+            # This keeps track of a chain of polygons the disk develops through.
+            # The last entry of each tuple is the set of labels of the polygons
+            # the disk was developed into beyond this edge.
             edge_stack=[]
             
             # We repeat this until we can verify that the portion of the circle
@@ -218,8 +301,8 @@ class LazyDelaunayTriangulatedSurface(Surface):
                     # Start at the beginning with label l and edge e.
                     # The 3rd coordinate in the tuple represents what edge to develop
                     # through in the triangle opposite this edge.
-                    edge_stack=[(l,e,1,c)]
-                ll,ee,step,cc=edge_stack[len(edge_stack)-1]
+                    edge_stack=[(l,e,1,c,set())]
+                ll,ee,step,cc,labels=edge_stack[len(edge_stack)-1]
 
                 lll,eee=self._s.opposite_edge(ll,ee)
                 
@@ -232,7 +315,7 @@ class LazyDelaunayTriangulatedSurface(Surface):
                         ppp=self._s.polygon(lll)
                     # now ppp is a triangle
 
-                    if self._s._edge_needs_flip(ll,ee):
+                    if self._edge_needs_flip(ll,ee):
                         
                         # Should not need to flip certified triangles.
                         #assert ll not in self._certified_labels
@@ -240,7 +323,10 @@ class LazyDelaunayTriangulatedSurface(Surface):
                         
                         
                         # Perform the flip
+                        self._invalidate(ll)
+                        self._invalidate(lll)
                         self._s.triangle_flip(ll,ee,in_place=True, direction=self._direction)
+                        self._flips += 1
                         
                         # If we touch the original polygon, then we return False.
                         if l==ll or l==lll:
@@ -255,11 +341,12 @@ class LazyDelaunayTriangulatedSurface(Surface):
                         # The following if statement makes sure that we check both subsequent edges of the 
                         # polygon opposite the last edge listed in the stack.
                         if len(edge_stack)>0:
-                            ll,ee,step,cc = edge_stack.pop()
-                            edge_stack.append((ll,ee,1,cc))
+                            ll,ee,step,cc,labels = edge_stack.pop()
+                            edge_stack.append((ll,ee,1,cc,set()))
                         continue
                 
                     # If we reach here then we know that no flip was needed.
+                    labels.add(lll)
                     ccc=self._s.edge_transformation(ll,ee)*cc
 
                     # Some (unnecessary) sanity checks.
@@ -270,30 +357,37 @@ class LazyDelaunayTriangulatedSurface(Surface):
                     lp = ccc.line_segment_position(ppp.vertex((eee+step)%3),ppp.vertex((eee+step+1)%3))
                     if lp==1:
                         # disk passes through edge and opposite polygon is not certified.
-                        edge_stack.append((lll,(eee+step)%3,1,ccc))
-                        continue
+                        developed = self._developed.get(self._development_key(lll,(eee+step)%3,ccc))
+                        if developed is None:
+                            edge_stack.append((lll,(eee+step)%3,1,ccc,set()))
+                            continue
+                        # The disk was already developed through this edge
+                        # (during an earlier attempt) and none of the
+                        # polygons involved has been flipped since.
+                        labels.update(developed)
                 
                     # We reach this point if the disk doesn't pass through the edge eee+step of polygon lll.
 
                 # Either lll is already certified or the disk didn't pass
                 # through edge (lll,eee+step)
-                
                 # Trim off unnecessary edges off the stack.
-                # prune_count=1
-                ll,ee,step,cc=edge_stack.pop()
-                if step==1:
-                    # if we have just done step 1 (one edge), move on to checking
-                    # the next edge.
-                    edge_stack.append((ll,ee,2,cc))
-                # if we have pruned an edge, continue to look at pruning in the same way.
-                while step==2 and len(edge_stack)>0:
-                    ll,ee,step,cc=edge_stack.pop()
-                    # prune_count= prune_count+1
+                ll,ee,step,cc,labels=edge_stack.pop()
+                while True:
                     if step==1:
-                        edge_stack.append((ll,ee,2,cc))
-                if len(edge_stack)==0:
-                    # We're done with this edge
-                    edge_certified=True
+                        # if we have just done step 1 (one edge), move on to checking
+                        # the next edge.
+                        edge_stack.append((ll,ee,2,cc,labels))
+                        break
+                    # Both edges are done: the disk develops through (ll,ee).
+                    self._record_development(ll,ee,cc,labels)
+                    if len(edge_stack)==0:
+                        # We're done with this edge
+                        edge_certified=True
+                        break
+                    # if we have pruned an edge, continue to look at pruning in the same way.
+                    parent_labels=edge_stack[-1][4]
+                    parent_labels.update(labels)
+                    ll,ee,step,cc,labels=edge_stack.pop()
         self._certified_labels.add(l)
         return True
         
@@ -343,8 +437,7 @@ class LazyDelaunaySurface(LazyDelaunayTriangulatedSurface):
 
         self._setup_direction(direction)
 
-        # Set of labels corresponding to known delaunay polygons
-        self._certified_labels=set()
+        self._setup_certification()
         self._decomposition_certified_labels=set()
 
         base_label=self._s.base_label()
@@ -375,6 +468,8 @@ class LazyDelaunaySurface(LazyDelaunayTriangulatedSurface):
                 if self._s._edge_needs_join(l,e):
                     # ll should not have already been certified!
                     assert ll not in self._decomposition_certified_labels
+                    self._invalidate(l)
+                    self._invalidate(ll)
                     self._s.join_polygons(l,e,in_place=True)
                     changed=True
                     break
@@ -396,3 +491,491 @@ class LazyDelaunaySurface(LazyDelaunayTriangulatedSurface):
         else:
             raise ValueError("Asked for polygon not known to be Delaunay. Make sure you obtain polygon labels by walking through the surface.")
 
+
+class DelaunayFlipper(object):
+    r"""
+    Flips edges of a mutable triangulated surface to obtain a Delaunay
+    triangulation.
+
+    For each edge, the flipper caches whether it needs to be flipped. A flip
+    only invalidates the edges of the two triangles involved. The predicate
+    is evaluated with interval arithmetic first and only in exact arithmetic
+    when the intervals are inconclusive.
+
+    EXAMPLES::
+
+        sage: from flatsurf import *
+        sage: from flatsurf.geometry.delaunay import DelaunayFlipper
+        sage: m = matrix([[1,3],[0,1]])
+        sage: s = (m*translation_surfaces.veech_double_n_gon(5)).triangulate().copy(mutable=True)
+        sage: flipper = DelaunayFlipper(s)
+        sage: flipper.run()
+        sage: s.is_delaunay_triangulated()
+        True
+        sage: flipper.flips() > 0
+        True
+    """
+    def __init__(self, similarity_surface, direction=None):
+        if not similarity_surface.is_mutable():
+            raise ValueError("surface must be mutable")
+        self._s = similarity_surface
+        if direction is None:
+            base_ring = self._s.base_ring()
+            direction = self._s.vector_space()( (base_ring.zero(), base_ring.one()) )
+        self._direction = direction
+        self._filtered = self._s._supports_interval_filtering()
+        # Maps an edge (label, edge) to whether it needs a flip.
+        self._needs_flip = {}
+        # Maps a label to the edge vectors of its triangle as real intervals.
+        self._interval_edges = {}
+        self._flips = 0
+
+    def flips(self):
+        r"""
+        Return the number of flips performed by this flipper.
+        """
+        return self._flips
+
+    def _interval_needs_flip(self, l1, e1, l2, e2):
+        r"""
+        Return whether the edge ``(l1, e1)`` glued to ``(l2, e2)`` needs a flip
+        or ``None`` if this cannot be decided with interval arithmetic.
+
+        See :meth:`~flatsurf.geometry.similarity_surface.SimilaritySurface._edge_needs_flip`
+        for the predicate.
+        """
+        from sage.rings.all import RIF
+        edges = []
+        for label in (l1, l2):
+            try:
+                edges.append(self._interval_edges[label])
+            except KeyError:
+                polygon = self._s.polygon(label)
+                if polygon.num_edges() != 3:
+                    raise ValueError("Edge must be adjacent to two triangles.")
+                self._interval_edges[label] = tuple((RIF(e[0]), RIF(e[1])) for e in polygon.edges())
+                edges.append(self._interval_edges[label])
+        u1 = edges[0][(e1+2)%3]
+        v1 = edges[0][(e1+1)%3]
+        u2 = edges[1][(e2+2)%3]
+        v2 = edges[1][(e2+1)%3]
+        det = (u1[0]*v1[0] + u1[1]*v1[1]) * (u2[0]*v2[1] - u2[1]*v2[0]) + \
+              (u1[0]*v1[1] - u1[1]*v1[0]) * (u2[0]*v2[0] + u2[1]*v2[1])
+        if det < 0:
+            return True
+        if det >= 0:
+            return False
+        return None
+
+    def _edge_needs_flip(self, l1, e1, l2, e2):
+        r"""
+        Return whether the edge ``(l1, e1)`` glued to ``(l2, e2)`` needs a flip
+        in exact arithmetic.
+        """
+        return self._s._edge_needs_flip(l1, e1)
+
+    def _edge_priority(self, label, edge):
+        r"""
+        Return the priority of the edge ``(label, edge)`` for the ``"longest"``
+        strategy of :meth:`run`, i.e., its squared euclidean length.
+        """
+        v = self._s.polygon(label).edge(edge)
+        return v[0]*v[0] + v[1]*v[1]
+
+    def needs_flip(self, label, edge):
+        r"""
+        Return whether the edge ``(label, edge)`` needs to be flipped to get
+        closer to the Delaunay triangulation.
+        """
+        try:
+            return self._needs_flip[(label, edge)]
+        except KeyError:
+            pass
+        label2, edge2 = self._s.opposite_edge(label, edge)
+        needs_flip = None
+        if self._filtered:
+            needs_flip = self._interval_needs_flip(label, edge, label2, edge2)
+        if needs_flip is None:
+            needs_flip = self._edge_needs_flip(label, edge, label2, edge2)
+        # The predicate is symmetric in the two triangles.
+        self._needs_flip[(label, edge)] = needs_flip
+        self._needs_flip[(label2, edge2)] = needs_flip
+        return needs_flip
+
+    def _invalidate(self, label):
+        r"""
+        Forget the cached data of the triangle ``label`` and its edges.
+        """
+        self._interval_edges.pop(label, None)
+        for edge in range(self._s.polygon(label).num_edges()):
+            self._needs_flip.pop((label, edge), None)
+            self._needs_flip.pop(self._s.opposite_edge(label, edge), None)
+
+    def flip(self, label, edge):
+        r"""
+        Flip the edge ``(label, edge)``.
+
+        Return the label of the other triangle which was involved in the flip.
+        """
+        label2, edge2 = self._s.opposite_edge(label, edge)
+        self._s.triangle_flip(label, edge, in_place=True, direction=self._direction)
+        self._flips += 1
+        self._invalidate(label)
+        if label2 != label:
+            self._invalidate(label2)
+        return label2
+
+    def run(self, strategy="labels", limit=None):
+        r"""
+        Flip edges until the triangulation is Delaunay.
+
+        The surface must be finite.
+
+        INPUT:
+
+        - ``strategy`` -- (default ``"labels"``) the order in which edges are
+          flipped. With ``"labels"`` the triangles are checked one after the
+          other and a triangle is checked again when it was involved in a
+          flip. The other strategies keep a worklist of edges: ``"fifo"``
+          checks them in the order in which they were queued, ``"lifo"``
+          checks the most recently queued edge first and ``"longest"`` checks
+          the longest queued edge first.
+
+        - ``limit`` -- (optional) if set, stop after ``limit`` flips
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: from flatsurf.geometry.delaunay import DelaunayFlipper
+            sage: m = matrix([[1,3],[0,1]])
+            sage: s0 = (m*translation_surfaces.veech_double_n_gon(5)).triangulate()
+            sage: for strategy in ["labels", "fifo", "lifo", "longest"]:
+            ....:     s = s0.copy(mutable=True)
+            ....:     DelaunayFlipper(s).run(strategy=strategy)
+            ....:     print(s.is_delaunay_triangulated())
+            True
+            True
+            True
+            True
+        """
+        if not self._s.is_finite():
+            raise NotImplementedError("can only flip until Delaunay on finite surfaces")
+        if limit is None:
+            limit = -1
+        else:
+            limit = int(limit)
+        if strategy == "labels":
+            self._run_labels(limit)
+        elif strategy in ("fifo", "lifo", "longest"):
+            self._run_edges(strategy, limit)
+        else:
+            raise ValueError("unknown strategy {!r}".format(strategy))
+
+    def _run_labels(self, limit):
+        from collections import deque
+        unchecked_labels = deque(label for label in self._s.label_iterator())
+        checked_labels = set()
+        while unchecked_labels and limit:
+            label = unchecked_labels.popleft()
+            flipped = False
+            for edge in range(3):
+                if self.needs_flip(label, edge):
+                    label2 = self.flip(label, edge)
+                    limit -= 1
+                    # Move the opposite polygon to the list of labels we need to check.
+                    if label2 != label:
+                        try:
+                            checked_labels.remove(label2)
+                            unchecked_labels.append(label2)
+                        except KeyError:
+                            # Occurs if label2 is not in checked_labels
+                            pass
+                    flipped = True
+                    break
+            if flipped:
+                unchecked_labels.append(label)
+            else:
+                checked_labels.add(label)
+
+    def _run_edges(self, strategy, limit):
+        from collections import deque
+        from heapq import heappush, heappop
+        from itertools import count
+        # The worklist contains half edges (label, edge). An entry stands for
+        # the edge which is at this position when it is popped. The set queued
+        # contains the entries of the worklist.
+        if strategy == "longest":
+            worklist = []
+            counter = count()
+        else:
+            worklist = deque()
+        queued = set()
+
+        def push(label, edge):
+            if (label, edge) in queued:
+                return
+            queued.add((label, edge))
+            if strategy == "longest":
+                heappush(worklist, (-self._edge_priority(label, edge), next(counter), label, edge))
+            else:
+                worklist.append((label, edge))
+
+        def pop():
+            if strategy == "longest":
+                label, edge = heappop(worklist)[2:]
+            elif strategy == "fifo":
+                label, edge = worklist.popleft()
+            else:
+                label, edge = worklist.pop()
+            queued.remove((label, edge))
+            return label, edge
+
+        lc = self._s._label_comparator()
+        for label in self._s.label_iterator():
+            for edge in range(3):
+                label2, edge2 = self._s.opposite_edge(label, edge)
+                if lc.lt(label, label2) or (label == label2 and edge <= edge2):
+                    push(label, edge)
+        while worklist and limit:
+            label, edge = pop()
+            if self.needs_flip(label, edge):
+                label2 = self.flip(label, edge)
+                limit -= 1
+                # Only the edges of the two triangles may have changed.
+                for l in (label, label2):
+                    for e in range(3):
+                        push(l, e)
+
+class LInfinityDelaunayFlipper(DelaunayFlipper):
+    r"""
+    Flips edges of a mutable triangulated half-dilation surface to obtain an
+    L-infinity Delaunay triangulation.
+
+    The predicate is
+    :meth:`~flatsurf.geometry.half_dilation_surface.HalfDilationSurface._edge_needs_flip_Linfinity`.
+    Its values are cached as for :class:`DelaunayFlipper`, but it is always
+    evaluated in exact arithmetic.
+
+    EXAMPLES::
+
+        sage: from flatsurf import *
+        sage: from flatsurf.geometry.delaunay import LInfinityDelaunayFlipper
+        sage: s0 = translation_surfaces.veech_double_n_gon(5)
+        sage: a = s0.base_ring().gen()
+        sage: s = (matrix(s0.base_ring(), 2, [2,a,1,1])*s0).triangulate()
+        sage: flipper = LInfinityDelaunayFlipper(s)
+        sage: flipper.run(strategy="longest")
+        sage: any(flipper.needs_flip(l, e) for l in s.label_iterator() for e in range(3))
+        False
+    """
+    def __init__(self, similarity_surface, direction=None):
+        DelaunayFlipper.__init__(self, similarity_surface, direction=direction)
+        self._filtered = False
+
+    def _edge_needs_flip(self, l1, e1, l2, e2):
+        return self._s._edge_needs_flip_Linfinity(l1, e1, l2, e2)
+
+    def _edge_priority(self, label, edge):
+        r"""
+        Return the L-infinity norm of the edge ``(label, edge)``.
+        """
+        v = self._s.polygon(label).edge(edge)
+        return max(abs(v[0]), abs(v[1]))
+
+class KineticDelaunayTriangulation(object):
+    r"""
+    Delaunay triangulation of the images `g_t S` of a half-dilation surface
+    `S` along a path of matrices `g_t`.
+
+    The path is a `2 \times 2` matrix whose entries are polynomials in `t`.
+    Its determinant should be positive for the times considered. For instance
+    the Teichmüller geodesic flow is, up to rescaling, given by
+    ``matrix([[t, 0], [0, 1]])`` for `t = e^{2s} \geq 1`.
+
+    The triangulation is kept as a triangulation of `S`. For each edge, the
+    certificate that it is Delaunay in `g_t S` is a polynomial in `t`. The
+    first time when it becomes negative is an event stored in a priority
+    queue. Edges are only flipped at these events.
+
+    EXAMPLES::
+
+        sage: from flatsurf import *
+        sage: s = translation_surfaces.veech_double_n_gon(5)
+        sage: R.<t> = s.base_ring()[]
+        sage: k = s.kinetic_delaunay_triangulation(matrix(R, [[1, t], [0, 1]]))
+        sage: k.time()
+        0
+        sage: k.advance(3)
+        sage: k.time()
+        3
+        sage: k.flips() > 0
+        True
+        sage: k.surface().is_delaunay_triangulated()
+        True
+    """
+    def __init__(self, similarity_surface, path, start=0, direction=None):
+        if not similarity_surface.is_finite():
+            raise NotImplementedError("kinetic Delaunay triangulation is only implemented for finite surfaces")
+        from flatsurf.geometry.half_dilation_surface import HalfDilationSurface
+        if not isinstance(similarity_surface, HalfDilationSurface):
+            raise ValueError("the GL(2,R) action is only defined on half-dilation surfaces")
+        from sage.rings.polynomial.polynomial_ring import is_PolynomialRing
+        if not is_PolynomialRing(path.base_ring()) or path.dimensions() != (2,2):
+            raise ValueError("path must be a 2x2 matrix over a univariate polynomial ring")
+        self._path = path
+        # The certificate of an edge is linear in this quadratic form.
+        self._form = path.transpose() * path
+        self._s = similarity_surface.triangulate()
+        if direction is None:
+            base_ring = self._s.base_ring()
+            direction = self._s.vector_space()( (base_ring.zero(), base_ring.one()) )
+        self._direction = direction
+        self._time = start
+        self._flips = 0
+        # Incremented whenever the triangle with this label is flipped.
+        self._versions = {}
+        self._events = []
+        from itertools import count
+        self._counter = count()
+
+        kinetic = self
+        class InitialFlipper(DelaunayFlipper):
+            def _edge_needs_flip(self, l1, e1, l2, e2):
+                return kinetic._sign_after(kinetic._certificate(l1, e1), kinetic._time) < 0
+        flipper = InitialFlipper(self._s, direction=direction)
+        flipper._filtered = False
+        flipper.run()
+        self._flips += flipper.flips()
+
+        lc = self._s._label_comparator()
+        for label in self._s.label_iterator():
+            for edge in range(3):
+                label2, edge2 = self._s.opposite_edge(label, edge)
+                if lc.lt(label, label2) or (label == label2 and edge <= edge2):
+                    self._schedule(label, edge)
+
+    def time(self):
+        r"""
+        Return the current time.
+        """
+        return self._time
+
+    def flips(self):
+        r"""
+        Return the number of flips performed so far.
+        """
+        return self._flips
+
+    def triangulation(self):
+        r"""
+        Return the triangulation of the undeformed surface which is Delaunay
+        at the current time.
+
+        The returned surface is mutable and owned by this object.
+        """
+        return self._s
+
+    def surface(self):
+        r"""
+        Return the Delaunay triangulated surface at the current time.
+        """
+        m = self._path.apply_map(lambda f: f(self._time))
+        return m * self._s.copy()
+
+    def next_event(self):
+        r"""
+        Return the next time at which an edge needs to be flipped or ``None``
+        if there is no such time.
+        """
+        while self._events and not self._is_valid(self._events[0]):
+            from heapq import heappop
+            heappop(self._events)
+        if self._events:
+            return self._events[0][0]
+        return None
+
+    def advance(self, time):
+        r"""
+        Flip the edges which stop being Delaunay until ``time`` is reached.
+        """
+        if time < self._time:
+            raise ValueError("can not go back in time")
+        from heapq import heappop
+        while self._events and self._events[0][0] <= time:
+            event = heappop(self._events)
+            if not self._is_valid(event):
+                continue
+            self._time = event[0]
+            self._flip(event[2], event[3])
+        self._time = time
+
+    def _certificate(self, label, edge):
+        r"""
+        Return the polynomial in `t` which is nonnegative at the times at
+        which the edge ``(label, edge)`` is Delaunay.
+
+        This is the predicate of
+        :meth:`~flatsurf.geometry.similarity_surface.SimilaritySurface._edge_needs_flip`
+        where the dot products are taken with respect to `g_t^T g_t`.
+        """
+        from flatsurf.geometry.polygon import wedge_product
+        label2, edge2 = self._s.opposite_edge(label, edge)
+        poly1 = self._s.polygon(label)
+        poly2 = self._s.polygon(label2)
+        u1 = poly1.edge(edge+2)
+        v1 = poly1.edge(edge+1)
+        u2 = poly2.edge(edge2+2)
+        v2 = poly2.edge(edge2+1)
+        Q = self._form
+        return (u1*Q*v1) * wedge_product(u2,v2) + wedge_product(u1,v1) * (u2*Q*v2)
+
+    @staticmethod
+    def _sign_after(f, time):
+        r"""
+        Return the sign of the polynomial ``f`` just after ``time``.
+        """
+        if f.is_zero():
+            return 0
+        while True:
+            value = f(time)
+            if value > 0:
+                return 1
+            if value < 0:
+                return -1
+            f = f.derivative()
+
+    def _schedule(self, label, edge):
+        r"""
+        Queue the first time when the edge ``(label, edge)`` stops being Delaunay.
+        """
+        f = self._certificate(label, edge)
+        if f.is_zero():
+            return
+        from sage.rings.qqbar import AA
+        from heapq import heappush
+        label2, edge2 = self._s.opposite_edge(label, edge)
+        for root in sorted(f.change_ring(AA).roots(multiplicities=False)):
+            if root >= self._time and self._sign_after(f, root) < 0:
+                heappush(self._events, (root, next(self._counter), label, edge,
+                    self._versions.get(label, 0), label2, self._versions.get(label2, 0)))
+                return
+
+    def _is_valid(self, event):
+        _, _, label, _, version, label2, version2 = event
+        return self._versions.get(label, 0) == version and self._versions.get(label2, 0) == version2
+
+    def _flip(self, label, edge):
+        label2, edge2 = self._s.opposite_edge(label, edge)
+        self._s.triangle_flip(label, edge, in_place=True, direction=self._direction)
+        self._flips += 1
+        for l in set([label, label2]):
+            self._versions[l] = self._versions.get(l, 0) + 1
+        # Only the edges of the two triangles changed.
+        seen = set()
+        for l in (label, label2):
+            for e in range(3):
+                if (l, e) in seen:
+                    continue
+                seen.add((l, e))
+                seen.add(self._s.opposite_edge(l, e))
+                self._schedule(l, e)
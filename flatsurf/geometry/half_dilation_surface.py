@@ -189,7 +189,7 @@ class HalfDilationSurface(SimilaritySurface):
         n = max(abs(new_edge[0]), abs(new_edge[1]))
         return n < n1
 
-    def l_infinity_delaunay_triangulation(self, triangulated=False, in_place=False, limit=None, direction=None):
+    def l_infinity_delaunay_triangulation(self, triangulated=False, in_place=False, limit=None, direction=None, strategy="fifo"):
         r"""
         Returns a L-infinity Delaunay triangulation of a surface, or make some
         triangle flips to get closer to the Delaunay decomposition.
@@ -214,6 +214,10 @@ class HalfDilationSurface(SimilaritySurface):
           triangles have opposite signs. Labels are chosen so that this sign is
           preserved (as a function of labels).
 
+        - ``strategy`` -- optional (string, default ``"fifo"``) the order in
+          which edges are flipped, see
+          :meth:`~flatsurf.geometry.delaunay.DelaunayFlipper.run`.
+
         EXAMPLES::
 
             sage: from flatsurf import *
@@ -233,6 +237,10 @@ class HalfDilationSurface(SimilaritySurface):
             sage: s = (m**3)*s0
             sage: s = s.l_infinity_delaunay_triangulation()
             sage: TestSuite(s).run()
+
+            sage: s = (m**3)*s0
+            sage: s = s.l_infinity_delaunay_triangulation(strategy="longest")
+            sage: TestSuite(s).run()
         """
         if not self.is_finite():
             raise NotImplementedError("no L-infinity Delaunay implemented for infinite surfaces")
@@ -243,8 +251,8 @@ class HalfDilationSurface(SimilaritySurface):
                 from flatsurf.geometry.surface import Surface_dict
                 s = self.__class__(Surface_dict(surface=self,mutable=True))
         else:
-            from flatsurf.geometry.surface import Surface_list
-            s = self.__class__(Surface_list(surface=self.triangulate(in_place=in_place),mutable=True))
+            # The triangulation is a mutable copy unless done in place.
+            s = self.triangulate(in_place=in_place)
 
         if direction is None:
             base_ring = self.base_ring()
@@ -252,22 +260,30 @@ class HalfDilationSurface(SimilaritySurface):
         else:
             assert not direction.is_zero()
 
-        triangles = set(s.label_iterator())
-        if limit is None:
-            limit = -1
-        else:
-            limit = int(limit)
-        while triangles and limit:
-            p1 = triangles.pop()
-            for e1 in range(3):
-                p2, e2 = s.opposite_edge(p1, e1)
-                if s._edge_needs_flip_Linfinity(p1, e1, p2, e2):
-                    s.triangle_flip(p1, e1, in_place=True, direction=direction)
-                    triangles.add(p1)
-                    triangles.add(p2)
-                    limit -= 1
+        from flatsurf.geometry.delaunay import LInfinityDelaunayFlipper
+        LInfinityDelaunayFlipper(s, direction=direction).run(strategy=strategy, limit=limit)
         return s
 
+    def kinetic_delaunay_triangulation(self, path, start=0, direction=None):
+        r"""
+        Return a Delaunay triangulation of the images of this surface along
+        the path of matrices ``path`` which can be advanced in time.
+
+        See :class:`~flatsurf.geometry.delaunay.KineticDelaunayTriangulation`.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: s = translation_surfaces.regular_octagon()
+            sage: R.<t> = s.base_ring()[]
+            sage: k = s.kinetic_delaunay_triangulation(matrix(R, [[t, 0], [0, 1]]), start=1)
+            sage: k.advance(10)
+            sage: k.surface().is_delaunay_triangulated()
+            True
+        """
+        from flatsurf.geometry.delaunay import KineticDelaunayTriangulation
+        return KineticDelaunayTriangulation(self, path, start=start, direction=direction)
+
 class GL2RImageSurface(Surface):
     r"""
     This is a lazy implementation of the SL(2,R) image of a translation surface.
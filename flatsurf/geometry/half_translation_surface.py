@@ -73,44 +73,19 @@ class HalfTranslationSurface(HalfDilationSurface, RationalConeSurface):
         if not self.is_finite():
             raise NotImplementedError("the set of edges is infinite!")
 
-        edges = set(self.edge_iterator())
         angles = []
-
-        if return_adjacent_edges:
-            while edges:
-                pair = p,e = next(iter(edges))
+        for adjacent_edges in self._vertex_classes()[0]:
+            angle = 0
+            for p,e in adjacent_edges:
+                f = (e-1) % self.polygon(p).num_edges()
                 ve = self.polygon(p).edge(e)
-                angle = 0
-                adjacent_edges = []
-                while pair in edges:
-                    adjacent_edges.append(pair)
-                    edges.remove(pair)
-                    f = (e-1) % self.polygon(p).num_edges()
-                    ve = self.polygon(p).edge(e)
-                    vf = -self.polygon(p).edge(f)
-                    ppair = pp,ff = self.opposite_edge(p, f)
-                    angle += (ve[0] > 0 and vf[0] <= 0) or (ve[0] < 0 and vf[0] >= 0) or (ve[0] == vf[0] == 0)
-                    pair, p, e = ppair, pp, ff
-                if numerical:
-                    angles.append((float(angle) / 2, adjacent_edges))
-                else:
-                    angles.append((QQ((angle, 2)), adjacent_edges))
-        else:
-            while edges:
-                pair = p,e = next(iter(edges))
-                angle = 0
-                while pair in edges:
-                    edges.remove(pair)
-                    f = (e-1) % self.polygon(p).num_edges()
-                    ve = self.polygon(p).edge(e)
-                    vf = -self.polygon(p).edge(f)
-                    ppair = pp,ff = self.opposite_edge(p, f)
-                    angle += (ve[0] > 0 and vf[0] <= 0) or (ve[0] < 0 and vf[0] >= 0) or (ve[0] == vf[0] == 0)
-                    pair, p, e = ppair, pp, ff
-                if numerical:
-                    angles.append(float(angle) / 2)
-                else:
-                    angles.append(QQ((angle,2)))
+                vf = -self.polygon(p).edge(f)
+                angle += (ve[0] > 0 and vf[0] <= 0) or (ve[0] < 0 and vf[0] >= 0) or (ve[0] == vf[0] == 0)
+            angle = float(angle) / 2 if numerical else QQ((angle, 2))
+            if return_adjacent_edges:
+                angles.append((angle, list(adjacent_edges)))
+            else:
+                angles.append(angle)
 
         return angles
 
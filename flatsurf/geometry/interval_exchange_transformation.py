@@ -1,6 +1,8 @@
 from __future__ import absolute_import, print_function, division
 from six.moves import range, map, filter, zip
 
+from bisect import bisect_right
+
 from sage.structure.sage_object import SageObject
 
 class FlowPolygonMap(SageObject):
@@ -66,41 +68,17 @@ class FlowPolygonMap(SageObject):
         self._top_lengths = list(map(ring,top_lengths))
 
 
-        # forward image of intervals
-        it = 0
-        lt = x1 = top_lengths[it]
-        self._forward_images = []
-        for ib in range(len(bot_lengths)):
-            lenb = bot_lengths[ib]
-            self._forward_images.append((it,lt-x1))
+        # positions of the endpoints of the intervals in the common interval
+        self._bot_starts = self._cumulative(self._bot_lengths)
+        self._top_starts = self._cumulative(self._top_lengths)
 
-            while lenb and lenb >= x1:
-                lenb -= x1
-                it += 1
-                if it < len(top_lengths):
-                    lt = x1 = top_lengths[it]
-                else:
-                    lt = ring.zero()
-            if lenb:
-                x1 -= lenb
-
-        # backward image of intervals
-        ib = 0
-        lb = x1 = bot_lengths[ib]
-        self._backward_images = []
-        for it in range(len(top_lengths)):
-            lent = top_lengths[it]
-            self._backward_images.append((ib,lb-x1))
-
-            while lent and lent >= x1:
-                lent -= x1
-                ib += 1
-                if ib < len(bot_lengths):
-                    lb = x1 = bot_lengths[ib]
-                else:
-                    lb = ring.zero()
-            if lent:
-                x1 -= lent
+    def _cumulative(self, lengths):
+        starts = []
+        pos = self._ring.zero()
+        for length in lengths:
+            starts.append(pos)
+            pos += length
+        return starts
 
     def length_bot(self, i):
         i = self._bot_labels_to_index[i]
@@ -110,6 +88,43 @@ class FlowPolygonMap(SageObject):
         i = self._top_labels_to_index[i]
         return self._top_lengths[i]
 
+    def _pieces(self):
+        r"""
+        Iterate over the maximal subintervals on which this map is a
+        translation.
+
+        Each subinterval is given as a tuple ``(i, x, j, y, length)`` where
+        ``(i, x)`` is its start in the bottom partition and ``(j, y)`` the
+        start of its image in the top partition.
+
+        EXAMPLES::
+
+            sage: from flatsurf.geometry.interval_exchange_transformation import FlowPolygonMap
+            sage: T = FlowPolygonMap(QQ, [0,1,2], [2,3,1], [2,1,0], [1,3,2])
+            sage: list(T._pieces())
+            [(0, 0, 2, 0, 1), (0, 1, 1, 0, 1), (1, 0, 1, 1, 2), (1, 2, 0, 0, 1), (2, 0, 0, 1, 1)]
+        """
+        bot = self._bot_lengths
+        top = self._top_lengths
+        i = j = 0
+        pos = bot_start = top_start = self._ring.zero()
+        bot_end = bot[0]
+        top_end = top[0]
+        while i < len(bot) and j < len(top):
+            end = min(bot_end, top_end)
+            yield (self._bot_labels[i], pos - bot_start, self._top_labels[j], pos - top_start, end - pos)
+            pos = end
+            if bot_end == end:
+                i += 1
+                bot_start = end
+                if i < len(bot):
+                    bot_end = end + bot[i]
+            if top_end == end:
+                j += 1
+                top_start = end
+                if j < len(top):
+                    top_end = end + top[j]
+
     def _repr_(self):
         s = ["Flow polygon map:"]
         s.append(" " + " ".join(str(x) for x in self._top_labels))
@@ -137,15 +152,9 @@ class FlowPolygonMap(SageObject):
         i = self._bot_labels_to_index[i]
         if x < self._ring.zero() or x > self._bot_lengths[i]:
             raise ValueError("x = {} is out of the interval".format(x))
-        j,y = self._forward_images[i]
-        if x+y < self._top_lengths[j]:
-            return (self._top_labels[j], x+y)
-        x -= self._top_lengths[j]-y
-        j += 1
-        while x > self._top_lengths[j]:
-            x -= self._top_lengths[j]
-            j += 1
-        return (self._top_labels[j],x)
+        x += self._bot_starts[i]
+        j = bisect_right(self._top_starts, x) - 1
+        return (self._top_labels[j], x - self._top_starts[j])
 
     def backward_image(self, i, x):
         r"""
@@ -191,12 +200,631 @@ class FlowPolygonMap(SageObject):
         i = self._top_labels_to_index[i]
         if x < self._ring.zero() or x > self._top_lengths[i]:
             raise ValueError("x = {} is out of the interval".format(x))
-        j,y = self._backward_images[i]
-        if x+y < self._bot_lengths[j]:
-            return (self._bot_labels[j], x+y)
-        x -= self._bot_lengths[j]-y
-        j += 1
-        while x > self._bot_lengths[j]:
-            x -= self._bot_lengths[j]
-            j += 1
-        return (self._bot_labels[j],x)
+        x += self._top_starts[i]
+        j = bisect_right(self._bot_starts, x) - 1
+        return (self._bot_labels[j], x - self._bot_starts[j])
+
+    def _images(self, points, labels_to_index, lengths, starts, image_labels, image_starts):
+        images = []
+        j = 0
+        previous = None
+        for i, x in points:
+            i = labels_to_index[i]
+            if x < self._ring.zero() or x > lengths[i]:
+                raise ValueError("x = {} is out of the interval".format(x))
+            x += starts[i]
+            if previous is not None and x < previous:
+                raise ValueError("the points must be sorted")
+            previous = x
+            while j + 1 < len(image_starts) and image_starts[j + 1] <= x:
+                j += 1
+            images.append((image_labels[j], x - image_starts[j]))
+        return images
+
+    def forward_images(self, points):
+        r"""
+        Return the list of the forward images of ``points``.
+
+        The ``points`` must be a list of pairs ``(i, x)`` sorted from left to
+        right, i.e., by the position of ``i`` in the bottom partition and then
+        by ``x``. The images are then found in a single pass over the top
+        partition.
+
+        EXAMPLES::
+
+            sage: from flatsurf.geometry.interval_exchange_transformation import FlowPolygonMap
+            sage: T = FlowPolygonMap(QQ, [0,1,2], [2,3,1], [2,1,0], [1,3,2])
+            sage: points = [(0,0), (0,1), (0,3/2), (1,2), (2,1/2)]
+            sage: T.forward_images(points)
+            [(2, 0), (1, 0), (1, 1/2), (0, 0), (0, 3/2)]
+            sage: T.forward_images(points) == [T.forward_image(i, x) for i, x in points]
+            True
+            sage: T.forward_images([(1,0), (0,1)])
+            Traceback (most recent call last):
+            ...
+            ValueError: the points must be sorted
+        """
+        return self._images(points, self._bot_labels_to_index, self._bot_lengths,
+                            self._bot_starts, self._top_labels, self._top_starts)
+
+    def backward_images(self, points):
+        r"""
+        Return the list of the backward images of ``points``.
+
+        The ``points`` must be a list of pairs ``(i, x)`` sorted by the
+        position of ``i`` in the top partition and then by ``x``. See
+        :meth:`forward_images`.
+
+        EXAMPLES::
+
+            sage: from flatsurf.geometry.interval_exchange_transformation import FlowPolygonMap
+            sage: T = FlowPolygonMap(QQ, [0,1,2], [2,3,1], [2,1,0], [1,3,2])
+            sage: points = [(2,1/2), (1,0), (1,5/2), (0,1)]
+            sage: T.backward_images(points) == [T.backward_image(i, x) for i, x in points]
+            True
+        """
+        return self._images(points, self._top_labels_to_index, self._top_lengths,
+                            self._top_starts, self._bot_labels, self._bot_starts)
+
+def _check_finite_translation_surface(surface):
+    r"""
+    Raise a ``ValueError`` if ``surface`` is not a finite translation surface.
+
+    EXAMPLES::
+
+        sage: from flatsurf import similarity_surfaces, translation_surfaces
+        sage: from flatsurf.geometry.interval_exchange_transformation import _check_finite_translation_surface
+        sage: _check_finite_translation_surface(translation_surfaces.square_torus())
+        sage: _check_finite_translation_surface(similarity_surfaces.example())
+        Traceback (most recent call last):
+        ...
+        ValueError: the surface must be a translation surface
+    """
+    if not surface.is_finite():
+        raise ValueError("the surface must be finite")
+    from flatsurf.geometry.translation_surface import TranslationSurface
+    if not isinstance(surface, TranslationSurface):
+        raise ValueError("the surface must be a translation surface")
+
+class TransversalIET(SageObject):
+    r"""
+    The interval exchange transformation induced by the straight line flow in
+    a given direction on the transversal made of the edges of a finite
+    translation surface.
+
+    The transversal is the union of the edges through which the flow enters
+    the polygons. These edges are put one after the other in order to form an
+    interval ``[0, L)``. A point of the transversal is either given as its
+    position in this interval or as a triple ``(p, e, x)`` as in
+    :class:`~flatsurf.geometry.straight_line_trajectory.StraightLineTrajectoryTranslation`.
+    Applying the map once corresponds to crossing one polygon.
+
+    To iterate the map many times, :meth:`induce` performs Rauzy-Veech
+    induction, with the Zorich acceleration that groups the consecutive steps
+    that have the same winner. Each step of the induction gives the first
+    return map to a smaller initial subinterval together with the return
+    times and the words coding the returns. :meth:`iterate` then uses the
+    deepest induced map that does not overshoot, and :meth:`coding` expands the
+    words to recover the sequence of polygons that are crossed.
+
+    EXAMPLES::
+
+        sage: from flatsurf import translation_surfaces
+        sage: from flatsurf.geometry.interval_exchange_transformation import TransversalIET
+        sage: S = SymmetricGroup(3)
+        sage: o = translation_surfaces.origami(S('(1,2)'), S('(1,3)'))
+        sage: K.<sqrt2> = QuadraticField(2)
+        sage: T = TransversalIET(o, (1, sqrt2))
+        sage: T.levels()
+        1
+        sage: x = T.length() / 3
+        sage: y = x
+        sage: for _ in range(500):
+        ....:     y = T(y)
+        sage: T.induce(30) <= 30
+        True
+        sage: T.levels() > 1
+        True
+        sage: T.iterate(x, 500) == y
+        True
+
+    The sequence of crossed polygons is recovered from the induction::
+
+        sage: orbit = [x]
+        sage: for _ in range(99):
+        ....:     orbit.append(T(orbit[-1]))
+        sage: list(T.coding(x, 100)) == [T.state(z)[:2] for z in orbit]
+        True
+
+    The states of trajectories can be used directly::
+
+        sage: T.iterate_state(T.state(x), 500) == T.state(y)
+        True
+    """
+    def __init__(self, surface, direction):
+        _check_finite_translation_surface(surface)
+
+        self._s = surface
+        self._direction = direction
+
+        maps = {}
+        self._edges = []
+        self._edge_starts = []
+        self._edge_index = {}
+        ring = None
+        for p in surface.label_iterator():
+            T = maps[p] = surface.polygon(p).flow_map(direction)
+            ring = T._ring
+            for e, length in zip(T._bot_labels, T._bot_lengths):
+                self._edge_index[(p, e)] = len(self._edges)
+                self._edges.append((p, e))
+                self._edge_starts.append(length)
+        self._ring = ring
+
+        # positions of the edges on the transversal
+        pos = ring.zero()
+        for i, length in enumerate(self._edge_starts):
+            self._edge_starts[i] = pos
+            pos += length
+        self._length = pos
+
+        # the subintervals on which the map is a translation
+        self._pieces = []
+        pieces = []
+        images = []
+        for p in surface.label_iterator():
+            for e, x, f, y, length in maps[p]._pieces():
+                q, f = surface.opposite_edge(p, f)
+                self._pieces.append(self._edge_index[(p, e)])
+                images.append(self._edge_starts[self._edge_index[(q, f)]] + y)
+                pieces.append(length)
+
+        # the pieces are already sorted by their starting positions
+        d = len(pieces)
+        bot = sorted(range(d), key=lambda a: images[a])
+
+        self._tops = []
+        self._bots = []
+        self._lengths = []
+        self._returns = []
+        self._subs = []
+        self._defined = []
+        self._starts = []
+        self._translations = []
+        self._widths = []
+        self._add_level(list(range(d)), bot, pieces, [1] * d, {})
+
+    def _repr_(self):
+        return "Interval exchange transformation on the transversal of {} in direction {}".format(self._s, self._direction)
+
+    def _add_level(self, top, bot, lengths, returns, sub):
+        k = len(self._tops)
+        starts = []
+        start_of = {}
+        pos = self._ring.zero()
+        for a in top:
+            starts.append(pos)
+            start_of[a] = pos
+            pos += lengths[a]
+        translations = [None] * len(top)
+        image = self._ring.zero()
+        for a in bot:
+            translations[a] = image - start_of[a]
+            image += lengths[a]
+
+        defined = list(self._defined[-1]) if self._defined else [0] * len(top)
+        for a in sub:
+            defined[a] = k
+
+        self._tops.append(top)
+        self._bots.append(bot)
+        self._lengths.append(lengths)
+        self._returns.append(returns)
+        self._subs.append(sub)
+        self._defined.append(defined)
+        self._starts.append(starts)
+        self._translations.append(translations)
+        self._widths.append(pos)
+
+    def length(self):
+        r"""
+        Return the length of the transversal.
+        """
+        return self._length
+
+    def levels(self):
+        r"""
+        Return the number of induced maps computed so far, including this map.
+        """
+        return len(self._tops)
+
+    def max_return_time(self):
+        r"""
+        Return the largest return time of the deepest induced map.
+        """
+        return max(self._returns[-1])
+
+    def position(self, p, e, x):
+        r"""
+        Return the position on the transversal of the point ``x`` of the edge
+        ``e`` of the polygon ``p``.
+        """
+        x = self._ring(x)
+        i = self._edge_index[(p, e)]
+        return self._edge_starts[i] + x
+
+    def state(self, x):
+        r"""
+        Return the triple ``(p, e, x)`` corresponding to the position ``x``
+        on the transversal.
+        """
+        i = bisect_right(self._edge_starts, x) - 1
+        p, e = self._edges[i]
+        return (p, e, x - self._edge_starts[i])
+
+    def _locate(self, k, x):
+        i = bisect_right(self._starts[k], x) - 1
+        return i, self._tops[k][i]
+
+    def __call__(self, x):
+        r"""
+        Return the image of the position ``x``.
+        """
+        if x < 0 or x >= self._length:
+            raise ValueError("x = {} is out of the interval".format(x))
+        i, a = self._locate(0, x)
+        return x + self._translations[0][a]
+
+    def induce(self, steps=1):
+        r"""
+        Perform ``steps`` steps of Rauzy-Veech induction with Zorich
+        acceleration.
+
+        Return the number of steps that have been performed. It is less than
+        ``steps`` when the induction stops because of a saddle connection in
+        the flow direction.
+        """
+        for n in range(steps):
+            top = list(self._tops[-1])
+            bot = list(self._bots[-1])
+            lengths = list(self._lengths[-1])
+            returns = list(self._returns[-1])
+            sub = {}
+
+            alpha = top[-1]
+            beta = bot[-1]
+            if lengths[alpha] > lengths[beta]:
+                winner, loser = alpha, beta
+                tail = bot[bot.index(alpha) + 1:]
+            elif lengths[beta] > lengths[alpha]:
+                winner, loser = beta, alpha
+                tail = top[top.index(beta) + 1:]
+            else:
+                return n
+
+            S = sum(lengths[a] for a in tail)
+            q = (lengths[winner] / S).floor()
+            if q * S == lengths[winner]:
+                q -= 1
+
+            if q > 0:
+                # full turns of the losers around the winner
+                lengths[winner] -= q * S
+                for a in tail:
+                    returns[a] += q * returns[winner]
+                    if winner == alpha:
+                        sub[a] = [(a, 1), (winner, q)]
+                    else:
+                        sub[a] = [(winner, q), (a, 1)]
+            else:
+                lengths[winner] -= lengths[loser]
+                returns[loser] += returns[winner]
+                if winner == alpha:
+                    sub[loser] = [(loser, 1), (winner, 1)]
+                    bot.pop()
+                    bot.insert(bot.index(winner) + 1, loser)
+                else:
+                    sub[loser] = [(winner, 1), (loser, 1)]
+                    top.pop()
+                    top.insert(top.index(winner) + 1, loser)
+
+            self._add_level(top, bot, lengths, returns, sub)
+        return steps
+
+    def _jumps(self, x, n):
+        r"""
+        Iterate over the jumps used to compute the ``n``-th image of ``x``.
+
+        Each jump is a tuple ``(k, a, c, y)`` meaning that the induced map at
+        level ``k`` has been applied ``c`` times to points in its interval
+        ``a`` and that ``y`` is the resulting position.
+        """
+        if x < 0 or x >= self._length:
+            raise ValueError("x = {} is out of the interval".format(x))
+        widths = self._widths
+        while n > 0:
+            k = len(widths) - 1
+            while x >= widths[k]:
+                k -= 1
+            while True:
+                i, a = self._locate(k, x)
+                r = self._returns[k][a]
+                if r <= n:
+                    break
+                k -= 1
+
+            # number of consecutive applications that stay in the interval a
+            t = self._translations[k][a]
+            if t < 0:
+                c = ((x - self._starts[k][i]) / -t).floor() + 1
+            elif t > 0:
+                c = -((x - self._starts[k][i] - self._lengths[k][a]) / t).floor()
+            else:
+                c = n
+            c = min(c, n // r)
+
+            x += c * t
+            n -= c * r
+            yield (k, a, c, x)
+
+    def iterate(self, x, n):
+        r"""
+        Return the ``n``-th image of the position ``x``.
+        """
+        for _, _, _, x in self._jumps(x, n):
+            pass
+        return x
+
+    def iterate_state(self, state, n):
+        r"""
+        Return the ``n``-th image of the triple ``state = (p, e, x)``.
+        """
+        return self.state(self.iterate(self.position(*state), n))
+
+    def _expand(self, k, a):
+        r"""
+        Iterate over the pieces of the original map visited by the points of
+        the interval ``a`` of the induced map at level ``k`` until they return.
+        """
+        stack = [[k, a, 1]]
+        while stack:
+            top = stack[-1]
+            k, a, m = top
+            if m == 0:
+                stack.pop()
+                continue
+            top[2] -= 1
+            k = self._defined[k][a]
+            if k == 0:
+                yield a
+            else:
+                for b, m in reversed(self._subs[k][a]):
+                    stack.append([k - 1, b, m])
+
+    def coding(self, x, n):
+        r"""
+        Iterate over the pairs ``(p, e)`` made of the polygons that are
+        crossed by the ``n`` first iterations of ``x`` and the edges through
+        which they are entered.
+        """
+        edges = self._edges
+        pieces = self._pieces
+        for k, a, c, _ in self._jumps(x, n):
+            for _ in range(c):
+                for b in self._expand(k, a):
+                    yield edges[pieces[b]]
+
+class FirstReturnMap(SageObject):
+    r"""
+    The first return map of the straight line flow in a given direction to a
+    union of edges of a finite translation surface.
+
+    The edges are put one after the other, in the order they are given, in
+    order to form an interval ``[0, L)``. An edge ``(p, e)`` through which the
+    flow leaves the polygon ``p`` is replaced by its opposite edge. As in
+    :class:`TransversalIET`, a point of the transversal is either given as its
+    position in this interval or as a triple ``(p, e, x)``.
+
+    The map is computed exactly once and for all: the edges are pushed
+    through the polygons with :meth:`FlowPolygonMap._pieces` and split at
+    their breakpoints until they come back to the transversal. The result is
+    an interval exchange given by its pieces together with the number of
+    polygons crossed before returning. For billiards, see
+    :meth:`~flatsurf.geometry.similarity_surface.SimilaritySurface.first_return_map`.
+
+    EXAMPLES::
+
+        sage: from flatsurf import translation_surfaces
+        sage: from flatsurf.geometry.interval_exchange_transformation import FirstReturnMap
+        sage: K.<sqrt2> = QuadraticField(2)
+        sage: T = translation_surfaces.square_torus()
+        sage: R = FirstReturnMap(T, (1, sqrt2), [(0, 0)])
+        sage: R.length()
+        sqrt2
+        sage: R.pieces()
+        [(0, 1, sqrt2 - 1, 1), (sqrt2 - 1, 0, 1, 2)]
+        sage: R(1/3), R.return_time(1/3)
+        (4/3, 1)
+        sage: R.images([0, 1/3, sqrt2 - 1])
+        [1, 4/3, 0]
+        sage: R.images([0, 1/3], 2)
+        [-sqrt2 + 2, -sqrt2 + 7/3]
+
+    TESTS::
+
+        sage: S = SymmetricGroup(3)
+        sage: o = translation_surfaces.origami(S('(1,2)'), S('(1,3)'))
+        sage: R = FirstReturnMap(o, (1, sqrt2), [(1, 0), (3, 1)])
+        sage: def naive(x):
+        ....:     p, e, y = R.state(x)
+        ....:     t = 0
+        ....:     while True:
+        ....:         e, y = o.polygon(p).flow_map((1, sqrt2)).forward_image(e, y)
+        ....:         p, e = o.opposite_edge(p, e)
+        ....:         t += 1
+        ....:         if (p, e) in R._edge_index:
+        ....:             return R.position(p, e, y), t
+        sage: points = [R.length() * k / 17 for k in range(17)]
+        sage: all(naive(x) == (R(x), R.return_time(x)) for x in points)
+        True
+        sage: R.images(points) == [R(x) for x in points]
+        True
+    """
+    def __init__(self, surface, direction, edges):
+        _check_finite_translation_surface(surface)
+
+        self._s = surface
+        self._direction = direction
+        self._maps = {}
+
+        self._edges = []
+        self._edge_index = {}
+        self._edge_starts = []
+        for p, e in edges:
+            T = self._flow_map(p)
+            if e not in T._bot_labels_to_index:
+                p, e = surface.opposite_edge(p, e)
+                T = self._flow_map(p)
+            if (p, e) in self._edge_index:
+                raise ValueError("edge {} appears twice".format((p, e)))
+            self._edge_index[(p, e)] = len(self._edges)
+            self._edges.append((p, e))
+            self._edge_starts.append(T.length_bot(e))
+        if not self._edges:
+            raise ValueError("at least one edge must be given")
+        self._ring = T._ring
+
+        pos = self._ring.zero()
+        for i, length in enumerate(self._edge_starts):
+            self._edge_starts[i] = pos
+            pos += length
+        self._length = pos
+
+        self._compute()
+
+    def _flow_map(self, label):
+        try:
+            return self._maps[label]
+        except KeyError:
+            T = self._maps[label] = self._s.polygon(label).flow_map(self._direction)
+            return T
+
+    def _compute(self):
+        r"""
+        Compute the pieces of the return map.
+
+        Each interval to push is a tuple ``(a, p, e, x, length, time)``: the
+        interval of the transversal starting at ``a`` is currently the interval
+        starting at ``x`` on the edge ``e`` of the polygon ``p`` after crossing
+        ``time`` polygons.
+        """
+        pieces_of = {}
+        pieces = []
+        stack = [(self._edge_starts[i], p, e, self._ring.zero(), self._flow_map(p).length_bot(e), 0)
+                 for i, (p, e) in enumerate(self._edges)]
+        while stack:
+            a, p, e, x, length, time = stack.pop()
+            try:
+                polygon_pieces = pieces_of[p]
+            except KeyError:
+                polygon_pieces = pieces_of[p] = {}
+                for i, px, j, py, plen in self._flow_map(p)._pieces():
+                    polygon_pieces.setdefault(i, []).append((px, j, py, plen))
+
+            end = x + length
+            for px, j, py, plen in polygon_pieces[e]:
+                u = max(x, px)
+                v = min(end, px + plen)
+                if u >= v:
+                    continue
+                q, f = self._s.opposite_edge(p, j)
+                y = py + u - px
+                i = self._edge_index.get((q, f))
+                if i is None:
+                    stack.append((a + u - x, q, f, y, v - u, time + 1))
+                else:
+                    pieces.append((a + u - x, self._edge_starts[i] + y, v - u, time + 1))
+
+        pieces.sort()
+        self._pieces = pieces
+        self._starts = [piece[0] for piece in pieces]
+
+    def _repr_(self):
+        return "First return map of the flow in direction {} on {} to the edges {}".format(self._direction, self._s, self._edges)
+
+    def length(self):
+        r"""
+        Return the length of the transversal.
+        """
+        return self._length
+
+    def pieces(self):
+        r"""
+        Return the list of the maximal subintervals on which the return map is
+        a translation with constant return time.
+
+        Each piece is given as a tuple ``(start, image, length, time)`` of
+        positions on the transversal, its length, and the number of polygons
+        that are crossed before returning.
+        """
+        return list(self._pieces)
+
+    def position(self, p, e, x):
+        r"""
+        Return the position on the transversal of the point ``x`` of the edge
+        ``e`` of the polygon ``p``.
+        """
+        x = self._ring(x)
+        i = self._edge_index[(p, e)]
+        return self._edge_starts[i] + x
+
+    def state(self, x):
+        r"""
+        Return the triple ``(p, e, x)`` corresponding to the position ``x``
+        on the transversal.
+        """
+        i = bisect_right(self._edge_starts, x) - 1
+        p, e = self._edges[i]
+        return (p, e, x - self._edge_starts[i])
+
+    def _locate(self, x):
+        if x < 0 or x >= self._length:
+            raise ValueError("x = {} is out of the interval".format(x))
+        return self._pieces[bisect_right(self._starts, x) - 1]
+
+    def __call__(self, x):
+        r"""
+        Return the image of the position ``x``.
+        """
+        start, image, _, _ = self._locate(x)
+        return image + (x - start)
+
+    def return_time(self, x):
+        r"""
+        Return the number of polygons that are crossed by the position ``x``
+        before it comes back to the transversal.
+        """
+        return self._locate(x)[3]
+
+    def images(self, points, n=1):
+        r"""
+        Return the list of the ``n``-th images of the positions ``points``.
+
+        At each iteration, the points are sorted and matched with the pieces
+        in a single pass.
+        """
+        points = [self._ring(x) for x in points]
+        if any(x < 0 or x >= self._length for x in points):
+            raise ValueError("some point is out of the interval")
+        pieces = self._pieces
+        for _ in range(n):
+            i = 0
+            images = [None] * len(points)
+            for k in sorted(range(len(points)), key=points.__getitem__):
+                x = points[k]
+                while i + 1 < len(pieces) and pieces[i + 1][0] <= x:
+                    i += 1
+                start, image, _, _ = pieces[i]
+                images[k] = image + (x - start)
+            points = images
+        return points
@@ -4,6 +4,8 @@ from __future__ import absolute_import, print_function, division
 from six.moves import range, map, filter, zip
 from six import iteritems
 
+from bisect import bisect_left, bisect_right
+
 from flatsurf.geometry.polygon import ConvexPolygons, wedge_product
 from flatsurf.geometry.surface import Surface, Surface_list, Surface_dict, ExtraLabel
 from flatsurf.geometry.similarity_surface import SimilaritySurface
@@ -37,6 +39,14 @@ class SurfaceMapping:
     def pull_vector_back(self,tangent_vector):
         r"""Applies the inverse of the mapping to the provided vector."""
         raise NotImplementedError
+
+    def push_vectors_forward(self,tangent_vectors):
+        r"""Applies the mapping to each of the provided vectors and returns the list of images."""
+        return [self.push_vector_forward(v) for v in tangent_vectors]
+
+    def pull_vectors_back(self,tangent_vectors):
+        r"""Applies the inverse of the mapping to each of the provided vectors and returns the list of images."""
+        return [self.pull_vector_back(v) for v in tangent_vectors]
         
     def __mul__(self,other):
         # Compose SurfaceMappings
@@ -104,6 +114,35 @@ class SurfaceMapping:
 class SurfaceMappingComposition(SurfaceMapping):
     r"""
     Composition of two mappings between surfaces.
+
+    Building a composition only stores its two factors. Nested compositions
+    are flattened once, on first use, into the list of mappings which are
+    applied one after the other. The methods :meth:`push_vectors_forward`
+    and :meth:`pull_vectors_back` process a whole list of tangent vectors
+    one factor at a time.
+
+    EXAMPLES::
+
+        sage: from flatsurf import *
+        sage: from flatsurf.geometry.mappings import IdentityMapping, SurfaceMappingComposition
+        sage: s = translation_surfaces.square_torus()
+        sage: m = IdentityMapping(s, s)
+        sage: c = SurfaceMappingComposition(SurfaceMappingComposition(m, m), m)
+        sage: len(c.flat_factors())
+        3
+        sage: v = s.tangent_vector(0, (1/2, 1/2), (1, 0))
+        sage: c.push_vector_forward(v) == v
+        True
+        sage: c.pull_vectors_back([v, v]) == [v, v]
+        True
+
+    Long chains are cheap to build::
+
+        sage: c = m
+        sage: for _ in range(1000):
+        ....:     c = SurfaceMappingComposition(c, m)
+        sage: len(c.flat_factors())
+        1001
     """
     
     def __init__(self, mapping1, mapping2):
@@ -114,15 +153,56 @@ class SurfaceMappingComposition(SurfaceMapping):
             raise ValueError("Codomain of mapping1 must be equal to the domain of mapping2")
         self._m1 = mapping1
         self._m2 = mapping2
+        # The mappings in the order in which they are applied, computed by
+        # _flat_mappings when first needed.
+        self._mappings = None
         SurfaceMapping.__init__(self, self._m1.domain(), self._m2.codomain())
 
+    def _flat_mappings(self):
+        r"""
+        Return the list of the mappings that are not compositions in the
+        order in which they are applied.
+        """
+        if self._mappings is None:
+            mappings = []
+            stack = [self]
+            while stack:
+                m = stack.pop()
+                if not isinstance(m, SurfaceMappingComposition):
+                    mappings.append(m)
+                elif m._mappings is not None:
+                    mappings.extend(m._mappings)
+                else:
+                    stack.append(m._m2)
+                    stack.append(m._m1)
+            self._mappings = mappings
+        return self._mappings
+
     def push_vector_forward(self,tangent_vector):
         r"""Applies the mapping to the provided vector."""
-        return self._m2.push_vector_forward(self._m1.push_vector_forward(tangent_vector))
+        for m in self._flat_mappings():
+            tangent_vector = m.push_vector_forward(tangent_vector)
+        return tangent_vector
 
     def pull_vector_back(self,tangent_vector):
         r"""Applies the inverse of the mapping to the provided vector."""
-        return self._m1.pull_vector_back(self._m2.pull_vector_back(tangent_vector))
+        for m in reversed(self._flat_mappings()):
+            tangent_vector = m.pull_vector_back(tangent_vector)
+        return tangent_vector
+
+    def push_vectors_forward(self,tangent_vectors):
+        r"""Applies the mapping to each of the provided vectors and returns the list of images."""
+        tangent_vectors = list(tangent_vectors)
+        for m in self._flat_mappings():
+            tangent_vectors = m.push_vectors_forward(tangent_vectors)
+        return tangent_vectors
+
+    def pull_vectors_back(self,tangent_vectors):
+        r"""Applies the inverse of the mapping to each of the provided vectors and returns the list of images."""
+        tangent_vectors = list(tangent_vectors)
+        for m in reversed(self._flat_mappings()):
+            tangent_vectors = m.pull_vectors_back(tangent_vectors)
+        return tangent_vectors
 
     def factors(self):
         r"""
@@ -131,6 +211,13 @@ class SurfaceMappingComposition(SurfaceMapping):
         """
         return self._m2, self._m1
 
+    def flat_factors(self):
+        r"""
+        Return the tuple of mappings (f_n, ..., f_1) which are not compositions
+        themselves and such that the original map is f_n o ... o f_1.
+        """
+        return tuple(reversed(self._flat_mappings()))
+
 class IdentityMapping(SurfaceMapping):
     r"""
     Construct an identity map between two "equal" surfaces.
@@ -551,27 +638,289 @@ class SplitPolygonsMapping(SurfaceMapping):
                 tangent_vector.vector(), \
                 ring = ring)
 
+def _triangulation_diagonal(poly):
+    r"""
+    Return a pair of vertices of the polygon ``poly`` joined by a diagonal
+    which cuts off a triangle.
+    """
+    n = poly.num_edges()
+    for i in range(n):
+        e1=poly.edge(i)
+        e2=poly.edge((i+1)%n)
+        if wedge_product(e1,e2) != 0:
+            return i, (i+2)%n
+    return None
+
 def subdivide_a_polygon(s):
     r"""
     Return a SurfaceMapping which cuts one polygon along a diagonal or None if the surface is triangulated.
     """
-    from flatsurf.geometry.polygon import wedge_product
     for l,poly in s.label_iterator(polygons=True):
-        n = poly.num_edges() 
-        if n>3:
-            for i in range(n):
-                e1=poly.edge(i)
-                e2=poly.edge((i+1)%n)
-                if wedge_product(e1,e2) != 0:
-                    return SplitPolygonsMapping(s,l,i, (i+2)%n)
-            raise ValueError("Unable to triangulate polygon with label "+str(l)+\
-                ": "+str(poly))
+        if poly.num_edges()>3:
+            diagonal = _triangulation_diagonal(poly)
+            if diagonal is None:
+                raise ValueError("Unable to triangulate polygon with label "+str(l)+\
+                    ": "+str(poly))
+            return SplitPolygonsMapping(s,l,diagonal[0],diagonal[1])
     return None
 
+class FlipLogMapping(SurfaceMapping):
+    r"""
+    Mapping recording splits, joins and flips of polygons which are performed
+    in place on a single mutable copy of the domain.
+
+    Every operation appends an entry to a log. An entry stores the polygons
+    before and after the operation together with similarities to a common
+    frame. Tangent vectors are pushed forward (resp. pulled back) by replaying
+    the entries which touch their polygon. These are found with an index from
+    labels to positions in the log.
+
+    Once all operations are done, the codomain should be made immutable.
+
+    EXAMPLES::
+
+        sage: from flatsurf import *
+        sage: from flatsurf.geometry.mappings import FlipLogMapping
+        sage: s = translation_surfaces.veech_2n_gon(4)
+        sage: m = FlipLogMapping(s)
+        sage: m.split(0, 0, 2, new_label=1)
+        1
+        sage: m.codomain().polygon(1)
+        Polygon: (0, 0), (-1/2*a - 1, -1/2*a), (-1/2*a, -1/2*a)
+        sage: m.join(0, 0)
+        1
+        sage: len(m)
+        2
+        sage: m.codomain().set_immutable()
+        sage: v = s.tangent_vector(0, (1/2, 1/3), (1, 0))
+        sage: m.push_vector_forward(v)
+        SimilaritySurfaceTangentVector in polygon 0 based at (1/2, 1/3) with vector (1, 0)
+        sage: m.pull_vector_back(m.push_vector_forward(v)) == v
+        True
+    """
+    def __init__(self, s):
+        if s.is_mutable():
+            raise ValueError("The surface should be immutable.")
+        from flatsurf.geometry.similarity import SimilarityGroup
+        self._G = SimilarityGroup(s.base_ring())
+        # The entries of the log are pairs (old, new) of tuples of pieces
+        # (label, polygon, to_frame, to_frame_derivative, from_frame, from_frame_derivative).
+        self._log = []
+        # Map a label to the increasing list of positions in the log where
+        # the polygon with this label gets replaced (resp. created).
+        self._old_index = {}
+        self._new_index = {}
+        SurfaceMapping.__init__(self, s, s.copy(mutable=True, lazy=True))
+
+    def __len__(self):
+        r"""
+        Return the number of operations recorded in the log.
+        """
+        return len(self._log)
+
+    def _piece(self, label, polygon, to_frame):
+        from_frame = ~to_frame
+        return (label, polygon, to_frame, to_frame.derivative(), from_frame, from_frame.derivative())
+
+    def _record(self, old, new):
+        r"""
+        Append an entry to the log.
+
+        Here ``old`` and ``new`` are lists of triples ``(label, polygon, to_frame)``
+        describing the polygons before and after the operation.
+        """
+        position = len(self._log)
+        self._log.append((tuple(self._piece(*piece) for piece in old),
+                          tuple(self._piece(*piece) for piece in new)))
+        for piece in old:
+            self._old_index.setdefault(piece[0], []).append(position)
+        for piece in new:
+            self._new_index.setdefault(piece[0], []).append(position)
+
+    def split(self, label, v1, v2, new_label=None):
+        r"""
+        Cut the polygon ``label`` of the codomain along the diagonal joining
+        vertex ``v1`` to vertex ``v2``.
+
+        The conventions are the ones of :class:`SplitPolygonsMapping`. Return
+        the label of the new polygon.
+        """
+        ss = self._codomain
+        polygon = ss.polygon(label)
+        if v2 < v1:
+            v1, v2 = v2, v1
+        new_label = ss.subdivide_polygon(label, v1, v2, new_label=new_label)
+        self._record([(label, polygon, self._G.one())],
+                     self._split_pieces(label, new_label, polygon, v1, v2))
+        return new_label
+
+    def _split_pieces(self, label, new_label, polygon, v1, v2):
+        ss = self._codomain
+        poly1 = ss.polygon(label)
+        poly2 = ss.polygon(new_label)
+        return [(label, poly1, self._G(polygon.vertex(v1) - poly1.vertex(0))),
+                (new_label, poly2, self._G(polygon.vertex(v2) - poly2.vertex(0)))]
+
+    def _join(self, p1, e1):
+        r"""
+        Join the polygons of the codomain along the edge ``(p1, e1)``.
+
+        Return the pieces of the two polygons in the frame of the joined one
+        and the joined polygon.
+        """
+        ss = self._codomain
+        poly1 = ss.polygon(p1)
+        p2,e2 = ss.opposite_edge(p1,e1)
+        poly2 = ss.polygon(p2)
+        t = ss.edge_transformation(p2,e2)
+        ss.join_polygons(p1, e1, in_place=True)
+        joined = ss.polygon(p1)
+        shift = self._G(joined.vertex(0) - poly1.vertex(0))
+        return [(p1, poly1, shift), (p2, poly2, shift * t)], joined
+
+    def join(self, p1, e1):
+        r"""
+        Join the polygon ``p1`` of the codomain to the polygon sharing the
+        edge ``e1``.
+
+        The conventions are the ones of :class:`SimilarityJoinPolygonsMapping`.
+        Return the label of the removed polygon.
+        """
+        old, joined = self._join(p1, e1)
+        self._record(old, [(p1, joined, self._G.one())])
+        return old[1][0]
+
+    def flip(self, p1, e1):
+        r"""
+        Flip the edge ``(p1, e1)`` of the codomain which must be adjacent to
+        two triangles.
+
+        As in :func:`flip_edge_mapping`, this joins the two triangles and
+        splits the quadrilateral along the other diagonal. Return the label of
+        the other triangle.
+        """
+        ss = self._codomain
+        p2,e2 = ss.opposite_edge(p1,e1)
+        if ss.polygon(p1).num_edges() != 3 or ss.polygon(p2).num_edges() != 3:
+            raise ValueError("Edge must be adjacent to two triangles.")
+        old, joined = self._join(p1, e1)
+        v1, v2 = (e1+1)%4, (e1+3)%4
+        if v2 < v1:
+            v1, v2 = v2, v1
+        ss.subdivide_polygon(p1, v1, v2, new_label=p2)
+        self._record(old, self._split_pieces(p1, p2, joined, v1, v2))
+        return p2
+
+    def _locate(self, pieces, point, vector):
+        r"""
+        Return the triple ``(label, point, vector)`` of the piece containing
+        the tangent vector given in frame coordinates.
+        """
+        if len(pieces) == 1:
+            label, polygon, _, _, from_frame, dfrom = pieces[0]
+            return label, from_frame(point), dfrom * vector
+        fallback = None
+        for label, polygon, _, _, from_frame, dfrom in pieces:
+            p = from_frame(point)
+            v = dfrom * vector
+            pos = polygon.get_point_position(p)
+            if pos.is_outside():
+                continue
+            if pos.is_in_interior():
+                return label, p, v
+            if pos.is_in_edge_interior():
+                if wedge_product(polygon.edge(pos.get_edge()), v) > 0:
+                    return label, p, v
+            else:
+                k = pos.get_vertex()
+                n = polygon.num_edges()
+                if wedge_product(polygon.edge(k), v) >= 0 and \
+                   wedge_product(v, -polygon.edge((k+n-1)%n)) >= 0:
+                    return label, p, v
+            if fallback is None:
+                # The vector points along the boundary.
+                fallback = (label, p, v)
+        if fallback is None:
+            raise ValueError("point is not contained in any polygon")
+        return fallback
+
+    def _replay_forward(self, label, point, vector, start=0):
+        r"""
+        Push the tangent vector ``(label, point, vector)`` through the entries
+        of the log from position ``start`` on.
+        """
+        position = start - 1
+        while True:
+            positions = self._old_index.get(label)
+            if positions is None:
+                return label, point, vector
+            i = bisect_right(positions, position)
+            if i == len(positions):
+                return label, point, vector
+            position = positions[i]
+            old, new = self._log[position]
+            for piece in old:
+                if piece[0] == label:
+                    break
+            label, point, vector = self._locate(new, piece[2](point), piece[3] * vector)
+
+    def _replay_backward(self, label, point, vector):
+        r"""
+        Pull the tangent vector ``(label, point, vector)`` back through all
+        entries of the log.
+        """
+        position = len(self._log)
+        while True:
+            positions = self._new_index.get(label)
+            if positions is None:
+                return label, point, vector
+            i = bisect_left(positions, position)
+            if i == 0:
+                return label, point, vector
+            position = positions[i-1]
+            old, new = self._log[position]
+            for piece in new:
+                if piece[0] == label:
+                    break
+            label, point, vector = self._locate(old, piece[2](point), piece[3] * vector)
+
+    def push_vector_forward(self,tangent_vector):
+        r"""Applies the mapping to the provided vector."""
+        ring = tangent_vector.bundle().base_ring()
+        label, point, vector = self._replay_forward(tangent_vector.polygon_label(),
+                tangent_vector.point(), tangent_vector.vector())
+        return self._codomain.tangent_vector(label, point, vector, ring = ring)
+
+    def pull_vector_back(self,tangent_vector):
+        r"""Applies the inverse of the mapping to the provided vector."""
+        ring = tangent_vector.bundle().base_ring()
+        label, point, vector = self._replay_backward(tangent_vector.polygon_label(),
+                tangent_vector.point(), tangent_vector.vector())
+        return self._domain.tangent_vector(label, point, vector, ring = ring)
+
+def _triangulate_in_place(m):
+    r"""
+    Triangulate the codomain of the :class:`FlipLogMapping` ``m``.
+    """
+    ss = m.codomain()
+    labels = list(ss.label_iterator())
+    while labels:
+        l = labels.pop()
+        poly = ss.polygon(l)
+        while poly.num_edges()>3:
+            diagonal = _triangulation_diagonal(poly)
+            if diagonal is None:
+                raise ValueError("Unable to triangulate polygon with label "+str(l)+\
+                    ": "+str(poly))
+            labels.append(m.split(l, diagonal[0], diagonal[1]))
+            poly = ss.polygon(l)
 
 def triangulation_mapping(s):
     r"""Return a  SurfaceMapping triangulating the provided surface.
-    
+
+    The returned mapping is a :class:`FlipLogMapping`, or None if the surface
+    is already triangulated.
+
     EXAMPLES::
 
         sage: from flatsurf import *
@@ -590,16 +939,11 @@ def triangulation_mapping(s):
         Polygon: (0, 0), (-1/2*a - 1, -1/2*a), (-1/2*a, -1/2*a)
     """
     assert(s.is_finite())
-    m=subdivide_a_polygon(s)
-    if m is None:
+    m = FlipLogMapping(s)
+    _triangulate_in_place(m)
+    m.codomain().set_immutable()
+    if len(m) == 0:
         return None
-    s1=m.codomain()
-    while True:
-        m2=subdivide_a_polygon(s1)
-        if m2 is None:
-            return m
-        s1=m2.codomain()
-        m=SurfaceMappingComposition(m,m2)
     return m
 
 def flip_edge_mapping(s,p1,e1):
@@ -622,65 +966,80 @@ def one_delaunay_flip_mapping(s):
                 return flip_edge_mapping(s,p,e)
     return None
 
+def _delaunay_flip_in_place(m):
+    r"""
+    Triangulate the codomain of the :class:`FlipLogMapping` ``m`` and flip
+    edges until it is Delaunay.
+    """
+    from flatsurf.geometry.delaunay import DelaunayFlipper
+
+    class LoggingFlipper(DelaunayFlipper):
+        def flip(self, label, edge):
+            label2 = m.flip(label, edge)
+            self._flips += 1
+            self._invalidate(label)
+            self._invalidate(label2)
+            return label2
+
+    _triangulate_in_place(m)
+    LoggingFlipper(m.codomain()).run()
+
 def delaunay_triangulation_mapping(s):
     r"""
     Returns a mapping to a Delaunay triangulation or None if the surface already is Delaunay triangulated.
+
+    All the splits and flips are performed on a single copy of ``s`` and
+    recorded in a :class:`FlipLogMapping`.
+
+    EXAMPLES::
+
+        sage: from flatsurf import *
+        sage: from flatsurf.geometry.mappings import delaunay_triangulation_mapping
+        sage: s = translation_surfaces.veech_2n_gon(4)
+        sage: m = delaunay_triangulation_mapping(s)
+        sage: m.codomain().is_delaunay_triangulated()
+        True
+        sage: v = s.tangent_vector(0, (1/2, 1/3), (1, 0))
+        sage: m.pull_vector_back(m.push_vector_forward(v)) == v
+        True
     """
     assert(s.is_finite())
-    m=triangulation_mapping(s)
-    if m is None:
-        s1=s
-    else: 
-        s1=m.codomain()
-    m1=one_delaunay_flip_mapping(s1)
-    if m1 is None:
-        return m
-    if m is None:
-        m=m1
-    else:
-        m=SurfaceMappingComposition(m,m1)
-    s1=m1.codomain()
-    while True:
-        m1=one_delaunay_flip_mapping(s1)
-        if m1 is None:
-            return m
-        s1=m1.codomain()
-        m=SurfaceMappingComposition(m,m1)
+    m = FlipLogMapping(s)
+    _delaunay_flip_in_place(m)
+    m.codomain().set_immutable()
+    if len(m) == 0:
+        return None
+    return m
 
 def delaunay_decomposition_mapping(s):
     r"""
     Returns a mapping to a Delaunay decomposition or possibly None if the surface already is Delaunay.
     """
-    m=delaunay_triangulation_mapping(s)
-    if m is None:
-        s1=s
-    else:
-        s1=m.codomain()
-    edge_vectors=[]
+    assert(s.is_finite())
+    m = FlipLogMapping(s)
+    _delaunay_flip_in_place(m)
+    ss = m.codomain()
+    start = len(m)
+    edges=[]
     lc = s._label_comparator()
-    for p,poly in s1.label_iterator(polygons=True):
+    for p,poly in ss.label_iterator(polygons=True):
         for e in range(poly.num_edges()):
-            pp,ee=s1.opposite_edge(p,e)
-            if (lc.lt(p,pp) or (p==pp and e<ee)) and s1._edge_needs_join(p,e):
-                edge_vectors.append( s1.tangent_vector(p,poly.vertex(e),poly.edge(e)) )
-    if len(edge_vectors)>0:
-        ev=edge_vectors.pop()
-        p,e=ev.edge_pointing_along()
-        m1=SimilarityJoinPolygonsMapping(s1,p,e)
-        s2=m1.codomain()
-        while len(edge_vectors)>0:
-            ev=edge_vectors.pop()
-            ev2=m1.push_vector_forward(ev)
-            p,e=ev2.edge_pointing_along()
-            mtemp=SimilarityJoinPolygonsMapping(s2,p,e)
-            m1=SurfaceMappingComposition(m1,mtemp)
-            s2=m1.codomain()
-        if m is None:
-            return m1
-        else:
-            return SurfaceMappingComposition(m,m1)
+            pp,ee=ss.opposite_edge(p,e)
+            if (lc.lt(p,pp) or (p==pp and e<ee)) and ss._edge_needs_join(p,e):
+                edges.append((p, poly.vertex(e), poly.edge(e)))
+    while edges:
+        # Follow the edge through the joins performed so far.
+        p, point, vector = m._replay_forward(*edges.pop(), start=start)
+        poly = ss.polygon(p)
+        e = poly.get_point_position(point).get_vertex()
+        if poly.edge(e) != vector:
+            raise RuntimeError("lost track of an edge of the Delaunay triangulation")
+        m.join(p, e)
+    ss.set_immutable()
+    if len(m) == 0:
+        return None
     return m
-    
+
 def canonical_first_vertex(polygon):
     r"""
     Return the index of the vertex with smallest y-coordinate.
@@ -0,0 +1,220 @@
+r"""
+Counting the exact arithmetic performed by the high level algorithms.
+
+Most of the time spent in algorithms such as Delaunay triangulation or the
+flow of straight line trajectories goes into exact geometric predicates
+(wedge and dot products, incircle tests, segment intersections) and into the
+construction of the polygons and similarities they produce. The
+:class:`Profiler` of this module temporarily instruments these primitives and
+attributes their number of calls and the time spent in them to the high level
+operation that triggered them.
+
+EXAMPLES::
+
+    sage: from flatsurf import translation_surfaces
+    sage: from flatsurf.geometry.profiler import Profiler
+    sage: s = translation_surfaces.veech_double_n_gon(5)
+    sage: with Profiler() as profiler:
+    ....:     ss = s.delaunay_triangulation()
+    sage: calls = profiler.counts()["SimilaritySurface.delaunay_triangulation"]
+    sage: calls["SimilaritySurface.delaunay_triangulation"]
+    1
+    sage: calls["Polygon.__init__"] > 0
+    True
+    sage: calls["SimilaritySurface._edge_needs_flip"] > 0
+    True
+
+Once the ``with`` block is left, the primitives are restored::
+
+    sage: import flatsurf.geometry.polygon
+    sage: flatsurf.geometry.polygon.Polygon.__init__ is profiler._originals[0][2]
+    True
+"""
+
+from __future__ import absolute_import, print_function, division
+from six import iteritems
+
+import sys
+from functools import wraps
+from importlib import import_module
+from timeit import default_timer
+
+# Methods of classes that are counted. Each entry is a triple
+# (module, class, method).
+_METHODS = [
+    ("flatsurf.geometry.polygon", "Polygon", "__init__"),
+    ("flatsurf.geometry.circle", "Circle", "point_position"),
+    ("flatsurf.geometry.circle", "Circle", "line_segment_position"),
+    ("flatsurf.geometry.similarity_surface", "SimilaritySurface", "_edge_needs_flip"),
+    ("flatsurf.geometry.similarity_surface", "SimilaritySurface", "_edge_needs_join"),
+    ("flatsurf.geometry.similarity_surface", "SimilaritySurface", "_triangle_flip_in_place"),
+    ("flatsurf.geometry.similarity_surface", "SimilaritySurface", "copy"),
+    ("flatsurf.geometry.similarity", "Similarity", "_mul_"),
+    ("flatsurf.geometry.similarity", "Similarity", "__invert__"),
+    ("flatsurf.geometry.similarity", "Similarity", "_div_"),
+    ("flatsurf.geometry.delaunay", "DelaunayFlipper", "_edge_needs_flip"),
+]
+
+# Module level functions that are counted. These are usually imported by name
+# into other modules, so every binding in the flatsurf modules is replaced.
+_FUNCTIONS = [
+    ("flatsurf.geometry.polygon", "wedge_product"),
+    ("flatsurf.geometry.polygon", "dot_product"),
+    ("flatsurf.geometry.polygon", "segment_intersect"),
+]
+
+# High level operations to which the counts are attributed.
+_SCOPES = [
+    ("flatsurf.geometry.similarity_surface", "SimilaritySurface", "delaunay_triangulation"),
+    ("flatsurf.geometry.similarity_surface", "SimilaritySurface", "delaunay_decomposition"),
+    ("flatsurf.geometry.similarity_surface", "SimilaritySurface", "saddle_connections"),
+    ("flatsurf.geometry.straight_line_trajectory", "StraightLineTrajectory", "flow"),
+    ("flatsurf.geometry.straight_line_trajectory", "StraightLineTrajectoryTranslation", "flow"),
+]
+
+class Profiler(object):
+    r"""
+    Context manager counting calls to the exact geometric primitives of
+    flatsurf.
+
+    While active, every call to one of the instrumented primitives is
+    recorded together with the time spent in it. The records are grouped by
+    the outermost high level operation (Delaunay triangulation and
+    decomposition, saddle connection search, flow of trajectories) that is
+    running when the call happens, or under ``"other"`` if there is none.
+
+    Note that the arithmetic of number fields is implemented in Cython and
+    cannot be instrumented this way, the predicates that use it are counted
+    instead.
+
+    EXAMPLES::
+
+        sage: from flatsurf import translation_surfaces
+        sage: from flatsurf.geometry.profiler import Profiler
+        sage: s = translation_surfaces.square_torus()
+        sage: with Profiler() as profiler:
+        ....:     t = s.tangent_vector(0, (1/2, 0), (1, 1/3)).straight_line_trajectory()
+        ....:     t.flow(10)
+        sage: profiler.counts()["StraightLineTrajectory.flow"]["StraightLineTrajectory.flow"]
+        1
+        sage: print(profiler)  # random
+        StraightLineTrajectory.flow
+            StraightLineTrajectory.flow    1     0.004s
+            Polygon.__init__               10    0.001s
+    """
+    _active = None
+
+    def __init__(self):
+        self._data = {}
+        self._scopes = []
+        self._originals = []
+
+    def __enter__(self):
+        if Profiler._active is not None:
+            raise ValueError("another profiler is already active")
+        Profiler._active = self
+
+        for module, cls, name in _METHODS:
+            self._patch_method(module, cls, name, scope=False)
+        for module, cls, name in _SCOPES:
+            self._patch_method(module, cls, name, scope=True)
+        for module, name in _FUNCTIONS:
+            original = getattr(import_module(module), name)
+            wrapper = self._wrap(name, original, scope=False)
+            for module_name, mod in list(iteritems(sys.modules)):
+                if mod is None or not module_name.startswith("flatsurf"):
+                    continue
+                if getattr(mod, name, None) is original:
+                    self._originals.append((mod, name, original))
+                    setattr(mod, name, wrapper)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        Profiler._active = None
+        return False
+
+    def _patch_method(self, module, cls, name, scope):
+        cls = getattr(import_module(module), cls)
+        original = cls.__dict__[name]
+        self._originals.append((cls, name, original))
+        setattr(cls, name, self._wrap(cls.__name__ + "." + name, original, scope))
+
+    def _wrap(self, name, function, scope):
+        profiler = self
+
+        @wraps(function)
+        def wrapper(*args, **kwds):
+            if Profiler._active is not profiler:
+                return function(*args, **kwds)
+            if scope:
+                profiler._scopes.append(name)
+            start = default_timer()
+            try:
+                return function(*args, **kwds)
+            finally:
+                elapsed = default_timer() - start
+                if scope:
+                    profiler._scopes.pop()
+                profiler._record(name, elapsed)
+
+        return wrapper
+
+    def _record(self, name, elapsed):
+        scope = self._scopes[0] if self._scopes else (name if name in self._scope_names() else "other")
+        entry = self._data.setdefault(scope, {}).setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+
+    @staticmethod
+    def _scope_names():
+        return [cls + "." + name for _, cls, name in _SCOPES]
+
+    def report(self):
+        r"""
+        Return a dictionary mapping each high level operation to a dictionary
+        which maps the name of the primitives to pairs ``(calls, seconds)``.
+
+        EXAMPLES::
+
+            sage: from flatsurf import translation_surfaces
+            sage: from flatsurf.geometry.profiler import Profiler
+            sage: s = translation_surfaces.veech_2n_gon(4)
+            sage: with Profiler() as profiler:
+            ....:     ss = s.delaunay_decomposition()
+            sage: calls, seconds = profiler.report()["SimilaritySurface.delaunay_decomposition"]["SimilaritySurface.delaunay_decomposition"]
+            sage: calls
+            1
+        """
+        return {scope: {name: tuple(entry) for name, entry in iteritems(events)}
+                for scope, events in iteritems(self._data)}
+
+    def counts(self):
+        r"""
+        Return a dictionary mapping each high level operation to a dictionary
+        which maps the name of the primitives to their number of calls.
+
+        EXAMPLES::
+
+            sage: from flatsurf import ConvexPolygons
+            sage: from flatsurf.geometry.profiler import Profiler
+            sage: P = ConvexPolygons(QQ)
+            sage: with Profiler() as profiler:
+            ....:     p = P(vertices=[(0,0), (1,0), (1,1), (0,1)])
+            sage: profiler.counts()["other"]["Polygon.__init__"]
+            1
+        """
+        return {scope: {name: entry[0] for name, entry in iteritems(events)}
+                for scope, events in iteritems(self._data)}
+
+    def __repr__(self):
+        lines = []
+        for scope in sorted(self._data):
+            lines.append(scope)
+            events = self._data[scope]
+            width = max(len(name) for name in events)
+            for name in sorted(events, key=lambda name: -events[name][1]):
+                calls, seconds = events[name]
+                lines.append("    {}    {}    {:.3f}s".format(name.ljust(width), calls, seconds))
+        return "\n".join(lines)
@@ -55,24 +55,45 @@ class Similarity(MultiplicativeGroupElement):
     Construct the similarity (x,y) mapsto (ax-by+s,bx+ay+t) if sign=1,
     and (ax+by+s,bx-ay+t) if sign=-1
     """
-    def __init__(self, p, a, b, s, t, sign):
+    def __init__(self, p, a, b, s, t, sign, check=True):
         r"""
         Construct the similarity (x,y) mapsto (ax-by+s,bx+ay+t) if sign=1,
         and (ax+by+s,bx-ay+t) if sign=-1
+
+        If ``check`` is ``False``, the coefficients are assumed to be elements
+        of the base ring of ``p`` and ``sign`` to be the integer 1 or -1.
+
+        EXAMPLES::
+
+            sage: from flatsurf.geometry.similarity import SimilarityGroup, Similarity
+            sage: S = SimilarityGroup(QQ)
+            sage: Similarity(S, 1, 0, 0, 0, 1)
+            Traceback (most recent call last):
+            ...
+            ValueError: wrong parent for a
+            sage: g = Similarity(S, QQ(1), QQ(0), QQ(2), QQ(3), ZZ(1), check=False)
+            sage: g(vector(QQ, (1,1)))
+            (3, 4)
+
+        With ``check=False`` the input is not validated::
+
+            sage: Similarity(S, 1, 0, 0, 0, 1, check=False)._a.parent()
+            Integer Ring
         """
         if p is None:
             raise ValueError("The parent must be provided")
 
-        if parent(a) is not p.base_ring():
-            raise ValueError("wrong parent for a")
-        if parent(b) is not p.base_ring():
-            raise ValueError("wrong parent for b")
-        if parent(s) is not p.base_ring():
-            raise ValueError("wrong parent for s")
-        if parent(t) is not p.base_ring():
-            raise ValueError("wrong parent for t")
-        if parent(sign) is not ZZ or not sign.is_unit():
-            raise ValueError("sign must be either 1 or -1.")
+        if check:
+            if parent(a) is not p.base_ring():
+                raise ValueError("wrong parent for a")
+            if parent(b) is not p.base_ring():
+                raise ValueError("wrong parent for b")
+            if parent(s) is not p.base_ring():
+                raise ValueError("wrong parent for s")
+            if parent(t) is not p.base_ring():
+                raise ValueError("wrong parent for t")
+            if parent(sign) is not ZZ or not sign.is_unit():
+                raise ValueError("sign must be either 1 or -1.")
 
         self._a = a
         self._b = b
@@ -194,7 +215,7 @@ class Similarity(MultiplicativeGroupElement):
         t = left._b * right._s + left._sign * left._a * right._t + left._t
         sign = left._sign * right._sign
         P = left.parent()
-        return P.element_class(P, a, b, s, t, sign)
+        return P.element_class(P, a, b, s, t, sign, False)
 
     def __invert__(self):
         r"""
@@ -208,16 +229,32 @@ class Similarity(MultiplicativeGroupElement):
             sage: for a in [S((0,2,0,0,1)), S((1,0,0,0,-1)), S((1,1,0,0)),
             ....:           S((1,0,-1,1)), S((2,-1,3/5,2/3,-1))]:
             ....:     assert (a*~a).is_one() and (~a*a).is_one()
+
+        Over a ring which is not a field, the coefficients are converted back
+        to the ring::
+
+            sage: S = SimilarityGroup(ZZ)
+            sage: ~S((1,2)) == S((-1,-2))
+            True
+            sage: (~S((1,2)))._a.parent()
+            Integer Ring
+            sage: ~S((2,0,0,0))
+            Traceback (most recent call last):
+            ...
+            TypeError: no conversion of this rational to integer
         """
         P = self.parent()
         sign = self._sign
         det = self.det()
         a = sign*self._a/det
         b = -self._b/det
-        return P.element_class(P,a,b,
-            -a*self._s + sign*b*self._t,
-            -b*self._s - sign*a*self._t,
-            sign)
+        s = -a*self._s + sign*b*self._t
+        t = -b*self._s - sign*a*self._t
+        R = P._ring
+        if not R.is_field():
+            # The division by det lands in the fraction field.
+            a, b, s, t = R(a), R(b), R(s), R(t)
+        return P.element_class(P, a, b, s, t, sign, False)
 
     def _div_(left, right):
         det = right.det()
@@ -237,7 +274,7 @@ class Similarity(MultiplicativeGroupElement):
             left.base_ring()(b),
             left.base_ring()(s),
             left.base_ring()(t),
-            left._sign * right._sign)
+            left._sign * right._sign, False)
 
     def __hash__(self):
         return 73*hash(self._a)-19*hash(self._b)+13*hash(self._s)+53*hash(self._t)+67*hash(self._sign)
@@ -273,6 +310,19 @@ class Similarity(MultiplicativeGroupElement):
             sage: g(p, ring=AA).parent()
             ConvexPolygons(Algebraic Real Field)
         """
+        if ring is None and isinstance(w, FreeModuleElement) and \
+           w.base_ring() is self.parent()._ring and len(w) == 2:
+            # Fast path for vectors over the base ring.
+            x, y = w
+            if self._sign.is_one():
+                return self.parent()._vector_space()((
+                    self._a * x - self._b * y + self._s,
+                    self._b * x + self._a * y + self._t))
+            else:
+                return self.parent()._vector_space()((
+                    self._a * x + self._b * y + self._s,
+                    self._b * x - self._a * y + self._t))
+
         if ring is not None and ring not in Rings():
             raise TypeError("ring must be a ring")
 
@@ -309,6 +359,58 @@ class Similarity(MultiplicativeGroupElement):
                     self._a * w[0] + self._b * w[1] + self._s,
                     self._b * w[0] - self._a * w[1] + self._t])
 
+    def images(self, objects, ring=None):
+        r"""
+        Return the list of images of ``objects`` under this similarity.
+
+        The entries of ``objects`` may be vectors (or anything that can be
+        indexed like a vector) or convex polygons. The coefficients of the
+        similarity are only looked up once for the whole list.
+
+        EXAMPLES::
+
+            sage: from flatsurf.geometry.similarity import SimilarityGroup
+            sage: from flatsurf import polygons
+            sage: S = SimilarityGroup(QQ)
+            sage: g = S((0,1,1,0))
+            sage: g.images([(0,0), (1,0), (0,1)])
+            [(1, 0), (1, 1), (0, 0)]
+            sage: g.images([polygons.square()])
+            [Polygon: (1, 0), (1, 1), (0, 1), (0, 0)]
+            sage: g.images([(1,2)], ring=AA)[0].parent()
+            Vector space of dimension 2 over Algebraic Real Field
+        """
+        if ring is None:
+            ring = self.parent()._ring
+            V = self.parent()._vector_space()
+        else:
+            if ring not in Rings():
+                raise TypeError("ring must be a ring")
+            from sage.modules.free_module import VectorSpace
+            V = VectorSpace(ring, 2)
+        a, b, s, t = self._a, self._b, self._s, self._t
+        if not self._sign.is_one():
+            def image(w):
+                return V((a*w[0] + b*w[1] + s, b*w[0] - a*w[1] + t))
+        else:
+            def image(w):
+                return V((a*w[0] - b*w[1] + s, b*w[0] + a*w[1] + t))
+
+        result = []
+        P = None
+        for w in objects:
+            if isinstance(w, ConvexPolygon):
+                if not self._sign.is_one():
+                    raise ValueError("Similarity must be orientation preserving.")
+                if P is None:
+                    P = ConvexPolygons(ring)
+                # The image of a convex polygon under an orientation
+                # preserving similarity is a convex polygon.
+                result.append(P(vertices=[image(v) for v in w.vertices()], check=False))
+            else:
+                result.append(image(w))
+        return result
+
     def _repr_(self):
         r"""
         TESTS::
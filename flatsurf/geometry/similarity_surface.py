@@ -51,7 +51,7 @@ from .matrix_2x2 import (is_similarity,
                     is_cosine_sine_of_rational)
 
 from .similarity import SimilarityGroup
-from .polygon import ConvexPolygons, wedge_product, triangulate, build_faces
+from .polygon import ConvexPolygons, dot_product, wedge_product, triangulate, build_faces
 
 from .surface import Surface, Surface_dict, Surface_list, LabelComparator
 from .surface_objects import Singularity, SaddleConnection, SurfacePoint
@@ -61,6 +61,134 @@ ZZ_1 = ZZ.one()
 ZZ_2 = ZZ_1 + ZZ_1
 
 
+def _interval_affine(sim):
+    r"""
+    Return an interval approximation of the similarity ``sim`` as the tuple
+    of the six entries of the first two rows of its 3x3 matrix.
+
+    EXAMPLES::
+
+        sage: from flatsurf.geometry.similarity import SimilarityGroup
+        sage: from flatsurf.geometry.similarity_surface import _interval_affine
+        sage: S = SimilarityGroup(QQ)
+        sage: _interval_affine(S((1,2,1/3,0)))
+        (1, -2, 0.3333333333333334?, 2, 1, 0)
+    """
+    m = sim.matrix()
+    return (RIF(m[0,0]), RIF(m[0,1]), RIF(m[0,2]),
+            RIF(m[1,0]), RIF(m[1,1]), RIF(m[1,2]))
+
+def _interval_affine_compose(g, h):
+    r"""
+    Return the composition ``g*h`` of two interval affine maps as returned by
+    :func:`_interval_affine`.
+    """
+    return (g[0]*h[0] + g[1]*h[3], g[0]*h[1] + g[1]*h[4], g[0]*h[2] + g[1]*h[5] + g[2],
+            g[3]*h[0] + g[4]*h[3], g[3]*h[1] + g[4]*h[4], g[3]*h[2] + g[4]*h[5] + g[5])
+
+def _interval_affine_apply(g, v):
+    r"""
+    Return the image of the interval vector ``v`` under the interval affine map ``g``.
+    """
+    return (g[0]*v[0] + g[1]*v[1] + g[2], g[3]*v[0] + g[4]*v[1] + g[5])
+
+
+def _triangle_separatrix(edges, direction):
+    r"""
+    Return the vertex of the triangle with the given edges which has a
+    separatrix parallel to ``direction``.
+
+    This is the vertex returned by
+    :meth:`~flatsurf.geometry.polygon.ConvexPolygon.find_separatrix`.
+
+    EXAMPLES::
+
+        sage: from flatsurf import polygons
+        sage: from flatsurf.geometry.similarity_surface import _triangle_separatrix
+        sage: p = polygons((1,0),(-1,1),(0,-1))
+        sage: _triangle_separatrix(p.edges(), vector((0,1))) == p.find_separatrix()[0]
+        True
+    """
+    for v in range(3):
+        w0 = wedge_product(edges[v], direction)
+        w1 = wedge_product(edges[(v+2)%3], direction)
+        if (w0 >= 0 and w1 > 0) or (w0 <= 0 and w1 < 0):
+            return v
+    raise RuntimeError("Failed to find a separatrix")
+
+class _DevelopedPolygon(object):
+    r"""
+    A polygon of a surface developed into the plane of the initial polygon of
+    :meth:`SimilaritySurface.saddle_connections`.
+
+    The similarity which develops the polygon is only computed exactly when it
+    is needed. An interval approximation of it can always be obtained from the
+    polygon we developed from.
+    """
+    __slots__ = ["surface", "label", "polygon", "parent", "edge", "_sim", "_isim", "_positions", "_ipositions"]
+
+    def __init__(self, surface, label, parent=None, edge=None, sim=None):
+        self.surface = surface
+        self.label = label
+        self.polygon = surface.polygon(label)
+        # The polygon we developed from and the edge of it we crossed.
+        self.parent = parent
+        self.edge = edge
+        self._sim = sim
+        self._isim = None
+        self._positions = {}
+        self._ipositions = {}
+
+    def sim(self):
+        r"""
+        Return the exact similarity developing this polygon.
+        """
+        if self._sim is None:
+            nodes = []
+            node = self
+            while node._sim is None:
+                nodes.append(node)
+                node = node.parent
+            for node in reversed(nodes):
+                node._sim = node.parent._sim * ~node.surface.edge_transformation(node.parent.label, node.edge)
+                # Restart the interval approximation from the exact value to
+                # prevent the intervals from growing along the chain.
+                node._isim = None
+        return self._sim
+
+    def isim(self):
+        r"""
+        Return an interval approximation of :meth:`sim`.
+        """
+        if self._isim is None:
+            if self._sim is not None:
+                self._isim = _interval_affine(self._sim)
+            else:
+                self._isim = _interval_affine_compose(self.parent.isim(),
+                    self.surface._interval_inverse_edge_transformation(self.parent.label, self.edge))
+        return self._isim
+
+    def position(self, v):
+        r"""
+        Return the exact position of the vertex ``v`` of this polygon.
+        """
+        try:
+            return self._positions[v]
+        except KeyError:
+            pos = self._positions[v] = self.sim()(self.polygon.vertex(v))
+            return pos
+
+    def iposition(self, v):
+        r"""
+        Return an interval approximation of :meth:`position`.
+        """
+        try:
+            return self._ipositions[v]
+        except KeyError:
+            pos = self._ipositions[v] = _interval_affine_apply(self.isim(), self.surface._interval_vertices(self.label)[v])
+            return pos
+
+
 class SimilaritySurface(SageObject):
     r"""
     An oriented surface built from a set of polygons and edges identified with
@@ -368,23 +496,57 @@ class SimilaritySurface(SageObject):
         """
         if not self.is_finite():
             raise ValueError("the method only work for finite surfaces")
+        return ZZ(len(self._vertex_classes()[0]))
+
+    def _vertex_classes(self):
+        r"""
+        Return the equivalence classes of the vertices of this finite surface.
 
-        # NOTE:
-        # the very same code is implemented in the method angles (translation
-        # surfaces). we should factor out the code
-        edges = set((p,e) for p in self.label_iterator() for e in range(self.polygon(p).num_edges()))
+        The result is a pair ``(classes, index)``. Each class is a tuple of
+        pairs ``(label, v)`` listed by turning around the vertex, i.e., ``(p,
+        e)`` is followed by the opposite of the edge ``e - 1`` of ``p``. The
+        dictionary ``index`` maps each pair ``(label, v)`` to the position of
+        its class in ``classes``.
+
+        The classes are computed in a single walk around all the vertices. The
+        result is cached when the surface is immutable.
+
+        EXAMPLES::
 
-        n = ZZ(0)
+            sage: from flatsurf import *
+            sage: S = SymmetricGroup(4)
+            sage: o = translation_surfaces.origami(S('(1,2)(3,4)'), S('(2,3)'))
+            sage: classes, index = o._vertex_classes()
+            sage: len(classes), sum(len(c) for c in classes)
+            (2, 16)
+            sage: all(classes[index[v]].count(v) == 1 for v in index)
+            True
+            sage: o._vertex_classes() is o._vertex_classes()
+            True
+        """
+        try:
+            return self._s._cache["vertex_classes"]
+        except KeyError:
+            pass
+
+        edges = set(self.edge_iterator())
+        classes = []
+        index = {}
         while edges:
-            p,e = edges.pop()
-            n += 1
-            ee = (e-1) % self.polygon(p).num_edges()
-            p,e = self.opposite_edge(p,ee)
-            while (p,e) in edges:
+            start = p,e = edges.pop()
+            vertices = [start]
+            index[start] = len(classes)
+            p,e = self.opposite_edge(p, (e-1) % self.polygon(p).num_edges())
+            while (p,e) != start:
                 edges.remove((p,e))
-                ee = (e-1) % self.polygon(p).num_edges()
-                p,e = self.opposite_edge(p,ee)
-        return n
+                vertices.append((p,e))
+                index[(p,e)] = len(classes)
+                p,e = self.opposite_edge(p, (e-1) % self.polygon(p).num_edges())
+            classes.append(tuple(vertices))
+
+        if not self.is_mutable():
+            self._s._cache["vertex_classes"] = (classes, index)
+        return classes, index
 
     def _repr_(self):
         if self.num_polygons() == Infinity:
@@ -403,15 +565,59 @@ class SimilaritySurface(SageObject):
         r"""
         Return the edge to which this edge is identified and the matrix to be
         applied.
+
+        EXAMPLES::
+
+            sage: from flatsurf.geometry.similarity_surface_generators import SimilaritySurfaceGenerators
+            sage: s = SimilaritySurfaceGenerators.example()
+            sage: s.edge_matrix(0, 0)
+            [   1  1/2]
+            [-1/2    1]
+            sage: s.edge_matrix(0, 0) == s.edge_transformation(0, 0).derivative()
+            True
         """
         if e is None:
             p,e = p
-        u = self.polygon(p).edge(e)
+        a,b,_,_ = self._edge_transformation_coefficients(p,e)
+        return SimilarityGroup(self.base_ring())._matrix_space_2x2()([a, -b, b, a])
+
+    def _edge_transformation_coefficients(self, p, e):
+        r"""
+        Return the coefficients ``(a, b, s, t)`` of the similarity
+        ``(x, y) \mapsto (ax - by + s, bx + ay + t)`` bringing the edge ``(p, e)``
+        to the opposite edge.
+
+        The coefficients are cached. The cache of a mutable surface is
+        cleared whenever the surface changes.
+        """
+        try:
+            cache = self._s._cache["edge_transformations"]
+        except KeyError:
+            cache = self._s._cache["edge_transformations"] = {}
+        try:
+            return cache[(p,e)]
+        except KeyError:
+            pass
+
+        G=SimilarityGroup(self.base_ring())
+        q=self.polygon(p)
+        a=q.vertex(e)
+        b=q.vertex(e+1)
+        # This is the similarity carrying the origin to a and (1,0) to b:
+        g=G(b[0]-a[0],b[1]-a[1],a[0],a[1])
+
         pp,ee = self.opposite_edge(p,e)
-        v = self.polygon(pp).edge(ee)
+        qq=self.polygon(pp)
+        # Be careful here: opposite vertices are identified
+        aa=qq.vertex(ee+1)
+        bb=qq.vertex(ee)
+        # This is the similarity carrying the origin to aa and (1,0) to bb:
+        gg=G(bb[0]-aa[0],bb[1]-aa[1],aa[0],aa[1])
 
-        # be careful, because of the orientation, it is -v and not v
-        return similarity_from_vectors(u,-v)
+        # This is the similarity carrying (a,b) to (aa,bb):
+        h = gg/g
+        cache[(p,e)] = coefficients = (h._a, h._b, h._s, h._t)
+        return coefficients
 
     def edge_transformation(self, p, e):
         r"""
@@ -434,22 +640,67 @@ class SimilaritySurface(SageObject):
             (2, 0)
         """
         G=SimilarityGroup(self.base_ring())
-        q=self.polygon(p)
-        a=q.vertex(e)
-        b=q.vertex(e+1)
-        # This is the similarity carrying the origin to a and (1,0) to b:
-        g=G(b[0]-a[0],b[1]-a[1],a[0],a[1])
+        a,b,s,t = self._edge_transformation_coefficients(p,e)
+        return G.element_class(G, a, b, s, t, ZZ(1))
 
-        pp,ee = self.opposite_edge(p,e)
-        qq=self.polygon(pp)
-        # Be careful here: opposite vertices are identified
-        aa=qq.vertex(ee+1)
-        bb=qq.vertex(ee)
-        # This is the similarity carrying the origin to aa and (1,0) to bb:
-        gg=G(bb[0]-aa[0],bb[1]-aa[1],aa[0],aa[1])
+    def _supports_interval_filtering(self):
+        r"""
+        Return whether exact predicates on this surface can be filtered by
+        first evaluating them with real intervals.
 
-        # This is the similarity carrying (a,b) to (aa,bb):
-        return gg/g
+        This requires an exact base ring with a real embedding.
+
+        EXAMPLES::
+
+            sage: from flatsurf import translation_surfaces
+            sage: translation_surfaces.veech_double_n_gon(5)._supports_interval_filtering()
+            True
+            sage: translation_surfaces.square_torus()._supports_interval_filtering()
+            True
+        """
+        try:
+            return self._s._cache["interval_filtering"]
+        except KeyError:
+            pass
+        K = self.base_ring()
+        supported = False
+        if K.is_exact():
+            try:
+                for g in K.gens():
+                    RIF(g)
+                supported = True
+            except (TypeError, ValueError, NotImplementedError):
+                pass
+        self._s._cache["interval_filtering"] = supported
+        return supported
+
+    def _interval_vertices(self, label):
+        r"""
+        Return the vertices of the polygon ``label`` as pairs of real intervals.
+
+        The result is cached until the surface is mutated.
+        """
+        cache = self._s._cache.setdefault("interval_vertices", {})
+        try:
+            return cache[label]
+        except KeyError:
+            vertices = cache[label] = tuple((RIF(v[0]), RIF(v[1])) for v in self.polygon(label).vertices())
+            return vertices
+
+    def _interval_inverse_edge_transformation(self, label, edge):
+        r"""
+        Return an interval approximation of the inverse of
+        :meth:`edge_transformation` in the format of
+        :func:`_interval_affine`.
+
+        The result is cached until the surface is mutated.
+        """
+        cache = self._s._cache.setdefault("interval_inverse_edge_transformations", {})
+        try:
+            return cache[(label, edge)]
+        except KeyError:
+            g = cache[(label, edge)] = _interval_affine(~self.edge_transformation(label, edge))
+            return g
 
     def set_vertex_zero(self, label, v, in_place=False):
         r"""
@@ -869,24 +1120,58 @@ class SimilaritySurface(SageObject):
         else:
             s=self.copy(mutable=True)
 
-        p1=s.polygon(l1)
+        s._triangle_flip_in_place(l1, e1, direction)
+        return s
+
+    def _triangle_flip_in_place(self, l1, e1, direction=None):
+        r"""
+        Flip the edge ``(l1, e1)`` of this mutable surface in place.
+
+        This is the low level routine of :meth:`triangle_flip` and follows the
+        same labelling conventions. It works with edge vectors only and builds
+        the new triangles without validity checks.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: from flatsurf.geometry.surface import Surface_list
+            sage: s = similarity_surfaces.right_angle_triangle(ZZ(1),ZZ(1))
+            sage: s = s.__class__(Surface_list(surface=s, mutable=True))
+            sage: s._triangle_flip_in_place(0, 1)
+            sage: s.polygon(0)
+            Polygon: (0, 0), (1, 1), (0, 1)
+            sage: s.polygon(1)
+            Polygon: (0, 0), (-1, -1), (0, -1)
+        """
+        p1=self.polygon(l1)
         if not p1.num_edges()==3:
             raise ValueError("The polygon with the provided label is not a triangle.")
-        l2,e2 = s.opposite_edge(l1,e1)
-
-        sim = s.edge_transformation(l2,e2)
-        m = sim.derivative()
-        p2=s.polygon(l2)
+        l2,e2 = self.opposite_edge(l1,e1)
+        p2=self.polygon(l2)
         if not p2.num_edges()==3:
             raise ValueError("The polygon opposite the provided edge is not a triangle.")
         P=p1.parent()
-        p2=P(vertices=[sim(v) for v in p2.vertices()])
+
+        # The edges of p1 and the edges of p2 moved by the gluing similarity
+        # to share the edge (l1,e1). The gluing maps the edge e2 of p2 to the
+        # opposite of the edge e1 of p1, i.e., it is the multiplication by the
+        # complex number -E1/E2.
+        edges1=p1.edges()
+        edges2=p2.edges()
+        E1=edges1[e1]
+        E2=edges2[e2]
+        if E1 != -E2:
+            n=E2[0]*E2[0] + E2[1]*E2[1]
+            re=-(E1[0]*E2[0] + E1[1]*E2[1]) / n
+            im=-(E1[1]*E2[0] - E1[0]*E2[1]) / n
+            V=self.vector_space()
+            edges2=[V((re*v[0] - im*v[1], im*v[0] + re*v[1])) for v in edges2]
 
         if direction is None:
-            direction=s.vector_space()((0,1))
+            direction=self.vector_space()((0,1))
         # Get vertices corresponding to separatices in the provided direction.
-        v1=p1.find_separatrix(direction=direction)[0]
-        v2=p2.find_separatrix(direction=direction)[0]
+        v1=_triangle_separatrix(edges1, direction)
+        v2=_triangle_separatrix(edges2, direction)
         # Our quadrilateral has vertices labeled:
         # * 0=p1.vertex(e1+1)=p2.vertex(e2)
         # * 1=p1.vertex(e1+2)
@@ -896,57 +1181,37 @@ class SimilaritySurface(SageObject):
         q1 = (3+v1-e1-1)%3
         q2 = (2+(3+v2-e2-1)%3)%4
 
-        new_diagonal=p2.vertex((e2+2)%3)-p1.vertex((e1+2)%3)
-        # This list will store the new triangles which are being glued in.
+        new_diagonal=edges1[(e1+2)%3] + edges2[(e2+1)%3]
+        # The edges of the new triangles being glued in.
         # (Unfortunately, they may not be cyclically labeled in the correct way.)
-        new_triangle=[]
-        try:
-            new_triangle.append(P(edges=[p1.edge((e1+2)%3),p2.edge((e2+1)%3),-new_diagonal]))
-            new_triangle.append(P(edges=[p2.edge((e2+2)%3),p1.edge((e1+1)%3),new_diagonal]))
-            # The above triangles would be glued along edge 2 to form the diagonal of the quadrilateral being removed.
-        except ValueError:
+        new_triangle=[[edges1[(e1+2)%3], edges2[(e2+1)%3], -new_diagonal],
+                      [edges2[(e2+2)%3], edges1[(e1+1)%3], new_diagonal]]
+        # The above triangles would be glued along edge 2 to form the diagonal of the quadrilateral being removed.
+        if wedge_product(new_triangle[0][0], new_triangle[0][1]) <= 0 or \
+           wedge_product(new_triangle[1][0], new_triangle[1][1]) <= 0:
             raise ValueError("Gluing triangles along this edge yields a non-convex quadrilateral.")
 
         # Find the separatrices of the two new triangles, and in particular which way they point.
-        new_sep=[]
-        new_sep.append(new_triangle[0].find_separatrix(direction=direction)[0])
-        new_sep.append(new_triangle[1].find_separatrix(direction=direction)[0])
+        new_sep=[_triangle_separatrix(new_triangle[0], direction),
+                 _triangle_separatrix(new_triangle[1], direction)]
         # The quadrilateral vertices corresponding to these separatrices are
         # new_sep[0]+1 and (new_sep[1]+3)%4 respectively.
 
         # i=0 if the new_triangle[0] should be labeled l1 and new_triangle[1] should be labeled l2.
         # i=1 indicates the opposite labeling.
-        if new_sep[0]+1==q1:
-            # For debugging:
-            assert (new_sep[1]+3)%4==q2, \
-                "Bug: new_sep[1]="+str(new_sep[1])+" and q2="+str(q2)
-            i=0
-        else:
-            # For debugging:
-            assert (new_sep[1]+3)%4==q1
-            assert new_sep[0]+1==q2
-            i=1
+        i = 0 if new_sep[0]+1==q1 else 1
 
         # These quantities represent the cyclic relabeling of triangles needed.
         cycle1 = (new_sep[i]-v1+3)%3
         cycle2 = (new_sep[1-i]-v2+3)%3
 
-        # This will be the new triangle with label l1:
-        tri1=P(edges=[new_triangle[i].edge(cycle1), \
-                      new_triangle[i].edge((cycle1+1)%3), \
-                      new_triangle[i].edge((cycle1+2)%3)])
-        # This will be the new triangle with label l2:
-        tri2=P(edges=[new_triangle[1-i].edge(cycle2), \
-                      new_triangle[1-i].edge((cycle2+1)%3), \
-                      new_triangle[1-i].edge((cycle2+2)%3)])
+        # The edges of the new triangles with label l1 and l2.
+        tri1=[new_triangle[i][(cycle1+k)%3] for k in range(3)]
+        tri2=[new_triangle[1-i][(cycle2+k)%3] for k in range(3)]
         # In the above, edge 2-cycle1 of tri1 would be glued to edge 2-cycle2 of tri2
         diagonal_glue_e1=2-cycle1
         diagonal_glue_e2=2-cycle2
 
-        # FOR CATCHING BUGS:
-        assert p1.find_separatrix(direction=direction)==tri1.find_separatrix(direction=direction)
-        assert p2.find_separatrix(direction=direction)==tri2.find_separatrix(direction=direction)
-
         # Two opposite edges will not change their labels (label,edge) under our regluing operation.
         # The other two opposite ones will change and in fact they change labels.
         # The following finds them (there are two cases).
@@ -954,7 +1219,7 @@ class SimilaritySurface(SageObject):
         # * new_glue_e1 and new_glue_e2 will be the edges of the new triangle with label l1 and l2 which need regluing.
         # * old_e1 and old_e2 will be the corresponding edges of the old triangles.
         # (Note that labels are swapped between the pair. The appending 1 or 2 refers to the label used for the triangle.)
-        if p1.edge(v1)==tri1.edge(v1):
+        if edges1[v1]==tri1[v1]:
             # We don't have to worry about changing gluings on edge v1 of the triangles with label l1
             # We do have to worry about the following edge:
             new_glue_e1=3-diagonal_glue_e1-v1 # returns the edge which is neither diagonal_glue_e1 nor v1.
@@ -962,14 +1227,12 @@ class SimilaritySurface(SageObject):
             old_e1 = 3 - e1 - v1 # Again this finds the edge which is neither e1 nor v1
         else:
             temp = (v1+2)%3
-            # FOR CATCHING BUGS:
-            assert p1.edge(temp)==tri1.edge(temp)
             # We don't have to worry about changing gluings on edge (v1+2)%3 of the triangles with label l1
             # We do have to worry about the following edge:
             new_glue_e1=3-diagonal_glue_e1-temp # returns the edge which is neither diagonal_glue_e1 nor temp.
             # This corresponded to the following old edge:
             old_e1 = 3 - e1 - temp # Again this finds the edge which is neither e1 nor temp
-        if p2.edge(v2)==tri2.edge(v2):
+        if edges2[v2]==tri2[v2]:
             # We don't have to worry about changing gluings on edge v2 of the triangles with label l2
             # We do have to worry about the following edge:
             new_glue_e2=3-diagonal_glue_e2-v2 # returns the edge which is neither diagonal_glue_e2 nor v2.
@@ -977,8 +1240,6 @@ class SimilaritySurface(SageObject):
             old_e2 = 3 - e2 - v2 # Again this finds the edge which is neither e2 nor v2
         else:
             temp = (v2+2)%3
-            # FOR CATCHING BUGS:
-            assert p2.edge(temp)==tri2.edge(temp)
             # We don't have to worry about changing gluings on edge (v2+2)%3 of the triangles with label l2
             # We do have to worry about the following edge:
             new_glue_e2=3-diagonal_glue_e2-temp # returns the edge which is neither diagonal_glue_e2 nor temp.
@@ -986,45 +1247,31 @@ class SimilaritySurface(SageObject):
             old_e2 = 3 - e2 - temp # Again this finds the edge which is neither e2 nor temp
 
         # remember the old gluings.
-        old_opposite1 = s.opposite_edge(l1, old_e1)
-        old_opposite2 = s.opposite_edge(l2, old_e2)
-
-        # We make changes to the underlying surface
-        us=s.underlying_surface()
-
-        # Replace the triangles.
-        us.change_polygon(l1,tri1)
-        us.change_polygon(l2,tri2)
+        old_opposite1 = self.opposite_edge(l1, old_e1)
+        old_opposite2 = self.opposite_edge(l2, old_e2)
+
+        # We make changes to the underlying surface. Only the first change
+        # goes through the public interface which invalidates the caches.
+        us=self.underlying_surface()
+        us.change_polygon(l1, P(edges=tri1, check=False))
+        us._change_polygon(l2, P(edges=tri2, check=False))
         # Glue along the new diagonal of the quadrilateral
-        us.change_edge_gluing(l1,diagonal_glue_e1,
-                             l2,diagonal_glue_e2)
+        us._set_edge_pairing(l1,diagonal_glue_e1,l2,diagonal_glue_e2)
         # Now we deal with that pair of opposite edges of the quadrilateral that need regluing.
-        # There are some special cases:
         if old_opposite1==(l2,old_e2):
             # These opposite edges were glued to each other.
-            # Do the same in the new surface:
-            us.change_edge_gluing(l1,new_glue_e1,
-                                 l2,new_glue_e2)
+            us._set_edge_pairing(l1,new_glue_e1,l2,new_glue_e2)
         else:
             if old_opposite1==(l1,old_e1):
                 # That edge was "self-glued".
-                us.change_edge_gluing(l2,new_glue_e2,
-                                     l2,new_glue_e2)
+                us._set_edge_pairing(l2,new_glue_e2,l2,new_glue_e2)
             else:
-                # The edge (l1,old_e1) was glued in a standard way.
-                # That edge now corresponds to (l2,new_glue_e2):
-                us.change_edge_gluing(l2,new_glue_e2,
-                                     old_opposite1[0],old_opposite1[1])
+                us._set_edge_pairing(l2,new_glue_e2,old_opposite1[0],old_opposite1[1])
             if old_opposite2==(l2,old_e2):
                 # That edge was "self-glued".
-                us.change_edge_gluing(l1,new_glue_e1,
-                                     l1,new_glue_e1)
+                us._set_edge_pairing(l1,new_glue_e1,l1,new_glue_e1)
             else:
-                # The edge (l2,old_e2) was glued in a standard way.
-                # That edge now corresponds to (l1,new_glue_e1):
-                us.change_edge_gluing(l1,new_glue_e1,
-                                     old_opposite2[0],old_opposite2[1])
-        return s
+                us._set_edge_pairing(l1,new_glue_e1,old_opposite2[0],old_opposite2[1])
 
     def join_polygons(self, p1, e1, test=False, in_place=False):
         r"""
@@ -1131,7 +1378,7 @@ class SimilaritySurface(SageObject):
         edge going from the original vertex v1 to vertex v2 will keep the label p.
         The other polygon will get a new label.
 
-        The change will be done in place.
+        The change will be done in place. Return the label of the new polygon.
         """
         poly=self.polygon(p)
         ne=poly.num_edges()
@@ -1190,6 +1437,8 @@ class SimilaritySurface(SageObject):
                 pair = old_to_new_labels[pair]
             self.underlying_surface().change_edge_gluing(new_label, e, pair[0], pair[1])
 
+        return new_label
+
     def singularity(self, l, v, limit=None):
         r"""
         Represents the Singularity associated to the v-th vertex of the polygon with
@@ -1341,6 +1590,39 @@ class SimilaritySurface(SageObject):
             return TranslationSurface(MinimalPlanarCover(self))
         raise ValueError("Provided cover_type is not supported.")
 
+    def first_return_map(self, direction, edges):
+        r"""
+        Return the first return map of the straight line flow in
+        ``direction`` to the union of ``edges`` on the minimal translation
+        cover of this surface.
+
+        This is how the dynamics of billiards is studied: ``direction`` is
+        given in the coordinates of the polygons of this surface and every
+        edge of ``edges`` is replaced by all its copies in the cover. The
+        cover is built once and the return map is cached (see
+        :meth:`~flatsurf.geometry.translation_surface.TranslationSurface.first_return_map`).
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: P = polygons(vertices=[(0,0), (1,0), (0,1)])
+            sage: Q = similarity_surfaces.billiard(P, rational=True)
+            sage: R = Q.first_return_map((1,2), [(0,0)])
+            sage: R.length()
+            4
+            sage: Q.first_return_map((1,2), [(0,0)]) is R
+            True
+        """
+        try:
+            cover = self._s._cache["minimal_translation_cover"]
+        except KeyError:
+            cover = self._s._cache["minimal_translation_cover"] = self.minimal_cover("translation")
+        edges = set((p, e) for p, e in edges)
+        lifts = [(lab, e) for lab in cover.label_iterator()
+                 for e in range(cover.polygon(lab).num_edges())
+                 if (lab[0], e) in edges]
+        return cover.first_return_map(direction, lifts)
+
     def minimal_translation_cover(self):
         r"""
         Return the minimal translation cover.
@@ -1592,11 +1874,15 @@ class SimilaritySurface(SageObject):
         poly2=self.polygon(p2)
         if poly1.num_edges()!=3 or poly2.num_edges()!=3:
             raise ValueError("Edge must be adjacent to two triangles.")
-        from flatsurf.geometry.matrix_2x2 import similarity_from_vectors
-        sim1=similarity_from_vectors(poly1.edge(e1+2),-poly1.edge(e1+1))
-        sim2=similarity_from_vectors(poly2.edge(e2+2),-poly2.edge(e2+1))
-        sim=sim1*sim2
-        return sim[1][0]<0
+        # The edge needs a flip if the angles opposite to it add up to more
+        # than pi. If the angle at the opposite vertex of poly1 is given by the
+        # complex number z1 = (u1.v1) + i (u1 ^ v1) up to a positive factor and
+        # similarly for poly2, we need to check the sign of Im(z1*z2).
+        u1=poly1.edge(e1+2)
+        v1=poly1.edge(e1+1)
+        u2=poly2.edge(e2+2)
+        v2=poly2.edge(e2+1)
+        return dot_product(u1,v1)*wedge_product(u2,v2) + wedge_product(u1,v1)*dot_product(u2,v2) < 0
 
     def _edge_needs_join(self,p1,e1):
         r"""
@@ -1730,6 +2016,20 @@ class SimilaritySurface(SageObject):
             sage: TestSuite(ss).run(skip="_test_pickling")
             sage: ss.is_delaunay_triangulated(limit=10)
             True
+
+        TESTS:
+
+        With a limit, the flips are the ones that repeated calls to
+        :meth:`delaunay_single_flip` perform::
+
+            sage: m = matrix([[1,3],[0,1]])
+            sage: s = (m*translation_surfaces.veech_double_n_gon(5)).triangulate()
+            sage: s1 = s.copy(mutable=True)
+            sage: for i in range(3):
+            ....:     assert s1.delaunay_single_flip()
+            sage: s2 = s.delaunay_triangulation(triangulated=True, limit=3)
+            sage: s1 == s2
+            True
         """
         if not self.is_finite() and limit is None:
             if in_place:
@@ -1754,55 +2054,76 @@ class SimilaritySurface(SageObject):
             else:
                 s=self.copy(relabel=True,mutable=True)
                 s.triangulate(in_place=True)
-        loop=True
         if direction is None:
             base_ring = self.base_ring()
             direction = self.vector_space()( (base_ring.zero(), base_ring.one()) )
         else:
             assert not direction.is_zero()
+        from flatsurf.geometry.delaunay import DelaunayFlipper
+        flipper = DelaunayFlipper(s, direction=direction)
         if s.is_finite() and limit is None:
-            from collections import deque
-            unchecked_labels=deque(label for label in s.label_iterator())
-            checked_labels = set()
-            while unchecked_labels:
-                label = unchecked_labels.popleft()
-                flipped=False
-                for edge in range(3):
-                    if s._edge_needs_flip(label,edge):
-                        # Record the current opposite edge:
-                        label2,edge2=s.opposite_edge(label,edge)
-                        # Perform the flip.
-                        s.triangle_flip(label, edge, in_place=True, direction=direction)
-                        # Move the opposite polygon to the list of labels we need to check.
-                        if label2 != label:
-                            try:
-                                checked_labels.remove(label2)
-                                unchecked_labels.append(label2)
-                            except KeyError:
-                                # Occurs if label2 is not in checked_labels
-                                pass
-                        flipped=True
-                        break
-                if flipped:
-                    unchecked_labels.append(label)
-                else:
-                    checked_labels.add(label)
+            flipper.run()
             return s
         else:
-            # Old method for infinite surfaces, or limits.
+            # For infinite surfaces, or limits, we flip the edges in the order
+            # in which a scan over edge_iterator(gluings=True) would find them
+            # if it restarted after every flip. Instead of actually rescanning,
+            # we keep a heap of the edges that might need a flip keyed by their
+            # position in that scan and only recheck the edges touched by a
+            # flip.
+            # For infinite surfaces, the labels are numbered as we discover
+            # them starting from the base label.
+            import heapq
             count=0
             lc = self._label_comparator()
-            while loop:
-                loop=False
-                for (l1,e1),(l2,e2) in s.edge_iterator(gluings=True):
-                    if (lc.lt(l1,l2) or (l1==l2 and e1<=e2)) and s._edge_needs_flip(l1,e1):
-                        s.triangle_flip(l1, e1, in_place=True, direction=direction)
-                        count += 1
-                        if not limit is None and count>=limit:
-                            return s
-                        loop=True
-                        break
-            return s
+            labels = []
+            position = {}
+            def number(label):
+                try:
+                    return position[label]
+                except KeyError:
+                    position[label] = len(labels)
+                    labels.append(label)
+                    return position[label]
+            if s.is_finite():
+                for label in s.label_iterator():
+                    number(label)
+            else:
+                number(s.base_label())
+            candidates = []
+            def check(l1, e1):
+                l2,e2 = s.opposite_edge(l1,e1)
+                number(l2)
+                if (lc.lt(l1,l2) or (l1==l2 and e1<=e2)) and flipper.needs_flip(l1,e1):
+                    heapq.heappush(candidates, (number(l1), e1))
+            # The labels before this position have been checked.
+            scanned = 0
+            while True:
+                if scanned < len(labels) and (not candidates or candidates[0][0] >= scanned):
+                    # There might be an earlier edge in the labels we did not
+                    # check yet.
+                    for edge in range(s.polygon(labels[scanned]).num_edges()):
+                        check(labels[scanned], edge)
+                    scanned += 1
+                    continue
+                if not candidates:
+                    return s
+                l1, e1 = heapq.heappop(candidates)
+                l1 = labels[l1]
+                l2, e2 = s.opposite_edge(l1, e1)
+                if not ((lc.lt(l1,l2) or (l1==l2 and e1<=e2)) and flipper.needs_flip(l1,e1)):
+                    # This edge has been rechecked after a flip.
+                    continue
+                flipper.flip(l1, e1)
+                count += 1
+                if not limit is None and count>=limit:
+                    return s
+                # Recheck all the edges of the two triangles and the edges
+                # glued to them.
+                for label in set([l1, l2]):
+                    for edge in range(3):
+                        check(label, edge)
+                        check(*s.opposite_edge(label, edge))
 
     def delaunay_single_join(self):
         if not self.is_finite():
@@ -1893,24 +2214,206 @@ class SimilaritySurface(SageObject):
             s.delaunay_triangulation(triangulated=triangulated, in_place=True, \
                 direction=direction)
         # Now s is Delaunay Triangulated
-        loop=True
+        # Each join keeps the smaller of the two labels and the vertex 0 of
+        # the polygon with that label, so the result does not depend on the
+        # order in which we join. We keep a worklist of the polygons which
+        # might have an edge that needs to be removed.
+        from collections import deque
         lc = self._label_comparator()
-        while loop:
-            loop=False
-            for (l1,e1),(l2,e2) in s.edge_iterator(gluings=True):
-                if (lc.lt(l1,l2) or (l1==l2 and e1<=e2)) and s._edge_needs_join(l1,e1):
-                    s.join_polygons(l1, e1, in_place=True)
-                    loop=True
+        unchecked_labels = deque(s.label_iterator())
+        removed_labels = set()
+        while unchecked_labels:
+            label = unchecked_labels.popleft()
+            if label in removed_labels:
+                continue
+            for edge in range(s.polygon(label).num_edges()):
+                if s._edge_needs_join(label, edge):
+                    label2, edge2 = s.opposite_edge(label, edge)
+                    if lc.lt(label2, label):
+                        label, edge, label2 = label2, edge2, label
+                    s.join_polygons(label, edge, in_place=True)
+                    removed_labels.add(label2)
+                    unchecked_labels.append(label)
                     break
         return s
 
-    def saddle_connections(self, squared_length_bound, initial_label=None, initial_vertex=None, sc_list=None, check=False):
+    def isometries(self):
+        r"""
+        Return the orientation preserving isometries of this surface which map
+        polygons to polygons.
+
+        Each isometry is given as a dictionary which maps a label ``l`` to a
+        triple ``(ll, k, R)``: the polygon ``l`` is mapped to the polygon
+        ``ll``, its edge ``e`` is mapped to the edge ``e + k`` of ``ll``, and
+        ``R`` is the rotation matrix which maps the edge vectors of ``l`` to
+        the corresponding edge vectors of ``ll``. The identity comes first.
+
+        The result is cached until the surface is mutated.
+
+        EXAMPLES::
+
+            sage: from flatsurf import translation_surfaces
+            sage: s = translation_surfaces.square_torus()
+            sage: len(s.isometries())
+            4
+            sage: s.isometries()[1]
+            {0: (0, 1, [ 0 -1]
+            [ 1  0])}
+
+            sage: len(translation_surfaces.regular_octagon().isometries())
+            8
+            sage: len(translation_surfaces.veech_double_n_gon(5).isometries())
+            10
+        """
+        try:
+            return self._s._cache["isometries"]
+        except KeyError:
+            pass
+        if not self.is_finite():
+            raise NotImplementedError("isometries are only implemented for finite surfaces")
+        l0 = self.base_label()
+        n = self.polygon(l0).num_edges()
+        isometries = []
+        for l in self.label_iterator():
+            if self.polygon(l).num_edges() != n:
+                continue
+            for k in range(n):
+                g = self._isometry_extending(l0, l, k)
+                if g is None:
+                    continue
+                if l == l0 and k == 0:
+                    isometries.insert(0, g)
+                else:
+                    isometries.append(g)
+        self._s._cache["isometries"] = isometries
+        return isometries
+
+    def _isometry_extending(self, l0, l, k):
+        r"""
+        Return the isometry which maps the edge 0 of the polygon ``l0`` to the
+        edge ``k`` of the polygon ``l`` in the format of :meth:`isometries`, or
+        ``None`` if no such isometry exists.
+
+        EXAMPLES::
+
+            sage: from flatsurf import translation_surfaces
+            sage: s = translation_surfaces.square_torus()
+            sage: s._isometry_extending(0, 0, 0)
+            {0: (0, 0, [1 0]
+            [0 1])}
+        """
+        g = {}
+        images = set()
+        pending = [(l0, l, k)]
+        while pending:
+            a, b, shift = pending.pop()
+            if a in g:
+                if g[a][0] != b or g[a][1] != shift:
+                    return None
+                continue
+            if b in images:
+                return None
+            pa = self.polygon(a)
+            pb = self.polygon(b)
+            n = pa.num_edges()
+            if pb.num_edges() != n:
+                return None
+            u = pa.edge(0)
+            w = pb.edge(shift)
+            norm = u[0]*u[0] + u[1]*u[1]
+            if norm != w[0]*w[0] + w[1]*w[1]:
+                return None
+            c = (u[0]*w[0] + u[1]*w[1]) / norm
+            s = wedge_product(u, w) / norm
+            R = matrix(self.base_ring(), 2, [c, -s, s, c])
+            if any(R*pa.edge(e) != pb.edge((e+shift)%n) for e in range(1,n)):
+                return None
+            g[a] = (b, shift, R)
+            images.add(b)
+            for e in range(n):
+                aa, ee = self.opposite_edge(a, e)
+                bb, ff = self.opposite_edge(b, (e+shift)%n)
+                pending.append((aa, bb, (ff - ee) % self.polygon(aa).num_edges()))
+        if len(g) != self.num_polygons():
+            return None
+        return g
+
+    def _isometry_image(self, g, sc, check=False):
+        r"""
+        Return the image of the saddle connection ``sc`` under the isometry
+        ``g`` as returned by :meth:`isometries`.
+
+        EXAMPLES::
+
+            sage: from flatsurf import translation_surfaces
+            sage: s = translation_surfaces.square_torus()
+            sage: sc = s.saddle_connections(1)[0]
+            sage: sc.holonomy()
+            (1, 0)
+            sage: s._isometry_image(s.isometries()[1], sc).holonomy()
+            (0, 1)
+        """
+        label, vertex = sc.start_data()
+        image_label, shift, R = g[label]
+        end_label, end_vertex = sc.end_data()
+        image_end_label, end_shift, end_R = g[end_label]
+        return SaddleConnection(self,
+            (image_label, (vertex + shift) % self.polygon(image_label).num_edges()),
+            R * sc.direction(),
+            end_data=(image_end_label, (end_vertex + end_shift) % self.polygon(image_end_label).num_edges()),
+            end_direction=end_R * sc.end_direction(),
+            holonomy=R * sc.holonomy(),
+            end_holonomy=end_R * sc.end_holonomy(),
+            check=check)
+
+    def saddle_connection_orbits(self, squared_length_bound, check=False):
+        r"""
+        Return the saddle connections of :meth:`saddle_connections` up to the
+        :meth:`isometries` of the surface.
+
+        Returns a list of pairs ``(sc, size)`` where ``sc`` is a representative
+        of an orbit of saddle connections and ``size`` is the size of that
+        orbit. Only the representatives are searched for.
+
+        EXAMPLES::
+
+            sage: from flatsurf import translation_surfaces
+            sage: s = translation_surfaces.regular_octagon()
+            sage: orbits = s.saddle_connection_orbits(16)
+            sage: sum(size for sc, size in orbits) == len(s.saddle_connections(16))
+            True
+        """
+        if not self.is_finite():
+            raise NotImplementedError("saddle_connection_orbits is only implemented for finite surfaces")
+        isometries = self.isometries()
+        # The isometries act freely on the pairs (label, vertex) since an
+        # isometry which fixes a vertex of a polygon fixes that polygon and
+        # hence the whole surface. So each orbit of saddle connections has the
+        # same size and we need to search only from one vertex per orbit.
+        seen = set()
+        sc_list = []
+        for label in self.label_iterator():
+            for vertex in range(self.polygon(label).num_edges()):
+                if (label, vertex) in seen:
+                    continue
+                self.saddle_connections(squared_length_bound, initial_label=label, initial_vertex=vertex, sc_list=sc_list, check=check)
+                for g in isometries:
+                    image_label, shift, _ = g[label]
+                    seen.add((image_label, (vertex + shift) % self.polygon(image_label).num_edges()))
+        size = len(isometries)
+        return [(sc, size) for sc in sc_list]
+
+    def saddle_connections(self, squared_length_bound, initial_label=None, initial_vertex=None, sc_list=None, check=False, symmetry=False):
         r"""
         Returns a list of saddle connections on the surface whose length squared is less than or equal to squared_length_bound.
         The length of a saddle connection is measured using holonomy from polygon in which the trajectory starts.
 
         If initial_label and initial_vertex are not provided, we return all saddle connections satisfying the bound condition.
 
+        If symmetry==True and neither initial_label nor initial_vertex are provided, we only search for
+        saddle connections up to the :meth:`isometries` of the surface and obtain the others as their images,
+        see :meth:`saddle_connection_orbits`. The saddle connections are then returned in a different order.
+
         If initial_label and initial_vertex are provided, it only provides saddle connections emanating from the corresponding
         vertex of a polygon. If only initial_label is provided, the added saddle connections will only emanate from the
         corresponding polygon.
@@ -1925,10 +2428,38 @@ class SimilaritySurface(SageObject):
             sage: sc_list = s.saddle_connections(13, check=True)
             sage: len(sc_list)
             32
+
+        TESTS:
+
+        Most predicates are decided with interval arithmetic, but the
+        resulting saddle connections are exact::
+
+            sage: s = translation_surfaces.veech_double_n_gon(5)
+            sage: sc_list = s.saddle_connections(16)
+            sage: all(sc.holonomy()[0]**2 + sc.holonomy()[1]**2 <= 16 for sc in sc_list)
+            True
+            sage: len(set(sc_list)) == len(sc_list)
+            True
+            sage: sc_list[0].holonomy().base_ring() is s.base_ring()
+            True
+
+        Searching up to symmetry produces the same saddle connections::
+
+            sage: s = translation_surfaces.veech_2n_gon(5)
+            sage: set(s.saddle_connections(16, symmetry=True)) == set(s.saddle_connections(16))
+            True
         """
         assert squared_length_bound > 0
         if sc_list is None:
             sc_list = []
+        if symmetry:
+            if initial_label is not None:
+                raise ValueError("symmetry can only be used when searching from all vertices")
+            for sc, _ in self.saddle_connection_orbits(squared_length_bound, check=check):
+                sc_list.append(sc)
+                for g in self.isometries()[1:]:
+                    sc_list.append(self._isometry_image(g, sc, check=check))
+            return sc_list
         if initial_label is None:
             assert self.is_finite()
             assert initial_vertex is None, "If initial_label is not provided, then initial_vertex must not be provided either."
@@ -1953,28 +2484,92 @@ class SimilaritySurface(SageObject):
         if e[0]**2 + e[1]**2 <= squared_length_bound:
             sc_list.append( SaddleConnection(self, start_data, e) )
 
-        # Represents the bounds of the beam of trajectories we are sending out.
-        wedge = ( last_sim( p.vertex((initial_vertex+1)%p.num_edges()) ),
-                  last_sim( p.vertex((initial_vertex+p.num_edges()-1)%p.num_edges()) ))
+        # The predicates below are first evaluated with interval arithmetic.
+        # Only when the interval does not determine the answer, we resort to
+        # exact arithmetic.
+        filtered = self._supports_interval_filtering()
+        if filtered:
+            ibound = RIF(squared_length_bound)
+
+        def wedge_sign(a, b):
+            # The sign of the wedge product of the developed vertices a and b
+            # which are given as pairs (polygon, vertex).
+            if filtered:
+                ia = a[0].iposition(a[1])
+                ib = b[0].iposition(b[1])
+                w = ia[0]*ib[1] - ia[1]*ib[0]
+                if w > 0:
+                    return 1
+                if w < 0:
+                    return -1
+            w = wedge_product(a[0].position(a[1]), b[0].position(b[1]))
+            if w > 0:
+                return 1
+            if w < 0:
+                return -1
+            return 0
+
+        def within_bound(a):
+            # Whether the developed vertex a is at most at the bound.
+            if filtered:
+                ia = a[0].iposition(a[1])
+                n = ia[0].square() + ia[1].square()
+                if n <= ibound:
+                    return True
+                if n > ibound:
+                    return False
+            pos = a[0].position(a[1])
+            return pos[0]**2 + pos[1]**2 <= squared_length_bound
+
+        def enters_circle(a, b):
+            # Whether the open segment between the developed vertices a and b
+            # enters the interior of the circle of radius the bound.
+            if filtered:
+                ia = a[0].iposition(a[1])
+                ib = b[0].iposition(b[1])
+                na = ia[0].square() + ia[1].square()
+                nb = ib[0].square() + ib[1].square()
+                if na < ibound or nb < ibound:
+                    return True
+                if na > ibound and nb > ibound:
+                    d = (ib[0] - ia[0], ib[1] - ia[1])
+                    w = ia[0]*ib[1] - ia[1]*ib[0]
+                    # The line through a and b misses the closed disk.
+                    if w.square() > ibound * (d[0].square() + d[1].square()):
+                        return False
+                    # The point on the line closest to the center is not
+                    # in the interior of the segment.
+                    if ia[0]*d[0] + ia[1]*d[1] > 0 or ib[0]*d[0] + ib[1]*d[1] < 0:
+                        return False
+            return circle.line_segment_position(a[0].position(a[1]), b[0].position(b[1])) == 1
+
+        start = _DevelopedPolygon(self, initial_label, sim=last_sim)
+
+        # Represents the bounds of the beam of trajectories we are sending
+        # out. Each bound is a vertex of a developed polygon.
+        wedge = ( (start, (initial_vertex+1)%p.num_edges()),
+                  (start, (initial_vertex+p.num_edges()-1)%p.num_edges()) )
 
         # This will collect the data we need for a depth first search.
-        chain = [(last_sim, initial_label, wedge, [(initial_vertex+p.num_edges()-i)%p.num_edges() for i in range(2,p.num_edges())])]
+        chain = [(start, wedge, [(initial_vertex+p.num_edges()-i)%p.num_edges() for i in range(2,p.num_edges())])]
 
         while len(chain)>0:
             # Should verts really be edges?
-            sim, label, wedge, verts = chain[-1]
+            developed, wedge, verts = chain[-1]
             if len(verts) == 0:
                 chain.pop()
                 continue
             vert = verts.pop()
-            #print("Inspecting "+str(vert))
-            p = self.polygon(label)
+            label = developed.label
+            p = developed.polygon
+            vertex = (developed, vert)
+            vertex2 = (developed, (vert+1)%p.num_edges())
             # First check the vertex
-            vert_position = sim(p.vertex(vert))
-            #print(wedge[1].n())
-            if wedge_product(wedge[0], vert_position) > 0 and \
-               wedge_product(vert_position, wedge[1]) > 0 and \
-               vert_position[0]**2 + vert_position[1]**2 <= squared_length_bound:
+            if wedge_sign(wedge[0], vertex) > 0 and \
+               wedge_sign(vertex, wedge[1]) > 0 and \
+               within_bound(vertex):
+                    sim = developed.sim()
+                    vert_position = developed.position(vert)
                     sc_list.append( SaddleConnection(self, start_data, vert_position,
                                                    end_data = (label,vert),
                                                    end_direction = ~sim.derivative()*-vert_position,
@@ -1982,26 +2577,25 @@ class SimilaritySurface(SageObject):
                                                    end_holonomy = ~sim.derivative()*-vert_position,
                                                    check = check) )
             # Now check if we should develop across the edge
-            vert_position2 = sim(p.vertex( (vert+1)%p.num_edges() ))
-            if wedge_product(vert_position,vert_position2)>0 and \
-               wedge_product(wedge[0],vert_position2)>0 and \
-               wedge_product(vert_position,wedge[1])>0 and \
-               circle.line_segment_position(vert_position, vert_position2)==1:
-                if wedge_product(wedge[0], vert_position) > 0:
-                    # First in new_wedge should be vert_position
-                    if wedge_product(vert_position2, wedge[1]) > 0:
-                        new_wedge = (vert_position, vert_position2)
+            if wedge_sign(vertex, vertex2) > 0 and \
+               wedge_sign(wedge[0], vertex2) > 0 and \
+               wedge_sign(vertex, wedge[1]) > 0 and \
+               enters_circle(vertex, vertex2):
+                if wedge_sign(wedge[0], vertex) > 0:
+                    # First in new_wedge should be vertex
+                    if wedge_sign(vertex2, wedge[1]) > 0:
+                        new_wedge = (vertex, vertex2)
                     else:
-                        new_wedge = (vert_position, wedge[1])
+                        new_wedge = (vertex, wedge[1])
                 else:
-                    if wedge_product(vert_position2, wedge[1]) > 0:
-                        new_wedge = (wedge[0], vert_position2)
+                    if wedge_sign(vertex2, wedge[1]) > 0:
+                        new_wedge = (wedge[0], vertex2)
                     else:
                         new_wedge=wedge
                 new_label, new_edge = self.opposite_edge(label, vert)
-                new_sim = sim*~self.edge_transformation(label,vert)
-                p = self.polygon(new_label)
-                chain.append( (new_sim, new_label, new_wedge, [(new_edge+p.num_edges()-i)%p.num_edges() for i in range(1,p.num_edges())]) )
+                new_developed = _DevelopedPolygon(self, new_label, parent=developed, edge=vert)
+                p = new_developed.polygon
+                chain.append( (new_developed, new_wedge, [(new_edge+p.num_edges()-i)%p.num_edges() for i in range(1,p.num_edges())]) )
         return sc_list
 
     def set_default_graphical_surface(self, graphical_surface):
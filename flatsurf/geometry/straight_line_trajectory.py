@@ -2,9 +2,10 @@ from __future__ import absolute_import, print_function, division
 from six.moves import range, map, filter, zip
 from six import iteritems
 
+from bisect import bisect_left, bisect_right
 from collections import deque, defaultdict
 
-from .polygon import is_same_direction, line_intersection
+from .polygon import is_same_direction, line_intersection, wedge_product
 from .surface_objects import SaddleConnection
 
 # Vincent question:
@@ -58,6 +59,231 @@ def get_linearity_coeff(u, v):
     else:
         raise ValueError("zero vector")
 
+def _boundary_key(v):
+    r"""
+    Return a key for the base point of the tangent vector ``v`` on the
+    boundary of its polygon.
+
+    Keys are pairs ``(e, t)`` where ``t`` is the relative position of the point
+    on the edge ``e``. They increase counterclockwise along the boundary.
+    """
+    pos = v._position
+    if pos.is_vertex():
+        return (pos.get_vertex(), 0)
+    e = pos.get_edge()
+    poly = v.polygon()
+    edge = poly.edge(e)
+    return (e, (v.point() - poly.vertex(e)).dot_product(edge) / edge.dot_product(edge))
+
+def _trajectory_chords(s, segments):
+    r"""
+    Return the data of the segments of a trajectory on the surface ``s`` that
+    is needed to compute intersections.
+
+    This is a triple ``(chords, crossings, vertices)`` where
+
+    - ``chords`` maps a polygon label to the list of quadruples ``(a, b, o,
+      seg)`` where ``a < b`` are the boundary keys of the endpoints of the
+      segment ``seg`` and ``o`` is ``1`` if ``seg`` goes from ``a`` to ``b``
+      and ``-1`` otherwise
+
+    - ``crossings`` maps triples ``(p, e, t)`` to the list of pairs ``(v,
+      seg)`` for each time the trajectory passes through the point ``t`` of
+      the edge ``e`` of the polygon ``p``. Each passage is recorded once, on the
+      side of the polygon it leaves, except the start of a trajectory that
+      is not closed which is recorded on the side of the polygon it enters.
+      Here ``v`` is the direction of the segment ``seg`` of ``p``.
+
+    - ``vertices`` maps a polygon label to the list of pairs ``(i, seg)``
+      of segments starting or ending at the vertex ``i``
+    """
+    chords = defaultdict(list)
+    crossings = defaultdict(list)
+    vertices = defaultdict(list)
+    first = last = None
+    for seg in segments:
+        label = seg.polygon_label()
+        start = seg.start()
+        end = seg.end()
+        a = _boundary_key(start)
+        b = _boundary_key(end)
+        if a < b:
+            chords[label].append((a, b, 1, seg))
+        else:
+            chords[label].append((b, a, -1, seg))
+        for v, key in ((start, a), (end, b)):
+            if v.is_based_at_singularity():
+                vertices[label].append((key[0], seg))
+        if first is None:
+            first = ((label,) + a, (start.vector(), seg))
+        last = (label,) + b
+        if not end.is_based_at_singularity():
+            crossings[last].append((start.vector(), seg))
+
+    if first is not None and not segments[0].start().is_based_at_singularity():
+        p, e, t = last
+        if segments[-1].end().is_based_at_singularity() or \
+           s.opposite_edge(p, e) + (1 - t,) != first[0]:
+            crossings[first[0]].append(first[1])
+    return chords, crossings, vertices
+
+def _nested_pairs(inserted, queries):
+    r"""
+    Iterate over the pairs of indices ``(i, j)`` such that
+    ``inserted[i][0] < queries[j][0] < inserted[i][1] < queries[j][1]``.
+
+    The chords are swept by increasing start. Each chord of ``inserted`` has
+    its own slot, given by the rank of its end, in a Fenwick tree that marks
+    the chords seen so far. The chords of a query are then found one by one by
+    descending the tree, so that the enumeration takes `O((n+k) \log n)`
+    where ``k`` is the number of pairs.
+
+    EXAMPLES::
+
+        sage: from flatsurf.geometry.straight_line_trajectory import _nested_pairs
+        sage: sorted(_nested_pairs([(0, 2), (1, 5)], [(1, 3), (3, 6), (4, 5)]))
+        [(0, 0), (1, 1)]
+        sage: sorted(_nested_pairs([(0, 4), (1, 4), (2, 6)], [(3, 5), (3, 7)]))
+        [(0, 0), (0, 1), (1, 0), (1, 1), (2, 1)]
+    """
+    order = sorted(range(len(inserted)), key=lambda i: inserted[i][1])
+    ends = [inserted[i][1] for i in order]
+    slot = [0] * len(inserted)
+    for k, i in enumerate(order):
+        slot[i] = k
+    n = len(ends)
+    tree = [0] * (n + 1)
+    top = 1 << (n.bit_length() - 1) if n else 0
+
+    def prefix(i):
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def find(r):
+        # The slot of the r-th marked chord (r >= 1).
+        pos = 0
+        step = top
+        while step:
+            if pos + step <= n and tree[pos + step] < r:
+                pos += step
+                r -= tree[pos]
+            step >>= 1
+        return pos
+
+    events = [(c[0], 1, i) for i, c in enumerate(inserted)]
+    events.extend((c[0], 0, j) for j, c in enumerate(queries))
+    events.sort(key=lambda event: event[:2])
+    for x, kind, i in events:
+        if kind:
+            k = slot[i] + 1
+            while k <= n:
+                tree[k] += 1
+                k += k & -k
+        else:
+            lo = bisect_right(ends, x)
+            hi = bisect_left(ends, queries[i][1])
+            if lo < hi:
+                before = prefix(lo)
+                for r in range(before + 1, prefix(hi) + 1):
+                    yield (order[find(r)], i)
+
+def _count_nested(inserted, queries):
+    r"""
+    Return the number of pairs ``(c, d)`` with ``c`` in ``inserted`` and ``d``
+    in ``queries`` such that ``c[0] < d[0] < c[1] < d[1]`` and the sum of the
+    products ``c[2] * d[2]`` over these pairs.
+
+    This is the same sweep as :func:`_nested_pairs` but the pairs are counted
+    with Fenwick trees instead of being enumerated.
+
+    EXAMPLES::
+
+        sage: from flatsurf.geometry.straight_line_trajectory import _count_nested
+        sage: _count_nested([(0, 2, 1), (1, 5, -1)], [(1, 3, 1), (3, 6, 1), (4, 5, 1)])
+        (2, 0)
+    """
+    ends = sorted(c[1] for c in inserted)
+    n = len(ends)
+    counts = [0] * (n + 1)
+    weights = [0] * (n + 1)
+
+    def prefix(tree, i):
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    events = [(c[0], 1, i) for i, c in enumerate(inserted)]
+    events.extend((c[0], 0, j) for j, c in enumerate(queries))
+    events.sort(key=lambda event: event[:2])
+    number = signed = 0
+    for x, kind, i in events:
+        if kind:
+            c = inserted[i]
+            k = bisect_left(ends, c[1]) + 1
+            while k <= n:
+                counts[k] += 1
+                weights[k] += c[2]
+                k += k & -k
+        else:
+            d = queries[i]
+            lo = bisect_right(ends, x)
+            hi = bisect_left(ends, d[1])
+            if lo < hi:
+                number += prefix(counts, hi) - prefix(counts, lo)
+                signed += d[2] * (prefix(weights, hi) - prefix(weights, lo))
+    return number, signed
+
+def factor_counts(letters, length):
+    r"""
+    Return a dictionary mapping each factor of size ``length`` of the
+    sequence ``letters`` to its number of occurrences.
+
+    The sequence is read once through a sliding window so that ``letters``
+    can be any iterable, for example
+    :meth:`AbstractStraightLineTrajectory.coding_iterator`. The factors are
+    given as tuples.
+
+    EXAMPLES::
+
+        sage: from flatsurf.geometry.straight_line_trajectory import factor_counts
+        sage: sorted(factor_counts('abaab', 2).items())
+        [(('a', 'a'), 1), (('a', 'b'), 2), (('b', 'a'), 1)]
+    """
+    counts = defaultdict(int)
+    window = deque(maxlen=length)
+    for letter in letters:
+        window.append(letter)
+        if len(window) == length:
+            counts[tuple(window)] += 1
+    return dict(counts)
+
+def factor_complexity(letters, length):
+    r"""
+    Return the list of the number of distinct factors of size ``1``, ``2``,
+    ..., ``length`` of the sequence ``letters``.
+
+    As in :func:`factor_counts` the sequence is only read once.
+
+    EXAMPLES::
+
+        sage: from flatsurf.geometry.straight_line_trajectory import factor_complexity
+        sage: factor_complexity('abaababaabaab', 4)
+        [2, 3, 4, 5]
+    """
+    factors = [set() for _ in range(length)]
+    window = deque(maxlen=length)
+    for letter in letters:
+        window.append(letter)
+        w = tuple(window)
+        for i in range(len(w)):
+            factors[len(w) - i - 1].add(w[i:])
+    return [len(f) for f in factors]
+
 class SegmentInPolygon:
     r"""
     Maximal segment in a polygon of a similarity surface
@@ -357,16 +583,16 @@ class AbstractStraightLineTrajectory:
             if lab is not None:
                 ans.append(lab)
 
-        for i in range(len(segments)-1):
-            s = segments[i]
-            end = s.end()
-            p = s.polygon_label()
-            e = end._position.get_edge()
-            lab = (p,e) if alphabet is None else alphabet.get((p,e))
-            if lab is not None:
-                ans.append(lab)
+        previous = None
+        for s in segments:
+            if previous is not None:
+                p = previous.polygon_label()
+                e = previous.end()._position.get_edge()
+                lab = (p,e) if alphabet is None else alphabet.get((p,e))
+                if lab is not None:
+                    ans.append(lab)
+            previous = s
 
-        s = segments[-1]
         end = s.end()
         if end._position._position_type == end._position.EDGE_INTERIOR and \
            end.invert() != start:
@@ -378,6 +604,119 @@ class AbstractStraightLineTrajectory:
 
         return ans
 
+    def period(self, limit=None):
+        r"""
+        Return the number of segments of this trajectory if it is closed and
+        ``None`` otherwise.
+
+        If the trajectory is not yet known to be closed, it is flowed forward
+        until it closes up, hits a singularity, or ``limit`` more segments
+        have been added. The segments flowed are kept in the trajectory.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: s = translation_surfaces.square_torus()
+            sage: traj = s.tangent_vector(0, (1/3,1/5), (2,7)).straight_line_trajectory()
+            sage: traj.period()
+            9
+            sage: traj.combinatorial_length()
+            9
+
+            sage: traj = s.tangent_vector(0, (1/2,0), (1,2)).straight_line_trajectory()
+            sage: traj.period() is None
+            True
+            sage: traj.is_forward_separatrix()
+            True
+
+            sage: K.<sqrt2> = QuadraticField(2)
+            sage: traj = s.tangent_vector(0, (1/3,1/5), (1,sqrt2), ring=K).straight_line_trajectory()
+            sage: traj.period(limit=50) is None
+            True
+            sage: traj.combinatorial_length()
+            51
+        """
+        while not self.is_forward_separatrix():
+            if self.is_closed():
+                return self.combinatorial_length()
+            if limit is not None and limit <= 0:
+                return None
+            steps = 256 if limit is None else min(limit, 256)
+            self.flow(steps)
+            if limit is not None:
+                limit -= steps
+        return None
+
+    def coding_iterator(self, alphabet=None):
+        r"""
+        Iterate over the coding of the forward flow from the start of this
+        trajectory.
+
+        The letters are the same as the ones of :meth:`coding` but they are
+        produced while flowing, without storing the segments in this
+        trajectory. The iteration stops when a singularity is reached and
+        never stops for closed trajectories.
+
+        INPUT:
+
+        - ``alphabet`` -- an optional dictionary ``(lab,nb) -> letter``. If some
+          labels are avoided then these crossings are ignored.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: from itertools import islice
+            sage: t = translation_surfaces.square_torus()
+            sage: alphabet = {(0,0): 'a', (0,1): 'b', (0,2):'a', (0,3): 'b'}
+
+            sage: v = t.tangent_vector(0, (1/2,0), (7,13))
+            sage: l = v.straight_line_trajectory()
+            sage: l.flow(30)
+            sage: c = l.coding(alphabet)
+            sage: list(islice(l.coding_iterator(alphabet), len(c))) == c
+            True
+
+        The factor complexity of a billiard word in an irrational direction::
+
+            sage: from flatsurf.geometry.straight_line_trajectory import factor_complexity
+            sage: K.<sqrt5> = QuadraticField(5)
+            sage: v = t.tangent_vector(0, (1/2,0), (1,(1+sqrt5)/2), ring=K)
+            sage: l = v.straight_line_trajectory()
+            sage: factor_complexity(islice(l.coding_iterator(alphabet), 1000), 6)
+            [2, 3, 4, 5, 6, 7]
+        """
+        for lab in self._crossings():
+            if alphabet is not None:
+                lab = alphabet.get(lab)
+                if lab is None:
+                    continue
+            yield lab
+
+    def _segment_starts(self):
+        r"""
+        Iterate over the pairs ``(label, e)`` made of the polygon of each
+        segment and the edge where it starts (or the vertex if it starts at a
+        singularity).
+        """
+        for seg in self.segments():
+            yield (seg.polygon_label(), _boundary_key(seg.start())[0])
+
+    def _crossings(self):
+        r"""
+        Iterate over the pairs ``(label, edge)`` of the edges crossed by the
+        forward flow from the start of this trajectory.
+        """
+        seg = self.segment(0)
+        start = seg.start()
+        if not start.is_based_at_singularity():
+            yield (seg.polygon_label(), start._position.get_edge())
+        while True:
+            end = seg.end()
+            if end.is_based_at_singularity():
+                return
+            yield (seg.polygon_label(), end._position.get_edge())
+            seg = seg.next()
+
     def initial_tangent_vector(self):
         return self.segment(0).start()
 
@@ -421,53 +760,202 @@ class AbstractStraightLineTrajectory:
             sage: sum(1 for _ in traj1.intersections(traj2))
             2
         """
-        # Partition the segments making up the trajectories by label.
         if isinstance(traj,SaddleConnection):
             traj = traj.trajectory()
-        lab_to_seg1 = {}
-        for seg1 in self.segments():
-            label = seg1.polygon_label()
-            if label in lab_to_seg1:
-                lab_to_seg1[label].append(seg1)
-            else:
-                lab_to_seg1[label] = [seg1]
-        lab_to_seg2 = {}
-        for seg2 in traj.segments():
-            label = seg2.polygon_label()
-            if label in lab_to_seg2:
-                lab_to_seg2[label].append(seg2)
-            else:
-                lab_to_seg2[label] = [seg2]
+        chords1, crossings1, vertices1 = _trajectory_chords(self._s, self.segments())
+        chords2, crossings2, vertices2 = _trajectory_chords(self._s, traj.segments())
+
         intersection_points = set()
         if include_segments:
             segments={}
-        for label,seg_list_1 in iteritems(lab_to_seg1):
-            if label in lab_to_seg2:
-                seg_list_2 = lab_to_seg2[label]
-                for seg1 in seg_list_1:
-                    for seg2 in seg_list_2:
-                        x = line_intersection(seg1.start().point(),
-                                              seg1.start().point()+seg1.start().vector(),
-                                              seg2.start().point(),
-                                              seg2.start().point()+seg2.start().vector())
-                        if x is not None:
-                            pos = self._s.polygon(seg1.polygon_label()).get_point_position(x)
-                            if pos.is_inside() and (count_singularities or not pos.is_vertex()):
-                                new_point = self._s.surface_point(seg1.polygon_label(),x)
-                                if new_point not in intersection_points:
-                                    intersection_points.add(new_point)
-                                    if include_segments:
-                                        segments[new_point]=({seg1},{seg2})
-                                    else:
-                                        yield new_point
-                                elif include_segments:
-                                    segments[new_point][0].append(seg1)
-                                    segments[new_point][1].append(seg2)
+
+        def found(new_point, seg1, seg2):
+            if new_point not in intersection_points:
+                intersection_points.add(new_point)
+                if include_segments:
+                    segments[new_point]=({seg1},{seg2})
+                    return False
+                return True
+            elif include_segments:
+                segments[new_point][0].add(seg1)
+                segments[new_point][1].add(seg2)
+            return False
+
+        # Intersections in the interior of the polygons are the pairs of
+        # chords whose endpoints alternate along the boundary.
+        for label,c1 in iteritems(chords1):
+            if label not in chords2:
+                continue
+            c2 = chords2[label]
+            pairs = list(_nested_pairs(c1, c2))
+            pairs.extend((i,j) for j,i in _nested_pairs(c2, c1))
+            for i,j in pairs:
+                seg1 = c1[i][3]
+                seg2 = c2[j][3]
+                x = line_intersection(seg1.start().point(),
+                                      seg1.start().point()+seg1.start().vector(),
+                                      seg2.start().point(),
+                                      seg2.start().point()+seg2.start().vector())
+                new_point = self._s.surface_point(label,x)
+                if found(new_point, seg1, seg2):
+                    yield new_point
+
+        # Intersections on the edges of the polygons.
+        for (p,e,t),passages1,passages2 in self._edge_crossings(crossings1, crossings2):
+            poly = self._s.polygon(p)
+            for v2,seg2 in passages2:
+                for v1,seg1 in passages1:
+                    if wedge_product(v1, v2):
+                        new_point = self._s.surface_point(p, poly.vertex(e) + t*poly.edge(e))
+                        if found(new_point, seg1, seg2):
+                            yield new_point
+
+        if count_singularities:
+            for label,l1 in iteritems(vertices1):
+                if label not in vertices2:
+                    continue
+                poly = self._s.polygon(label)
+                for i,seg1 in l1:
+                    for j,seg2 in vertices2[label]:
+                        if i == j and wedge_product(seg1.start().vector(), seg2.start().vector()):
+                            new_point = self._s.surface_point(label,poly.vertex(i))
+                            if found(new_point, seg1, seg2):
+                                yield new_point
+
         if include_segments:
             for x in iteritems(segments):
                 yield x
 
+    def _edge_crossings(self, crossings1, crossings2):
+        r"""
+        Iterate over the points on edges through which both trajectories pass.
+
+        Each point is given as a triple ``(key, passages1, passages2)`` where
+        ``passages1`` are the passages of the first trajectory recorded at
+        ``key`` and ``passages2`` the ones of the second trajectory recorded
+        either at ``key`` or on the other side of the edge. In the latter case,
+        the directions of ``passages2`` are brought to the polygon of ``key``.
+        """
+        for key,passages1 in iteritems(crossings1):
+            p,e,t = key
+            if key in crossings2:
+                yield key, passages1, crossings2[key]
+            q,f = self._s.opposite_edge(p,e)
+            other = (q,f,1-t)
+            if other in crossings2:
+                m = self._s.edge_matrix(q,f)
+                yield key, passages1, [(m*v,seg) for v,seg in crossings2[other]]
+
+    def intersection_count(self, traj, algebraic=False, count_singularities=False):
+        r"""
+        Return the number of intersections of this trajectory with ``traj``.
+
+        Each pair of a passage of this trajectory and a passage of ``traj``
+        through a common point is counted. If a trajectory passes several
+        times through the same point, this is more than the number of
+        points returned by :meth:`intersections`. No
+        :class:`~flatsurf.geometry.surface_objects.SurfacePoint` is built for
+        intersections outside of the singularities.
+
+        INPUT:
+
+        - ``traj`` -- a trajectory or a saddle connection
+
+        - ``algebraic`` -- (default: ``False``) whether to count each
+          intersection with the sign of the crossing, positive when ``traj``
+          crosses this trajectory from right to left
 
+        - ``count_singularities`` -- (default: ``False``) whether to count the
+          pairs of passages through a common singularity. This is not allowed
+          for algebraic intersections.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: s=translation_surfaces.square_torus()
+            sage: traj1 = s.tangent_vector(0,(1/2,0),(1,1)).straight_line_trajectory()
+            sage: traj1.flow(3)
+            sage: traj2 = s.tangent_vector(0,(1/2,0),(-1,1)).straight_line_trajectory()
+            sage: traj2.flow(3)
+            sage: traj1.intersection_count(traj2)
+            2
+            sage: traj1.intersection_count(traj2, algebraic=True)
+            2
+            sage: traj2.intersection_count(traj1, algebraic=True)
+            -2
+
+            sage: traj3 = s.tangent_vector(0,(1/3,1/5),(2,7)).straight_line_trajectory()
+            sage: traj3.flow(20)
+            sage: traj3.is_closed()
+            True
+            sage: traj4 = s.tangent_vector(0,(1/7,1/5),(3,-1)).straight_line_trajectory()
+            sage: traj4.flow(20)
+            sage: traj4.is_closed()
+            True
+            sage: traj3.intersection_count(traj4, algebraic=True)
+            -23
+            sage: traj3.intersection_count(traj4) == sum(1 for _ in traj3.intersections(traj4))
+            True
+        """
+        if algebraic and count_singularities:
+            raise ValueError("singularities can not be counted with a sign")
+        if isinstance(traj,SaddleConnection):
+            traj = traj.trajectory()
+        chords1, crossings1, vertices1 = _trajectory_chords(self._s, self.segments())
+        chords2, crossings2, vertices2 = _trajectory_chords(self._s, traj.segments())
+
+        number = signed = 0
+        for label,c1 in iteritems(chords1):
+            if label in chords2:
+                c2 = chords2[label]
+                n1,s1 = _count_nested(c1, c2)
+                n2,s2 = _count_nested(c2, c1)
+                number += n1 + n2
+                signed += s1 - s2
+
+        for _,passages1,passages2 in self._edge_crossings(crossings1, crossings2):
+            for v2,_ in passages2:
+                for v1,_ in passages1:
+                    w = wedge_product(v1, v2)
+                    if w:
+                        number += 1
+                        signed += 1 if w > 0 else -1
+
+        if algebraic:
+            return signed
+
+        if count_singularities:
+            for label,l1 in iteritems(vertices1):
+                for i,seg1 in l1:
+                    for j,seg2 in vertices2.get(label, ()):
+                        if i == j and wedge_product(seg1.start().vector(), seg2.start().vector()):
+                            number += 1
+        return number
+
+
+
+class _SegmentSequence(object):
+    r"""
+    The read-only sequence of the segments of a trajectory which are built
+    with ``trajectory.segment(i)`` when they are accessed.
+    """
+    def __init__(self, trajectory):
+        self._trajectory = trajectory
+
+    def __len__(self):
+        return self._trajectory.combinatorial_length()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._trajectory.segment(j) for j in range(*i.indices(len(self)))]
+        return self._trajectory.segment(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._trajectory.segment(i)
+
+    def __repr__(self):
+        return repr(list(self))
 
 class StraightLineTrajectory(AbstractStraightLineTrajectory):
     r"""
@@ -490,14 +978,72 @@ class StraightLineTrajectory(AbstractStraightLineTrajectory):
         Straight line trajectory made of 1 segments from (1, 0) in polygon 2 to (0, 1) in polygon 1
         sage: traj2.is_saddle_connection()
         True
+
+    Only the label of the polygon, the start point and the direction of each
+    segment are stored. The segments are rebuilt when they are accessed::
+
+        sage: s = similarity_surfaces.example()
+        sage: traj = s.tangent_vector(0, (0,0), (3,-1)).straight_line_trajectory()
+        sage: traj.flow(2)
+        sage: traj._compact_segment(1)[:3]
+        (1, 2, 1/3)
+        sage: traj.segment(1)
+        Segment in polygon 1 starting at (2/3, 2) and ending at (14/9, 4/3)
+        sage: traj.segment(1) == traj.segment(0).next()
+        True
     """
     def __init__(self, tangent_vector):
-        self._segments = deque()
+        self._s=tangent_vector.surface()
+        self._bundle = tangent_vector.bundle()
         seg = SegmentInPolygon(tangent_vector)
-        self._segments.append(seg)
+        # tuples (label, edge, t, vector) where the start point of the
+        # segment is the point at relative position t on the edge. The
+        # segments added by flowing backward are stored in _before in reverse
+        # order, the others in _after so that both ends can grow in amortized
+        # constant time while keeping constant time indexing.
+        self._before = []
+        self._after = [self._compact(seg, None)]
+        self._first = self._last = seg
         self._setup_forward()
         self._setup_backward()
-        self._s=tangent_vector.surface()
+        self._closed = self._check_closed()
+
+    def _compact(self, seg, neighbour):
+        r"""
+        Return the tuple ``(label, e, t, v)`` stored for the segment ``seg``.
+
+        The vector of the adjacent segment ``neighbour`` is reused when the
+        directions agree, which is always the case on translation surfaces.
+        """
+        start = seg.start()
+        e, t = _boundary_key(start)
+        v = start.vector()
+        if neighbour is not None and neighbour[3] == v:
+            v = neighbour[3]
+        return (start.polygon_label(), e, t, v)
+
+    def _compact_segment(self, i):
+        r"""
+        Return the tuple ``(label, e, t, v)`` stored for the ``i``-th segment
+        where ``0 <= i < n``.
+        """
+        k = len(self._before)
+        if i < k:
+            return self._before[k - 1 - i]
+        return self._after[i - k]
+
+    def _compact_segments(self):
+        r"""
+        Iterate over the tuples ``(label, e, t, v)`` stored for the segments.
+        """
+        for seg in reversed(self._before):
+            yield seg
+        for seg in self._after:
+            yield seg
+
+    def _segment_starts(self):
+        for label, e, _, _ in self._compact_segments():
+            yield (label, e)
 
     def surface(self):
         return self._s
@@ -523,13 +1069,51 @@ class StraightLineTrajectory(AbstractStraightLineTrajectory):
             Segment in polygon 0 starting at (-1/13*a, 1/13*a) and ending at
             (9/26*a + 11/13, 17/26*a + 15/13)
         """
-        return self.segments()[i]
+        n = self.combinatorial_length()
+        if i < 0:
+            i += n
+        if i < 0 or i >= n:
+            raise IndexError("segment index out of range")
+        if i == 0:
+            return self._first
+        if i == n - 1:
+            return self._last
+        label, e, t, v = self._compact_segment(i)
+        poly = self._s.polygon(label)
+        start = self._bundle(label, poly.vertex(e) + t * poly.edge(e), v)
+        return SegmentInPolygon(start, start.forward_to_polygon_boundary())
 
     def combinatorial_length(self):
-        return len(self.segments())
+        return len(self._before) + len(self._after)
 
     def segments(self):
-        return self._segments
+        r"""
+        Return the sequence of the segments of this trajectory.
+
+        The segments are rebuilt one at a time when the sequence is indexed or
+        iterated over, so no list of all the segments is kept in memory.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: s = similarity_surfaces.example()
+            sage: traj = s.tangent_vector(0, (0,0), (3,-1)).straight_line_trajectory()
+            sage: traj.flow(2); traj.flow(-1)
+            sage: segments = traj.segments()
+            sage: len(segments)
+            4
+            sage: segments[1] == traj.segment(1)
+            True
+            sage: list(segments) == [traj.segment(i) for i in range(4)]
+            True
+        """
+        return _SegmentSequence(self)
+
+    def initial_tangent_vector(self):
+        return self._first.start()
+
+    def terminal_tangent_vector(self):
+        return self._last.end()
 
     def _setup_forward(self):
         v = self.terminal_tangent_vector()
@@ -596,6 +1180,17 @@ class StraightLineTrajectory(AbstractStraightLineTrajectory):
             sage: l.is_saddle_connection()
             True
         """
+        return self._closed
+
+    def _check_closed(self):
+        r"""
+        Return whether the next segment of this trajectory would be its first
+        segment.
+
+        Since the flow is invertible, a trajectory can not come back to one of
+        its states without coming back to its initial state first. So this is
+        the only comparison needed after each step.
+        """
         return (not self.is_forward_separatrix()) and \
             self._forward.differs_by_scaling(self.initial_tangent_vector())
 
@@ -623,19 +1218,69 @@ class StraightLineTrajectory(AbstractStraightLineTrajectory):
             Straight line trajectory made of 3 segments from (15/16, 45/16) in polygon 1 to (61/36, 11/12) in polygon 1
         """
         while steps>0 and \
-            (not self.is_forward_separatrix()) and \
-            (not self.is_closed()):
-                self._segments.append(SegmentInPolygon(self._forward))
+            (self._forward is not None) and \
+            (not self._closed):
+                self._last = SegmentInPolygon(self._forward)
+                self._after.append(self._compact(self._last, self._compact_segment(self.combinatorial_length() - 1)))
                 self._setup_forward()
+                self._closed = self._check_closed()
                 steps -= 1
         while steps<0 and \
-            (not self.is_backward_separatrix()) and \
-            (not self.is_closed()):
-                self._segments.appendleft(SegmentInPolygon(self._backward).invert())
+            (self._backward is not None) and \
+            (not self._closed):
+                self._first = SegmentInPolygon(self._backward).invert()
+                self._before.append(self._compact(self._first, self._compact_segment(0)))
                 self._setup_backward()
+                self._closed = self._check_closed()
                 steps += 1
 
 
+def _iet_state(s, seg, get_iet):
+    r"""
+    Return the triple ``(p, e, x)`` describing the start of the segment ``seg``
+    in the polygon interval exchanges of the surface ``s``.
+
+    The interval exchange of a polygon with label ``p`` is obtained as
+    ``get_iet(p)``.
+    """
+    start = seg.start()
+    pos = start._position
+    if pos._position_type == pos.EDGE_INTERIOR:
+        i = pos.get_edge()
+    elif pos._position_type == pos.VERTEX:
+        i = pos.get_vertex()
+    else:
+        raise RuntimeError("PROBLEM!")
+
+    p = start.polygon_label()
+    poly = s.polygon(p)
+
+    T = get_iet(p)
+    x = get_linearity_coeff(poly.vertex(i+1) - poly.vertex(i),
+                            start.point() - poly.vertex(i))
+    x *= T.length_bot(i)
+    return (p, i, x)
+
+def _iet_segment(s, vector, T, p, e0, x0):
+    r"""
+    Return the segment in the polygon with label ``p`` of the surface ``s``
+    which starts at ``(p, e0, x0)`` in the direction ``vector``.
+
+    Here ``T`` is the interval exchange of the polygon ``p`` in the direction
+    ``vector`` (see :func:`_iet_state`).
+    """
+    e1, x1 = T.forward_image(e0, x0)
+    poly = s.polygon(p)
+
+    l0 = T.length_bot(e0)
+    l1 = T.length_top(e1)
+
+    point0 = poly.vertex(e0) + poly.edge(e0) * x0/l0
+    point1 = poly.vertex(e1) + poly.edge(e1) * (l1-x1)/l1
+    v0 = s.tangent_vector(p, point0, vector, ring=vector.base_ring())
+    v1 = s.tangent_vector(p, point1, -vector, ring=vector.base_ring())
+    return SegmentInPolygon(v0,v1)
+
 class StraightLineTrajectoryTranslation(AbstractStraightLineTrajectory):
     r"""
     Straight line trajectory in a translation surface.
@@ -655,6 +1300,10 @@ class StraightLineTrajectoryTranslation(AbstractStraightLineTrajectory):
       of the induced interval in the iet)
 
     (see the methods :meth:`_prev` and :meth:`_next`)
+
+    To jump over a large number of crossings without storing them, see
+    :class:`~flatsurf.geometry.interval_exchange_transformation.TransversalIET`
+    which uses the same triples.
     """
     def __init__(self, tangent_vector):
         t = tangent_vector.polygon_label()
@@ -667,25 +1316,8 @@ class StraightLineTrajectoryTranslation(AbstractStraightLineTrajectory):
             self._edge = seg
             return
 
-        start = seg.start()
-        pos = start._position
-        if pos._position_type == pos.EDGE_INTERIOR:
-            i = pos.get_edge()
-        elif pos._position_type == pos.VERTEX:
-            i = pos.get_vertex()
-        else:
-            raise RuntimeError("PROBLEM!")
-
-        p = start.polygon_label()
-        poly = self._s.polygon(p)
-
-        T = self._get_iet(p)
-        x = get_linearity_coeff(poly.vertex(i+1) - poly.vertex(i),
-                                start.point() - poly.vertex(i))
-        x *= T.length_bot(i)
-
         self._points = deque() # we store triples (lab, edge, rel_pos)
-        self._points.append((p, i, x))
+        self._points.append(_iet_state(self._s, seg, self._get_iet))
 
     def _next(self, p, e, x):
         r"""
@@ -726,6 +1358,38 @@ class StraightLineTrajectoryTranslation(AbstractStraightLineTrajectory):
             return 1
         return len(self._points)
 
+    def _crossings(self):
+        r"""
+        Iterate over the pairs ``(label, edge)`` of the edges crossed by the
+        forward flow from the start of this trajectory.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: from flatsurf.geometry.straight_line_trajectory import StraightLineTrajectoryTranslation
+            sage: from itertools import islice
+            sage: O = translation_surfaces.regular_octagon()
+            sage: v = O.tangent_vector(0, (1,1), (33,45))
+            sage: L1 = StraightLineTrajectoryTranslation(v)
+            sage: L2 = v.straight_line_trajectory()
+            sage: list(islice(L1.coding_iterator(), 20)) == list(islice(L2.coding_iterator(), 20))
+            True
+        """
+        if self._points is None:
+            return
+        t = self._points[0]
+        if not t[2].is_zero():
+            yield t[:2]
+        opposite_edge = self._s.opposite_edge
+        while True:
+            p,e,x = t
+            e,x = self._get_iet(p).forward_image(e, x)
+            if x.is_zero():
+                return
+            yield (p, e)
+            p,e = opposite_edge(p, e)
+            t = (p, e, x)
+
     def _get_iet(self, label):
         polygon = self._s.polygon(label)
         try:
@@ -761,18 +1425,7 @@ class StraightLineTrajectoryTranslation(AbstractStraightLineTrajectory):
         if self._points is None:
             return self._edge
         lab, e0, x0 = self._points[i]
-        iet = self._get_iet(lab)
-        e1, x1 = iet.forward_image(e0, x0)
-        poly = self._s.polygon(lab)
-
-        l0 = iet.length_bot(e0)
-        l1 = iet.length_top(e1)
-
-        point0 = poly.vertex(e0) + poly.edge(e0) * x0/l0
-        point1 = poly.vertex(e1) + poly.edge(e1) * (l1-x1)/l1
-        v0 = self._s.tangent_vector(lab, point0, self._vector, ring=self._vector.base_ring())
-        v1 = self._s.tangent_vector(lab, point1, -self._vector, ring=self._vector.base_ring())
-        return SegmentInPolygon(v0,v1)
+        return _iet_segment(self._s, self._vector, self._get_iet(lab), lab, e0, x0)
 
     def segments(self):
         r"""
@@ -849,3 +1502,646 @@ class StraightLineTrajectoryTranslation(AbstractStraightLineTrajectory):
                     # closed curve or backward separatrix
                     break
                 self._points.appendleft(t)
+
+class StraightLineTrajectoryNumeric(AbstractStraightLineTrajectory):
+    r"""
+    Straight line trajectory in a translation surface flowed in double
+    precision.
+
+    As in :class:`StraightLineTrajectoryTranslation`, the trajectory is stored
+    as a list of triples ``(p, e, x)`` but the position ``x`` is a Python
+    float. The interval exchange of each polygon is converted once into
+    floating point breakpoints and translations so that a step only costs a
+    bisection and a floating point addition.
+
+    The exact position is never lost: it is the exact position at the start
+    plus the exact translations of the pieces crossed so far. When a floating
+    point position is closer than ``tolerance`` (relative to the length of its
+    edge) to a breakpoint, i.e., when the next crossing might go through a
+    vertex, this crossing is recomputed with the exact interval exchange. The
+    exact position is also recovered every ``_SYNC`` steps so that rounding
+    errors do not accumulate. These exact positions are kept, so that the
+    exact segments can be rebuilt by flowing exactly at most ``_SYNC`` steps.
+
+    A closed trajectory is detected when a floating point position comes
+    back within the margin of the initial one and this is confirmed by
+    comparing the exact positions. The flow then stops as for the exact
+    classes.
+
+    Such a trajectory is usually built with
+    :meth:`~flatsurf.geometry.tangent_bundle.SimilaritySurfaceTangentVector.straight_line_trajectory`.
+
+    EXAMPLES::
+
+        sage: from flatsurf import *
+        sage: from flatsurf.geometry.straight_line_trajectory import StraightLineTrajectoryTranslation
+        sage: K.<sqrt2> = QuadraticField(2)
+        sage: T = translation_surfaces.square_torus()
+        sage: v = T.tangent_vector(0, (1/3,1/5), (1,sqrt2), ring=K)
+        sage: N = v.straight_line_trajectory(numeric=True)
+        sage: N
+        Numeric straight line trajectory made of 1 segments in direction (1, sqrt2)
+        sage: N.flow(1000)
+        sage: N.combinatorial_length()
+        1001
+
+    The result agrees with the exact flow::
+
+        sage: L = StraightLineTrajectoryTranslation(v)
+        sage: L.flow(1000)
+        sage: N.exact_state() == L._points[-1]
+        True
+        sage: N.exact_state(500) == L._points[500]
+        True
+        sage: N.segment(500) == L.segment(500)
+        True
+        sage: p, e, x = N.state(-1)
+        sage: abs(x - float(L._points[-1][2])) < 1e-12
+        True
+        sage: N.coding() == L.coding()
+        True
+
+    Crossings close to a vertex are decided exactly::
+
+        sage: v = T.tangent_vector(0, (1/2,0), (1,2))
+        sage: N = v.straight_line_trajectory(numeric=True)
+        sage: N.flow(10)
+        sage: N.is_forward_separatrix()
+        True
+        sage: N.combinatorial_length(), N.num_exact_crossings()
+        (1, 1)
+        sage: N.segment(0)
+        Segment in polygon 0 starting at (1/2, 0) and ending at (1, 1)
+        sage: N.segment_coordinates(0)
+        (0, (0.5, 0.0), (1.0, 1.0))
+        sage: N.plot()   # not tested (problem with matplotlib font caches on Travis)
+        Graphics object consisting of 1 graphics primitive
+    """
+    _SYNC = 1024
+
+    def __init__(self, tangent_vector, tolerance=1e-9):
+        self._s = tangent_vector.surface()
+        self._vector = tangent_vector.vector()
+        self._tolerance = float(tolerance)
+        self._iets = {}
+        self._data = {}
+        self._shifts = []
+        self._exact_crossings = 0
+        self._separatrix = False
+        self._closed = False
+        self._sync_indices = []
+        self._sync_positions = []
+
+        seg = SegmentInPolygon(tangent_vector)
+        if seg.is_edge():
+            raise ValueError("trajectories along edges are not supported")
+        p, e, x = _iet_state(self._s, seg, self._get_iet)
+        self._points = [(p, e, self._sync(0, x))]
+        self._closing_margin = self._get_data(p)[e][3]
+
+    def _get_iet(self, label):
+        polygon = self._s.polygon(label)
+        try:
+            return self._iets[polygon]
+        except KeyError:
+            self._iets[polygon] = T = polygon.flow_map(self._vector)
+            return T
+
+    def _get_data(self, label):
+        r"""
+        Return the floating point description of the interval exchange of the
+        polygon ``label``.
+
+        This is a dictionary which maps each bottom label to a tuple
+        ``(starts, ends, pieces, margin)``: the floating point endpoints of
+        the pieces on which the map is a translation, the triples ``(j,
+        shift, k)`` made of the top label, the translation and its index in
+        ``self._shifts``, and the distance to a breakpoint below which the
+        crossing is computed exactly.
+        """
+        polygon = self._s.polygon(label)
+        try:
+            return self._data[polygon]
+        except KeyError:
+            pass
+
+        pieces = defaultdict(lambda: ([], [], []))
+        for i, x, j, y, length in self._get_iet(label)._pieces():
+            starts, ends, shifts = pieces[i]
+            starts.append(float(x))
+            ends.append(float(x + length))
+            shifts.append((j, float(y - x), len(self._shifts)))
+            self._shifts.append(y - x)
+
+        self._data[polygon] = data = {}
+        for i, (starts, ends, shifts) in iteritems(pieces):
+            data[i] = (starts, ends, shifts, self._tolerance * ends[-1])
+        return data
+
+    def _sync(self, i, x):
+        r"""
+        Record ``x`` as the exact position of the ``i``-th point, which must
+        be the last one, and return it as a float.
+        """
+        self._sync_indices.append(i)
+        self._sync_positions.append(x)
+        self._counts = defaultdict(int)
+        self._steps = 0
+        return float(x)
+
+    def __repr__(self):
+        return "Numeric straight line trajectory made of {} segments in direction {}".format(
+                self.combinatorial_length(), self._vector)
+
+    def surface(self):
+        r"""
+        Return the surface on which this trajectory lives.
+        """
+        return self._s
+
+    def combinatorial_length(self):
+        r"""
+        Return the number of segments of this trajectory.
+        """
+        return len(self._points)
+
+    def is_forward_separatrix(self):
+        r"""
+        Return whether the flow of this trajectory stopped at a singularity.
+
+        This is only known once the trajectory has been flowed into the
+        singularity with :meth:`flow`.
+        """
+        return self._separatrix
+
+    def is_backward_separatrix(self):
+        r"""
+        Return whether this trajectory starts at a singularity.
+        """
+        return self._sync_positions[0].is_zero()
+
+    def is_saddle_connection(self):
+        r"""
+        Return whether this trajectory starts at a singularity and has been
+        flowed into a singularity.
+        """
+        return self.is_forward_separatrix() and self.is_backward_separatrix()
+
+    def is_closed(self):
+        r"""
+        Return whether this trajectory has been flowed until it closed up.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: T = translation_surfaces.square_torus()
+            sage: N = T.tangent_vector(0, (1/5,1/7), (1,1)).straight_line_trajectory(numeric=True)
+            sage: N.is_closed()
+            False
+            sage: N.flow(10)
+            sage: N.is_closed()
+            True
+            sage: N.combinatorial_length()
+            2
+            sage: N.period()
+            2
+            sage: N.cylinder().area()
+            1
+
+            sage: K.<sqrt2> = QuadraticField(2)
+            sage: N = T.tangent_vector(0, (1/5,1/7), (1,sqrt2), ring=K).straight_line_trajectory(numeric=True)
+            sage: N.period(limit=100) is None
+            True
+        """
+        return self._closed
+
+    def num_exact_crossings(self):
+        r"""
+        Return the number of crossings that had to be computed exactly.
+        """
+        return self._exact_crossings
+
+    def state(self, i):
+        r"""
+        Return the triple ``(p, e, x)`` of the ``i``-th segment where ``x`` is
+        a float.
+        """
+        return self._points[i]
+
+    def exact_state(self, i=-1):
+        r"""
+        Return the exact triple ``(p, e, x)`` of the ``i``-th segment (by
+        default the last one).
+        """
+        n = len(self._points)
+        if i < 0:
+            i += n
+        if i < 0 or i >= n:
+            raise IndexError("segment index out of range")
+
+        if i == n - 1:
+            p, e, _ = self._points[-1]
+            x = self._sync_positions[-1]
+            for k, c in iteritems(self._counts):
+                x += c * self._shifts[k]
+            return (p, e, x)
+
+        k = bisect_right(self._sync_indices, i) - 1
+        j = self._sync_indices[k]
+        x = self._sync_positions[k]
+        p, e, _ = self._points[j]
+        while j < i:
+            x = self._get_iet(p).forward_image(e, x)[1]
+            j += 1
+            p, e, _ = self._points[j]
+        return (p, e, x)
+
+    def _exact_states(self):
+        r"""
+        Iterate over the exact triples ``(p, e, x)`` of the segments.
+        """
+        syncs = dict(zip(self._sync_indices, self._sync_positions))
+        for i, (p, e, _) in enumerate(self._points):
+            if i in syncs:
+                x = syncs[i]
+            else:
+                x = self._get_iet(q).forward_image(f, x)[1]
+            q, f = p, e
+            yield (p, e, x)
+
+    def segment(self, i):
+        r"""
+        Return the ``i``-th segment as an exact :class:`SegmentInPolygon`.
+
+        See :meth:`segment_coordinates` for its floating point coordinates.
+        """
+        p, e, x = self.exact_state(i)
+        return _iet_segment(self._s, self._vector, self._get_iet(p), p, e, x)
+
+    def segments(self):
+        r"""
+        Return the list of the segments of this trajectory as exact
+        :class:`SegmentInPolygon`.
+        """
+        return [_iet_segment(self._s, self._vector, self._get_iet(p), p, e, x)
+                for p, e, x in self._exact_states()]
+
+    def segment_coordinates(self, i):
+        r"""
+        Return the ``i``-th segment as a triple ``(label, start, end)`` where
+        ``start`` and ``end`` are pairs of floats.
+        """
+        p, e0, x0 = self._points[i]
+        starts, ends, pieces, margin = self._get_data(p)[e0]
+        e1, shift, _ = pieces[max(bisect_right(starts, x0) - 1, 0)]
+        x1 = x0 + shift
+
+        T = self._get_iet(p)
+        poly = self._s.polygon(p)
+        t0 = x0 / float(T.length_bot(e0))
+        l1 = float(T.length_top(e1))
+        t1 = (l1 - x1) / l1
+        v0, w0 = poly.vertex(e0), poly.edge(e0)
+        v1, w1 = poly.vertex(e1), poly.edge(e1)
+        return (p,
+                (float(v0[0]) + t0 * float(w0[0]), float(v0[1]) + t0 * float(w0[1])),
+                (float(v1[0]) + t1 * float(w1[0]), float(v1[1]) + t1 * float(w1[1])))
+
+    def graphical_trajectory(self, graphical_surface=None, **options):
+        r"""
+        Return a ``GraphicalNumericStraightLineTrajectory`` corresponding to
+        this trajectory in the provided ``GraphicalSurface``.
+
+        The segments are drawn from their floating point coordinates.
+        """
+        from flatsurf.graphical.straight_line_trajectory import GraphicalNumericStraightLineTrajectory
+        if graphical_surface is None:
+            graphical_surface = self.surface().graphical_surface()
+        return GraphicalNumericStraightLineTrajectory(self, graphical_surface, **options)
+
+    def coding(self, alphabet=None):
+        r"""
+        Return the coding of this trajectory with respect to the sides of the
+        polygons.
+
+        This is the same as
+        :meth:`AbstractStraightLineTrajectory.coding` but it is read from the
+        states of the trajectory.
+
+        INPUT:
+
+        - ``alphabet`` -- an optional dictionary ``(lab,nb) -> letter``. If some
+          labels are avoided then these crossings are ignored.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: t = translation_surfaces.square_torus()
+            sage: alphabet = {(0,0): 'a', (0,1): 'b', (0,2):'a', (0,3): 'b'}
+            sage: v = t.tangent_vector(0, (1/2,0), (7,13))
+            sage: N = v.straight_line_trajectory(numeric=True)
+            sage: N.flow(10)
+            sage: l = v.straight_line_trajectory()
+            sage: l.flow(10)
+            sage: N.coding() == l.coding()
+            True
+            sage: N.coding(alphabet) == l.coding(alphabet)
+            True
+        """
+        p, e, x = self.exact_state(0)
+        crossings = [] if x.is_zero() else [(p, e)]
+        opposite_edge = self._s.opposite_edge
+        for p, e, _ in self._points[1:]:
+            crossings.append(opposite_edge(p, e))
+        if not self._closed:
+            # For a closed trajectory, the last crossing is the first one.
+            p, e, x = self.exact_state()
+            e, x = self._get_iet(p).forward_image(e, x)
+            if not x.is_zero():
+                crossings.append((p, e))
+
+        if alphabet is None:
+            return crossings
+        return [alphabet[c] for c in crossings if alphabet.get(c) is not None]
+
+    def _crossings(self):
+        r"""
+        Iterate over the pairs ``(label, edge)`` of the edges crossed by the
+        forward flow from the start of this trajectory.
+
+        The flow is computed exactly.
+        """
+        p, e, x = self.exact_state(0)
+        if not x.is_zero():
+            yield (p, e)
+        opposite_edge = self._s.opposite_edge
+        while True:
+            e, x = self._get_iet(p).forward_image(e, x)
+            if x.is_zero():
+                return
+            yield (p, e)
+            p, e = opposite_edge(p, e)
+
+    def _closes_up(self, p, e, x):
+        r"""
+        Return whether the exact position ``x`` on the edge ``e`` of the
+        polygon ``p`` is the start of this trajectory.
+        """
+        return p == self._points[0][0] and e == self._points[0][1] and \
+               x == self._sync_positions[0]
+
+    def flow(self, steps):
+        r"""
+        Append ``steps`` segments to this trajectory, stopping early if a
+        singularity is hit or if the trajectory closes up.
+        """
+        if steps < 0:
+            raise ValueError("numeric trajectories can only be flowed forward")
+        opposite_edge = self._s.opposite_edge
+        points = self._points
+        p0, e0, x0 = points[0]
+        p, e, x = points[-1]
+        for _ in range(steps):
+            if self._separatrix or self._closed:
+                break
+            starts, ends, pieces, margin = self._get_data(p)[e]
+            k = bisect_right(starts, x) - 1
+            if k < 0 or x - starts[k] < margin or ends[k] - x < margin:
+                self._exact_crossings += 1
+                e, y = self._get_iet(p).forward_image(e, self.exact_state()[2])
+                if y.is_zero():
+                    self._separatrix = True
+                    break
+                p, e = opposite_edge(p, e)
+                if self._closes_up(p, e, y):
+                    self._closed = True
+                    break
+                x = self._sync(len(points), y)
+                points.append((p, e, x))
+                continue
+
+            e, shift, k = pieces[k]
+            x += shift
+            p, e = opposite_edge(p, e)
+            points.append((p, e, x))
+            self._counts[k] += 1
+            self._steps += 1
+            if p == p0 and e == e0 and abs(x - x0) < self._closing_margin and \
+               self._closes_up(p, e, self.exact_state()[2]):
+                points.pop()
+                self._counts[k] -= 1
+                self._steps -= 1
+                self._closed = True
+                break
+            if self._steps >= self._SYNC:
+                x = self._sync(len(points) - 1, self.exact_state()[2])
+                points[-1] = (p, e, x)
+
+
+class ParallelTrajectoriesTranslation(object):
+    r"""
+    A family of straight line trajectories in a common direction on a
+    translation surface that are flowed simultaneously.
+
+    As in :class:`StraightLineTrajectoryTranslation`, each trajectory is
+    represented by a triple ``(p, e, x)`` made of a polygon label, an edge and
+    a position on this edge. At each step, the states are grouped by polygon so
+    that the interval exchange of each polygon is only looked up once.
+    Trajectories that hit a singularity or close up stop and keep their last
+    state.
+
+    EXAMPLES::
+
+        sage: from flatsurf import *
+        sage: from flatsurf.geometry.straight_line_trajectory import ParallelTrajectoriesTranslation
+        sage: S = SymmetricGroup(3)
+        sage: o = translation_surfaces.origami(S('(1,2)'), S('(1,3)'))
+        sage: F = ParallelTrajectoriesTranslation([o.tangent_vector(1, (1/3,1/7), (5,13)),
+        ....:                                      o.tangent_vector(2, (1/2,1/2), (5,13))])
+        sage: F
+        2 parallel trajectories in direction (5, 13) after 0 steps (2 active)
+        sage: F.flow(2)
+        2
+        sage: F.state(0)
+        (1, 0, 31/3)
+
+    Trajectories stop at singularities and when they close up::
+
+        sage: T = translation_surfaces.square_torus()
+        sage: F = ParallelTrajectoriesTranslation([T.tangent_vector(0, (1/3,2/3), (1,2)),
+        ....:                                      T.tangent_vector(0, (1/2,1/3), (1,1)),
+        ....:                                      T.tangent_vector(0, (1/2,1/3), (1,2))])
+        Traceback (most recent call last):
+        ...
+        ValueError: the trajectories must have the same direction vector
+        sage: F = ParallelTrajectoriesTranslation([T.tangent_vector(0, (1/3,2/3), (1,2)),
+        ....:                                      T.tangent_vector(0, (1/2,1/3), (1,2)),
+        ....:                                      T.tangent_vector(0, (1/4,1/5), (1,2))])
+        sage: F.flow(10)
+        0
+        sage: [F.status(i) for i in range(3)]
+        ['singularity', 'closed', 'closed']
+        sage: F.steps()
+        3
+    """
+    def __init__(self, tangent_vectors):
+        self._s = None
+        self._vector = None
+        self._initial = []
+        self._states = []
+        self._status = []
+        self._active = []
+        self._steps = 0
+        for v in tangent_vectors:
+            self.append(v)
+
+    def _get_iet(self, label):
+        polygon = self._s.polygon(label)
+        try:
+            return self._iets[polygon]
+        except KeyError:
+            self._iets[polygon] = T = polygon.flow_map(self._vector)
+            return T
+
+    def append(self, tangent_vector):
+        r"""
+        Add the trajectory starting at ``tangent_vector`` to this family.
+
+        The new trajectory is not flowed by the steps that have already been
+        performed.
+        """
+        if self._s is None:
+            self._s = tangent_vector.surface()
+            self._vector = tangent_vector.vector()
+            self._iets = {}
+        elif tangent_vector.surface() != self._s:
+            raise ValueError("the trajectories must live on the same surface")
+        elif tangent_vector.vector() != self._vector:
+            raise ValueError("the trajectories must have the same direction vector")
+
+        seg = SegmentInPolygon(tangent_vector)
+        if seg.is_edge():
+            raise ValueError("trajectories along edges are not supported")
+        self._append_state(_iet_state(self._s, seg, self._get_iet))
+
+    @staticmethod
+    def separatrices(surface, direction):
+        r"""
+        Return the family of the outgoing separatrices of ``surface`` in
+        ``direction``.
+
+        Each separatrix starts at a vertex between two edges through which
+        the flow enters a polygon. No edge of ``surface`` may be parallel to
+        ``direction``.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: from flatsurf.geometry.straight_line_trajectory import ParallelTrajectoriesTranslation
+            sage: O = translation_surfaces.regular_octagon()
+            sage: F = ParallelTrajectoriesTranslation.separatrices(O, (1,2))
+            sage: len(F)
+            3
+        """
+        from sage.modules.free_module_element import vector
+        F = ParallelTrajectoriesTranslation([])
+        F._s = surface
+        F._vector = vector(direction)
+        F._iets = {}
+        for p in surface.label_iterator():
+            T = F._get_iet(p)
+            for e in T._bot_labels[1:]:
+                F._append_state((p, e, T._ring.zero()))
+        return F
+
+    def _append_state(self, t):
+        self._active.append(len(self._states))
+        self._initial.append(t)
+        self._states.append(t)
+        self._status.append("active")
+
+    def __len__(self):
+        return len(self._states)
+
+    def __repr__(self):
+        return "{} parallel trajectories in direction {} after {} steps ({} active)".format(
+                len(self), self._vector, self._steps, len(self._active))
+
+    def state(self, i):
+        r"""
+        Return the current triple ``(p, e, x)`` of the ``i``-th trajectory.
+        """
+        return self._states[i]
+
+    def states(self):
+        r"""
+        Return the list of current triples ``(p, e, x)`` of the trajectories.
+        """
+        return list(self._states)
+
+    def status(self, i):
+        r"""
+        Return ``"active"`` if the ``i``-th trajectory can be flowed further,
+        ``"singularity"`` if it hit a singularity and ``"closed"`` if it
+        closed up.
+        """
+        return self._status[i]
+
+    def steps(self):
+        r"""
+        Return the number of steps performed so far.
+        """
+        return self._steps
+
+    def step(self):
+        r"""
+        Move all active trajectories to the next polygon.
+
+        Return the number of trajectories that are still active.
+        """
+        opposite_edge = self._s.opposite_edge
+        states = self._states
+        initial = self._initial
+        status = self._status
+
+        groups = defaultdict(list)
+        for i in self._active:
+            groups[states[i][0]].append(i)
+
+        active = []
+        for p, indices in iteritems(groups):
+            # The states in the polygon p are sorted from left to right and
+            # moved together in one pass over the interval exchange.
+            T = self._get_iet(p)
+            position = T._bot_labels_to_index
+            indices.sort(key=lambda i: (position[states[i][1]], states[i][2]))
+            images = T.forward_images([states[i][1:] for i in indices])
+            for i, (e, x) in zip(indices, images):
+                if x.is_zero():
+                    status[i] = "singularity"
+                    continue
+                q, e = opposite_edge(p, e)
+                t = (q, e, x)
+                if t == initial[i]:
+                    status[i] = "closed"
+                    continue
+                states[i] = t
+                active.append(i)
+
+        active.sort()
+        self._active = active
+        self._steps += 1
+        return len(active)
+
+    def flow(self, steps):
+        r"""
+        Perform ``steps`` steps, stopping early when no trajectory is active
+        anymore.
+
+        Return the number of trajectories that are still active.
+        """
+        for _ in range(steps):
+            if not self._active:
+                break
+            self.step()
+        return len(self._active)
@@ -1,13 +1,18 @@
 r"""
 Geometric objects on surfaces.
 
-This includes singularities, saddle connections and cylinders.
+This includes singularities, saddle connections, collections of saddle
+connections and cylinders.
 """
 
 from __future__ import absolute_import, print_function, division
 from six.moves import range, map, filter, zip
 from six import iteritems
 
+from bisect import bisect_right
+from collections import defaultdict
+from operator import itemgetter
+
 from sage.misc.cachefunc import cached_method
 from sage.modules.free_module import VectorSpace
 from sage.modules.free_module_element import vector
@@ -49,6 +54,11 @@ class Singularity(SageObject):
         """
         from .similarity_surface import SimilaritySurface
         self._ss=similarity_surface
+        if self._ss.is_finite() and not self._ss.is_mutable():
+            # use the vertex classes that are computed once for all
+            classes, index = self._ss._vertex_classes()
+            self._s=frozenset(classes[index[(l,v)]])
+            return
         self._s=set()
         if not self._ss.is_finite() and limit is None:
             raise ValueError("need a limit when working with an infinite surface")
@@ -407,19 +417,18 @@ class SaddleConnection(SageObject):
                 if end_direction!=self._end_direction:
                     raise ValueError("Provided or inferred end_direction="+str(end_direction)+" does not match actual end_direction="+str(self._end_direction))
 
-            if traj.segments()[0].is_edge():
+            if traj.segment(0).is_edge():
                 # Special case (The below method causes error if the trajectory is just an edge.)
                 self._holonomy = self._s.polygon(start_data[0]).edge(start_data[1])
                 self._end_holonomy = self._s.polygon(self._end_data[0]).edge(self._end_data[1])
             else:
                 from .similarity import SimilarityGroup
                 sim=SimilarityGroup(self._s.base_ring()).one()
-                itersegs = iter(traj.segments())
-                next(itersegs)
-                for seg in itersegs:
-                    sim = sim * self._s.edge_transformation(seg.start().polygon_label(),
-                                                            seg.start().position().get_edge())
-                self._holonomy = sim(traj.segments()[-1].end().point())- \
+                starts = traj._segment_starts()
+                next(starts)
+                for label, e in starts:
+                    sim = sim * self._s.edge_transformation(label, e)
+                self._holonomy = sim(traj.segment(-1).end().point())- \
                     traj.initial_tangent_vector().point()
                 self._end_holonomy = -( (~sim.derivative())*self._holonomy )
 
@@ -617,6 +626,253 @@ class SaddleConnection(SageObject):
            self._end_holonomy, self._holonomy,
            check=True)
 
+class SaddleConnectionStore(SageObject):
+    r"""
+    A collection of saddle connections indexed by their projective direction
+    and by their length.
+
+    Saddle connections are compared exactly, so adding the same saddle
+    connection twice has no effect. The direction of a saddle connection is
+    measured in the polygon where it starts; for (half-)translation surfaces
+    this is the direction on the surface.
+
+    The store has an ``append`` method, so it can be passed as ``sc_list`` to
+    :meth:`~flatsurf.geometry.similarity_surface.SimilaritySurface.saddle_connections`.
+
+    EXAMPLES::
+
+        sage: from flatsurf import *
+        sage: from flatsurf.geometry.surface_objects import SaddleConnectionStore
+        sage: s = translation_surfaces.square_torus()
+        sage: store = s.saddle_connections(2, sc_list=SaddleConnectionStore())
+        sage: store
+        Saddle connection store with 8 saddle connections in 4 directions
+        sage: sorted(store.directions())
+        [(-1, 1), (0, 1), (1, 0), (1, 1)]
+        sage: sorted(store.directions(1))
+        [(0, 1), (1, 0)]
+        sage: store.count((1,1))
+        2
+        sage: store.count((-2,-2))
+        2
+        sage: [sc.holonomy() for sc in store.parallel((0,1))]
+        [(0, 1), (0, -1)]
+
+    Directions without saddle connections are empty::
+
+        sage: store.parallel((1,2), 2)
+        []
+        sage: store.count((1,2), 2)
+        0
+
+    Adding a saddle connection again does not change the store::
+
+        sage: sc = store.connections()[0]
+        sage: store.add(sc)
+        False
+        sage: sc in store
+        True
+        sage: len(store)
+        8
+
+    Deduplication is exact over number fields::
+
+        sage: s = translation_surfaces.veech_2n_gon(4)
+        sage: store = SaddleConnectionStore(s.saddle_connections(8))
+        sage: store.extend(s.saddle_connections(8))
+        sage: len(store) == len(s.saddle_connections(8))
+        True
+        sage: sum(store.counts().values()) == len(store)
+        True
+    """
+    def __init__(self, saddle_connections=()):
+        # All saddle connections for deduplication.
+        self._connections = set()
+        # All saddle connections sorted by squared length.
+        self._lengths = []
+        self._sorted = []
+        # For each projective direction, its saddle connections sorted by
+        # squared length.
+        self._direction_lengths = {}
+        self._direction_sorted = {}
+        # Pairs (squared length, saddle connection) added since the last
+        # query. They are sorted into the lists above by _flush.
+        self._pending = []
+        self.extend(saddle_connections)
+
+    @staticmethod
+    def _projective_direction(direction):
+        r"""
+        Return a normalized representative of the projective class of the
+        vector ``direction``.
+
+        The representative has l-infinity norm 1 and points into the upper
+        half plane or along the positive real axis.
+
+        EXAMPLES::
+
+            sage: from flatsurf.geometry.surface_objects import SaddleConnectionStore
+            sage: SaddleConnectionStore._projective_direction(vector(QQ, (-3,-6)))
+            (1/2, 1)
+            sage: SaddleConnectionStore._projective_direction(vector(QQ, (-3,0)))
+            (1, 0)
+        """
+        direction = vector(direction)
+        xabs = direction[0].abs()
+        yabs = direction[1].abs()
+        if xabs > yabs:
+            direction = direction / xabs
+        else:
+            direction = direction / yabs
+        if direction[1] < 0 or (direction[1] == 0 and direction[0] < 0):
+            direction = -direction
+        direction.set_immutable()
+        return direction
+
+    def add(self, sc):
+        r"""
+        Add the saddle connection ``sc`` to this store.
+
+        Return whether the saddle connection was not in the store before.
+        """
+        if sc in self._connections:
+            return False
+        self._connections.add(sc)
+
+        holonomy = sc.holonomy()
+        self._pending.append((holonomy[0]**2 + holonomy[1]**2, sc))
+        return True
+
+    append = add
+
+    @staticmethod
+    def _merge(lengths, connections, added):
+        r"""
+        Return the lists of squared lengths and saddle connections obtained by
+        adding the pairs ``added`` to the sorted lists ``lengths`` and
+        ``connections``.
+
+        Saddle connections of the same length stay in the order they were
+        added.
+        """
+        items = list(zip(lengths, connections))
+        items.extend(added)
+        items.sort(key=itemgetter(0))
+        return [length for length, _ in items], [sc for _, sc in items]
+
+    def _flush(self):
+        r"""
+        Sort the saddle connections added since the last query into the
+        store.
+        """
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+
+        self._lengths, self._sorted = self._merge(self._lengths, self._sorted, pending)
+
+        by_direction = defaultdict(list)
+        for length, sc in pending:
+            by_direction[self._projective_direction(sc.direction())].append((length, sc))
+        for direction, added in iteritems(by_direction):
+            lengths, connections = self._merge(
+                    self._direction_lengths.get(direction, []),
+                    self._direction_sorted.get(direction, []),
+                    added)
+            self._direction_lengths[direction] = lengths
+            self._direction_sorted[direction] = connections
+
+    def extend(self, saddle_connections):
+        r"""
+        Add all the saddle connections in ``saddle_connections`` to this store.
+        """
+        for sc in saddle_connections:
+            self.add(sc)
+
+    def __len__(self):
+        return len(self._connections)
+
+    def __iter__(self):
+        r"""
+        Iterate over the saddle connections sorted by length.
+        """
+        self._flush()
+        return iter(self._sorted)
+
+    def __contains__(self, sc):
+        return sc in self._connections
+
+    def connections(self, squared_length_bound=None):
+        r"""
+        Return the saddle connections whose length squared is at most
+        ``squared_length_bound`` sorted by length.
+        """
+        self._flush()
+        if squared_length_bound is None:
+            return list(self._sorted)
+        return self._sorted[:bisect_right(self._lengths, squared_length_bound)]
+
+    def directions(self, squared_length_bound=None):
+        r"""
+        Return the projective directions in which there is a saddle connection
+        whose length squared is at most ``squared_length_bound``.
+
+        The directions are normalized as in :meth:`_projective_direction`.
+        """
+        self._flush()
+        if squared_length_bound is None:
+            return list(self._direction_lengths)
+        return [direction for direction, lengths in iteritems(self._direction_lengths) if lengths[0] <= squared_length_bound]
+
+    def parallel(self, direction, squared_length_bound=None):
+        r"""
+        Return the saddle connections parallel to ``direction`` whose length
+        squared is at most ``squared_length_bound`` sorted by length.
+
+        The ``direction`` can be a vector or a saddle connection.
+        """
+        self._flush()
+        if isinstance(direction, SaddleConnection):
+            direction = direction.direction()
+        elif self._sorted:
+            # Make sure that the lookup happens with vectors over the base
+            # ring of the stored saddle connections.
+            direction = self._sorted[0].surface().vector_space()(direction)
+        direction = self._projective_direction(direction)
+        connections = self._direction_sorted.get(direction, [])
+        if squared_length_bound is None:
+            return list(connections)
+        return connections[:bisect_right(self._direction_lengths.get(direction, []), squared_length_bound)]
+
+    def count(self, direction, squared_length_bound=None):
+        r"""
+        Return the number of saddle connections parallel to ``direction``
+        whose length squared is at most ``squared_length_bound``.
+        """
+        return len(self.parallel(direction, squared_length_bound))
+
+    def counts(self, squared_length_bound=None):
+        r"""
+        Return a dictionary mapping the projective :meth:`directions` to the
+        number of saddle connections in that direction whose length squared is
+        at most ``squared_length_bound``.
+        """
+        self._flush()
+        if squared_length_bound is None:
+            return {direction: len(lengths) for direction, lengths in iteritems(self._direction_lengths)}
+        counts = {}
+        for direction, lengths in iteritems(self._direction_lengths):
+            count = bisect_right(lengths, squared_length_bound)
+            if count:
+                counts[direction] = count
+        return counts
+
+    def _repr_(self):
+        self._flush()
+        return "Saddle connection store with {} saddle connections in {} directions".format(
+            len(self), len(self._direction_lengths))
+
 class Cylinder(SageObject):
     r"""
     Represents a cylinder in a SimilaritySurface. A cylinder for these purposes is a
@@ -290,10 +290,17 @@ class SimilaritySurfaceTangentVector:
             -self.vector())
         return new_vector
 
-    def straight_line_trajectory(self):
+    def straight_line_trajectory(self, numeric=False):
         r"""
         Return the straight line trajectory associated to this vector.
 
+        INPUT:
+
+        - ``numeric`` -- boolean (default: ``False``); whether to flow in double
+          precision with
+          :class:`~flatsurf.geometry.straight_line_trajectory.StraightLineTrajectoryNumeric`
+          (only available on translation surfaces)
+
         EXAMPLES::
 
             sage: from flatsurf import *
@@ -313,7 +320,25 @@ class SimilaritySurfaceTangentVector:
             sage: l.flow(20)
             sage: l.segment(20)
             Segment in polygon 0 starting at (0.9442719099991588?, 0) and ending at (1, 0.1803398874989485?)
+
+            sage: l = v.straight_line_trajectory(numeric=True)
+            sage: l.flow(20)
+            sage: l.segment(20)
+            Segment in polygon 0 starting at (0.9442719099991588?, 0) and ending at (1, 0.1803398874989485?)
+
+            sage: s = similarity_surfaces.example()
+            sage: v = s.tangent_vector(0, (1,-1/2), (3,-1))
+            sage: v.straight_line_trajectory(numeric=True)
+            Traceback (most recent call last):
+            ...
+            ValueError: numeric trajectories are only available on translation surfaces
         """
+        if numeric:
+            from flatsurf.geometry.translation_surface import TranslationSurface
+            if not isinstance(self.surface(), TranslationSurface):
+                raise ValueError("numeric trajectories are only available on translation surfaces")
+            from flatsurf.geometry.straight_line_trajectory import StraightLineTrajectoryNumeric
+            return StraightLineTrajectoryNumeric(self)
         from flatsurf.geometry.straight_line_trajectory import StraightLineTrajectory
         return StraightLineTrajectory(self)
 
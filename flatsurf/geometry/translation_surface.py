@@ -458,6 +458,84 @@ class TranslationSurface(HalfTranslationSurface, DilationSurface):
             Jxy += xy
         return (Jxx, Jyy, Jxy)
 
+    def first_return_map(self, direction, edges):
+        r"""
+        Return the first return map of the straight line flow in
+        ``direction`` to the union of ``edges``.
+
+        See :class:`~flatsurf.geometry.interval_exchange_transformation.FirstReturnMap`.
+        The result is cached until the surface is mutated.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: S = SymmetricGroup(3)
+            sage: o = translation_surfaces.origami(S('(1,2)'), S('(1,3)'))
+            sage: R = o.first_return_map((2,3), [(1,0), (2,0), (3,0)])
+            sage: R.length()
+            9
+            sage: sorted(set(piece[3] for piece in R.pieces()))
+            [1, 2]
+            sage: o.first_return_map((2,3), [(1,0), (2,0), (3,0)]) is R
+            True
+        """
+        from sage.modules.free_module_element import vector
+        direction = vector(direction)
+        edges = tuple((p, e) for p, e in edges)
+        key = (tuple(direction), edges)
+        cache = self._s._cache.setdefault("first_return_maps", {})
+        try:
+            return cache[key]
+        except KeyError:
+            from flatsurf.geometry.interval_exchange_transformation import FirstReturnMap
+            R = cache[key] = FirstReturnMap(self, direction, edges)
+            return R
+
+    def certify_completely_periodic(self, direction, limit=1000):
+        r"""
+        Return ``True`` if the straight line flow in ``direction`` is certified
+        to be completely periodic within ``limit`` steps and ``None`` if this
+        is undecided within ``limit`` steps.
+
+        ``False`` is never returned: a separatrix that is not a saddle
+        connection can not be detected after finitely many steps. Hence
+        ``None`` does not mean that the direction is not completely periodic.
+
+        The flow is completely periodic if and only if every separatrix in
+        ``direction`` is a saddle connection. All separatrices are flowed
+        together for at most ``limit`` steps (see
+        :class:`~flatsurf.geometry.straight_line_trajectory.ParallelTrajectoriesTranslation`)
+        and ``True`` is returned if they all hit a singularity.
+
+        No edge of this surface may be parallel to ``direction``.
+
+        EXAMPLES::
+
+            sage: from flatsurf import *
+            sage: T = translation_surfaces.square_torus()
+            sage: T.certify_completely_periodic((1,2))
+            True
+
+            sage: S = SymmetricGroup(3)
+            sage: o = translation_surfaces.origami(S('(1,2)'), S('(1,3)'))
+            sage: o.certify_completely_periodic((5,13))
+            True
+
+            sage: K.<sqrt2> = QuadraticField(2)
+            sage: T = T.copy(new_field=K)
+            sage: T.certify_completely_periodic((1,sqrt2)) is None
+            True
+            sage: T.certify_completely_periodic((1,sqrt2), limit=100) is None
+            True
+        """
+        if not self.is_finite():
+            raise NotImplementedError("only available for finite surfaces")
+        from flatsurf.geometry.straight_line_trajectory import ParallelTrajectoriesTranslation
+        F = ParallelTrajectoriesTranslation.separatrices(self, direction)
+        if F.flow(limit):
+            return None
+        return True
+
 class MinimalTranslationCover(Surface):
     r"""
     Do not use translation_surface.MinimalTranslationCover. Use 
@@ -100,3 +100,54 @@ class GraphicalStraightLineTrajectory:
             p += seg.plot(**options)
         return p
 
+
+class GraphicalNumericSegmentInPolygon(GraphicalSegmentInPolygon):
+    r"""
+    Graphical segment given by the floating point coordinates of its endpoints
+    (see :meth:`~flatsurf.geometry.straight_line_trajectory.StraightLineTrajectoryNumeric.segment_coordinates`).
+
+    EXAMPLES::
+
+        sage: from flatsurf import *
+        sage: from flatsurf.graphical.straight_line_trajectory import GraphicalNumericSegmentInPolygon
+        sage: s = translation_surfaces.square_torus()
+        sage: gs = s.graphical_surface()
+        sage: gseg = GraphicalNumericSegmentInPolygon(0, (0.5, 0.0), (1.0, 1.0), gs)
+        sage: gseg.end() == gs.graphical_polygon(0).transform(vector((1,1)))
+        True
+    """
+    def __init__(self, label, start, end, graphical_surface):
+        self._gs = graphical_surface
+        self._label = label
+        t = self._gs.graphical_polygon(label).transformation()
+        if t is None:
+            self._start = V(start)
+            self._end = V(end)
+        else:
+            from sage.rings.real_double import RDF
+            m = t.matrix().change_ring(RDF)
+            self._start = V((m[0,0]*start[0] + m[0,1]*start[1] + m[0,2],
+                             m[1,0]*start[0] + m[1,1]*start[1] + m[1,2]))
+            self._end = V((m[0,0]*end[0] + m[0,1]*end[1] + m[0,2],
+                           m[1,0]*end[0] + m[1,1]*end[1] + m[1,2]))
+
+    def polygon_label(self):
+        return self._label
+
+class GraphicalNumericStraightLineTrajectory(GraphicalStraightLineTrajectory):
+    r"""
+    Allows for the rendering of a
+    :class:`~flatsurf.geometry.straight_line_trajectory.StraightLineTrajectoryNumeric`
+    from the floating point coordinates of its segments.
+    """
+    def __init__(self, trajectory, graphical_surface = None):
+        if graphical_surface is None:
+            self._gs = trajectory.surface().graphical_surface()
+        else:
+            assert trajectory.surface() == graphical_surface.get_surface()
+            self._gs = graphical_surface
+        self._traj = trajectory
+        self._segments = []
+        for i in range(trajectory.combinatorial_length()):
+            label, start, end = trajectory.segment_coordinates(i)
+            self._segments.append(GraphicalNumericSegmentInPolygon(label, start, end, self._gs))